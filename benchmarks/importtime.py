@@ -0,0 +1,73 @@
+"""Benchmark of import time of the library and the application.
+
+Usage: PYTHONPATH=. python -m benchmarks.importtime [--repeat 5]
+
+Every target is imported in a fresh interpreter with `-X importtime`, the
+cumulative import time of the target module and whether pydantic and
+FastAPI were imported are printed as JSON lines.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+TARGETS = {
+    'library': 'parser.convertor',
+    'server': 'main',
+}
+HEAVY_PACKAGES = ('pydantic', 'fastapi')
+
+
+def parse_importtime(output: str) -> Dict[str, int]:
+    """Return cumulative microseconds of import of every module."""
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def measure(module: str) -> Dict[str, int]:
+    """Import module in a fresh interpreter, return import times of modules."""
+    paths = [os.getcwd(), *filter(None, [os.environ.get('PYTHONPATH')])]
+    env = {**os.environ, 'PYTHONPATH': os.pathsep.join(paths)}
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        check=True, capture_output=True, text=True, env=env,
+    )
+    return parse_importtime(result.stderr)
+
+
+def run(repeat: int) -> List[Dict]:
+    """Return median import times of targets."""
+    results = []
+    for name, module in TARGETS.items():
+        runs = [measure(module) for _ in range(repeat)]
+        results.append({
+            'target': name,
+            'module': module,
+            'import_us': statistics.median(times[module] for times in runs),
+            **{f'imports_{package}': package in runs[0] for package in HEAVY_PACKAGES},
+        })
+    return results
+
+
+def main():
+    """Run benchmark and print results as JSON lines."""
+    argument_parser = argparse.ArgumentParser(description=__doc__)
+    argument_parser.add_argument('--repeat', type=int, default=5)
+    args = argument_parser.parse_args()
+    for result in run(args.repeat):
+        print(json.dumps(result))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,249 @@
+"""Load test of /convert with sweeps of concurrency.
+
+Usage:
+    PYTHONPATH=. python -m benchmarks.load --concurrency 1 8 32 --requests 2000
+    PYTHONPATH=. python -m benchmarks.load --url http://127.0.0.1:8000 --concurrency 1 8 32
+
+Without `--url` requests are passed to the ASGI application in this process,
+so the numbers include the threadpool but no network. With `--url` requests
+are sent to a local server, e.g. uvicorn started with different `--workers`
+and settings, over one keep-alive connection per concurrent client.
+
+Every level of concurrency is reported as a JSON line with throughput,
+p50/p95/p99 latency in milliseconds, numbers of responses by status and
+rates of rejected (4xx) and failed (5xx or connection errors) requests.
+Throughput counts requests answered by the server.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import time
+from collections import Counter
+from random import Random
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from benchmarks.workloads import empty_week, invalid, many_splits, overnight
+
+PAYLOAD_KINDS = {
+    'closed': empty_week,
+    'overnight': overnight,
+    'many_splits': many_splits,
+    'invalid': invalid,
+}
+PATH = '/convert'
+
+Payload = Tuple[str, bytes]
+Send = Callable[[bytes], Awaitable[int]]
+
+
+def payload_mix(count: int, seed: int = 0) -> List[Payload]:
+    """Return `count` JSON bodies of schedules of all kinds, mixed evenly."""
+    rng = Random(seed)
+    kinds = list(PAYLOAD_KINDS)
+    payloads = []
+    for index in range(count):
+        kind = kinds[index % len(kinds)]
+        payloads.append((kind, json.dumps(PAYLOAD_KINDS[kind](rng)).encode()))
+    rng.shuffle(payloads)
+    return payloads
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """Return the nearest-rank percentile of sorted values."""
+    if not values:
+        return 0.0
+    return values[max(0, math.ceil(percent / 100 * len(values)) - 1)]
+
+
+class ASGIClient:
+    """Client calling the ASGI application directly."""
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def connect(self) -> Send:
+        """Return function sending a body to /convert and returning the status."""
+        return self.post
+
+    async def post(self, body: bytes) -> int:
+        """Send a body to /convert, return the status of the response."""
+        scope = {
+            'type': 'http',
+            'http_version': '1.1',
+            'method': 'POST',
+            'scheme': 'http',
+            'path': PATH,
+            'raw_path': PATH.encode(),
+            'query_string': b'',
+            'root_path': '',
+            'headers': [
+                (b'host', b'testserver'),
+                (b'content-type', b'application/json'),
+                (b'content-length', str(len(body)).encode()),
+            ],
+            'client': ('127.0.0.1', 0),
+            'server': ('testserver', 80),
+        }
+        messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+        status = 0
+
+        async def receive() -> Dict[str, Any]:
+            if messages:
+                return messages.pop()
+            return {'type': 'http.disconnect'}
+
+        async def send(message: Dict[str, Any]):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = int(message['status'])
+
+        await self.app(scope, receive, send)
+        return status
+
+
+class HTTPClient:  # pylint: disable=too-few-public-methods
+    """Minimal HTTP/1.1 client of a local server with keep-alive connections."""
+
+    def __init__(self, url: str):
+        parts = urlsplit(url)
+        self.host = parts.hostname or '127.0.0.1'
+        self.port = parts.port or 80
+        self.path = (parts.path.rstrip('/') or '') + PATH
+
+    async def connect(self) -> Send:
+        """Open a connection, return function sending a body over it."""
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        head = (
+            f'POST {self.path} HTTP/1.1\r\n'
+            f'Host: {self.host}:{self.port}\r\n'
+            'Content-Type: application/json\r\n'
+            'Content-Length: {}\r\n\r\n'
+        )
+
+        async def post(body: bytes) -> int:
+            writer.write(head.format(len(body)).encode() + body)
+            status_line = await reader.readline()
+            if not status_line:
+                raise ConnectionError('connection closed by the server')
+
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                if name.lower() == 'content-length':
+                    length = int(value)
+            await reader.readexactly(length)
+            return int(status_line.split()[1])
+
+        return post
+
+
+async def _run_level(client: Any, payloads: List[Payload], concurrency: int,
+                     requests: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    sequence = iter(range(requests))
+
+    async def worker():
+        post = None
+        for index in sequence:
+            _, body = payloads[index % len(payloads)]
+            start = time.perf_counter()
+            try:
+                # Connections broken by the server are opened again.
+                post = post or await client.connect()
+                status = await post(body)
+            except (OSError, ValueError, asyncio.IncompleteReadError):
+                statuses['connection_error'] += 1
+                post = None
+                continue
+            latencies.append(time.perf_counter() - start)
+            statuses[str(status)] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    seconds = time.perf_counter() - start
+
+    latencies.sort()
+    rejected = sum(count for status, count in statuses.items() if status.startswith('4'))
+    failed = requests - rejected - sum(
+        count for status, count in statuses.items() if status[0] in '123'
+    )
+    return {
+        'concurrency': concurrency,
+        'requests': requests,
+        'seconds': round(seconds, 3),
+        'throughput': round(len(latencies) / seconds, 1),
+        'latency_ms': {
+            name: round(percentile(latencies, percent) * 1000, 3)
+            for name, percent in (('p50', 50), ('p95', 95), ('p99', 99))
+        },
+        'statuses': dict(statuses),
+        'rejected_rate': round(rejected / requests, 4),
+        'error_rate': round(failed / requests, 4),
+    }
+
+
+async def sweep(client: Any, payloads: List[Payload], levels: List[int],
+                requests: int) -> List[Dict[str, Any]]:
+    """Send `requests` requests at every level of concurrency, return reports."""
+    return [await _run_level(client, payloads, level, requests) for level in levels]
+
+
+async def _sweep_app(payloads: List[Payload], levels: List[int], requests: int,
+                     use_cache: bool) -> List[Dict[str, Any]]:
+    # Imported lazily, so the application isn't loaded to test a server.
+    # pylint: disable=import-outside-toplevel
+    from main import app, cache
+
+    maxsize = cache.maxsize
+    if not use_cache:
+        cache.maxsize = 0
+    await app.router.startup()
+    try:
+        return await sweep(ASGIClient(app), payloads, levels, requests)
+    finally:
+        await app.router.shutdown()
+        cache.maxsize = maxsize
+
+
+def run(levels: List[int], requests: int, payloads: int = 1000, url: Optional[str] = None,
+        use_cache: bool = True) -> List[Dict[str, Any]]:
+    """Run the sweep against the application in this process or the server at `url`."""
+    mix = payload_mix(payloads)
+    if url is None:
+        return asyncio.run(_sweep_app(mix, levels, requests, use_cache))
+    return asyncio.run(sweep(HTTPClient(url), mix, levels, requests))
+
+
+def main():
+    """Run load test and print results as JSON lines."""
+    argument_parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    argument_parser.add_argument('--url', help='base URL of a running server')
+    argument_parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32, 128])
+    argument_parser.add_argument('--requests', type=int, default=2000,
+                                 help='requests at every level')
+    argument_parser.add_argument('--payloads', type=int, default=1000,
+                                 help='number of distinct payloads')
+    argument_parser.add_argument('--no-cache', action='store_true',
+                                 help='disable the results cache of the application')
+    argument_parser.add_argument('--output', help='path to write results to')
+    args = argument_parser.parse_args()
+    results = run(args.concurrency, args.requests, args.payloads, args.url, not args.no_cache)
+    for result in results:
+        print(json.dumps(result))
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,202 @@
+"""Benchmark suite of validation, conversion and the HTTP path.
+
+Usage:
+    PYTHONPATH=. python -m benchmarks.run --output results.json
+    PYTHONPATH=. python -m benchmarks.run --compare results.json --threshold 0.1
+
+Results are written as JSON with seconds per schedule for every case, so
+runs made on different commits can be compared. With `--compare` the exit
+code is 1 if any case is slower than in the baseline by more than the
+threshold.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+from parser.convertor import Convertor
+from parser.ingest import decode_actions, validate_actions
+from parser.models import DataModel
+from parser.schedule import Schedule
+from parser.validation import validate_fast
+
+from benchmarks.workloads import WORKLOADS, generate
+
+Case = Callable[[List[Any]], object]
+
+
+def _parse(items: List[Any]) -> object:
+    return [DataModel.parse_obj(raw) for raw in items]
+
+
+def _parsed_data(models: List[DataModel]) -> object:
+    return [list(Convertor(data).get_parsed_data()) for data in models]
+
+
+def _humanized_data(models: List[DataModel]) -> object:
+    return [list(Convertor(data).get_humanized_data()) for data in models]
+
+
+def _http_convert(items: List[Any], fast_json: bool = False) -> object:
+    # Imported lazily, so library cases don't pay for the application startup.
+    # pylint: disable=import-outside-toplevel
+    from fastapi.testclient import TestClient
+    from main import app, cache
+    from settings import settings
+
+    client = TestClient(app)
+    maxsize, cache.maxsize = cache.maxsize, 0
+    settings.fast_json, default_fast_json = fast_json, settings.fast_json
+    try:
+        return [client.post('/convert', json=raw) for raw in items]
+    finally:
+        cache.maxsize = maxsize
+        settings.fast_json = default_fast_json
+
+
+def _http_convert_fast_json(items: List[Any]) -> object:
+    return _http_convert(items, fast_json=True)
+
+
+def _loads_validate(bodies: List[bytes]) -> object:
+    return [Schedule.from_model(validate_fast(json.loads(body))) for body in bodies]
+
+
+def _decode_actions(bodies: List[bytes]) -> object:
+    return [validate_actions(decode_actions(body)) for body in bodies]
+
+
+def _json_response(outputs: List[List[str]]) -> object:
+    # pylint: disable=import-outside-toplevel
+    from fastapi.responses import JSONResponse
+    return [JSONResponse({'output': output}) for output in outputs]
+
+
+def _output_response(outputs: List[List[str]]) -> object:
+    # pylint: disable=import-outside-toplevel
+    from responses import OutputResponse
+    return [OutputResponse(output) for output in outputs]
+
+
+# Cases receive raw schedules, validated models if the name is in MODEL_CASES,
+# output lines if the name is in OUTPUT_CASES, or bodies if it is in BODY_CASES.
+CASES: Dict[str, Case] = {
+    'datamodel_parse': _parse,
+    'convertor_parsed_data': _parsed_data,
+    'convertor_humanized_data': _humanized_data,
+    'loads_validate': _loads_validate,
+    'decode_actions': _decode_actions,
+    'json_response': _json_response,
+    'output_response': _output_response,
+    'http_convert': _http_convert,
+    'http_convert_fast_json': _http_convert_fast_json,
+}
+MODEL_CASES = {'convertor_parsed_data', 'convertor_humanized_data'}
+# Cases receiving output lines of validated models.
+OUTPUT_CASES = {'json_response', 'output_response'}
+# Cases receiving JSON encoded schedules.
+BODY_CASES = {'loads_validate', 'decode_actions'}
+
+
+def _commit() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            check=True, capture_output=True, text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def measure(case: Case, items: List[Any], repeat: int) -> Dict[str, float]:
+    """Return minimal and median seconds per item of the case."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        case(items)
+        timings.append((time.perf_counter() - start) / len(items))
+    return {'min': min(timings), 'median': statistics.median(timings)}
+
+
+def run(count: int, repeat: int, cases: List[str]) -> Dict[str, Any]:
+    """Run benchmark cases over all workloads."""
+    results = {}
+    for workload in WORKLOADS:
+        items = generate(workload, count)
+        models = [DataModel.parse_obj(raw) for raw in items]
+        outputs = [list(Convertor(data).get_humanized_data()) for data in models]
+        for name in cases:
+            if name in MODEL_CASES:
+                data: List[Any] = models
+            elif name in OUTPUT_CASES:
+                data = outputs
+            elif name in BODY_CASES:
+                data = [json.dumps(raw).encode() for raw in items]
+            else:
+                data = items
+            results[f'{name}/{workload}'] = measure(CASES[name], data, repeat)
+    return {
+        'meta': {
+            'commit': _commit(),
+            'python': platform.python_version(),
+            'timestamp': int(time.time()),
+            'count': count,
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any],
+            threshold: float) -> List[str]:
+    """Return descriptions of cases slower than in baseline by more than threshold."""
+    regressions = []
+    for name, timing in current['results'].items():
+        base = baseline['results'].get(name)
+        if base is None:
+            continue
+
+        change = timing['median'] / base['median'] - 1
+        if change > threshold:
+            regressions.append(f'{name}: {change:+.1%}')
+    return regressions
+
+
+def main():
+    """Run benchmarks, write results and compare them with the baseline."""
+    argument_parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    argument_parser.add_argument('--count', type=int, default=200, help='schedules per workload')
+    argument_parser.add_argument('--repeat', type=int, default=5)
+    argument_parser.add_argument('--cases', nargs='+', choices=sorted(CASES), default=list(CASES))
+    argument_parser.add_argument('--output', help='path to write results to')
+    argument_parser.add_argument('--compare', help='path to baseline results')
+    argument_parser.add_argument('--threshold', type=float, default=0.1,
+                                 help='allowed relative slowdown')
+    args = argument_parser.parse_args()
+
+    current = run(args.count, args.repeat, args.cases)
+    for name, timing in current['results'].items():
+        print(f'{name:50} {timing["median"] * 1e6:10.1f} us')
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(current, output, indent=2)
+
+    if args.compare:
+        with open(args.compare) as baseline:
+            regressions = compare(current, json.load(baseline), args.threshold)
+        for regression in regressions:
+            print(f'Regression {regression}', file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""Benchmark of consistency validation on large malformed payloads.
+
+The single-pass validator, stopping at the first error or collecting all of
+them, is compared with the former validator, which looked up neighbour days
+by scanning the enumerator and raised on the first error.
+
+Usage: PYTHONPATH=. python -m benchmarks.validation [--count 1000] [--actions 200]
+"""
+
+import argparse
+import json
+import time
+from random import Random
+from typing import Any, Callable, Dict, List, Sequence
+
+from parser.enums import ActionTypeEnum, WeekDaysEnum
+from parser.models import DataModel
+from parser.validation import _parse, validate_all, validate_fast
+
+from pydantic import ValidationError
+
+from benchmarks.workloads import large_malformed
+
+Actions = Dict[WeekDaysEnum, Sequence[Any]]
+
+
+def _shifted_day(weekday: WeekDaysEnum, shift: int) -> WeekDaysEnum:
+    weekdays = tuple(WeekDaysEnum)
+    return weekdays[(weekdays.index(weekday) + shift) % 7]
+
+
+def legacy_check_actions(data: Actions):
+    """Former consistency check, raise ValueError on the first problem."""
+    for weekday, actions in data.items():
+        prev_action = None
+        for index, action in enumerate(actions):
+            if prev_action:
+                if action.type == prev_action.type:
+                    raise ValueError(f'Wrong actions for "{weekday}", two actions in a row')
+                if prev_action.value >= action.value:
+                    raise ValueError(f'Wrong actions for "{weekday}", wrong order')
+            if index == 0 and action.type == ActionTypeEnum.CLOSE:
+                prev_actions = data.get(_shifted_day(weekday, -1), [])
+                if not prev_actions or prev_actions[-1].type != ActionTypeEnum.OPEN:
+                    raise ValueError(f'The previous day before "{weekday}"')
+            if index == len(actions) - 1 and action.type == ActionTypeEnum.OPEN:
+                next_actions = data.get(_shifted_day(weekday, 1), [])
+                if not next_actions or next_actions[0].type != ActionTypeEnum.CLOSE:
+                    raise ValueError(f'The next day after "{weekday}"')
+            prev_action = action
+
+
+def _check_all(check: Callable[[Actions], Any], items: List[Actions]) -> int:
+    errors = 0
+    for data in items:
+        try:
+            errors += len(check(data) or ())
+        except ValueError:
+            errors += 1
+    return errors
+
+
+def _validate_all(parse: Callable[[Any], DataModel], items: List[Any]) -> int:
+    errors = 0
+    for raw in items:
+        try:
+            parse(raw)
+        except ValidationError as exc:
+            errors += len(exc.errors())
+    return errors
+
+
+CASES: Dict[str, Callable[[List[Any], List[Actions]], int]] = {
+    'legacy_first': lambda raw, parsed: _check_all(legacy_check_actions, parsed),
+    'single_pass_first': lambda raw, parsed: _check_all(DataModel.check_actions, parsed),
+    'single_pass_all': lambda raw, parsed: _check_all(
+        lambda data: list(DataModel.iter_errors(data)), parsed,
+    ),
+    'pydantic_parse_obj': lambda raw, parsed: _validate_all(DataModel.parse_obj, raw),
+    'validate_fast': lambda raw, parsed: _validate_all(validate_fast, raw),
+    'validate_all': lambda raw, parsed: _validate_all(validate_all, raw),
+}
+
+
+def run(count: int, actions: int) -> List[Dict]:
+    """Return seconds per payload and numbers of reported errors of every case."""
+    rng = Random(0)
+    items = [large_malformed(rng, actions) for _ in range(count)]
+    parsed = [_parse(raw) or {} for raw in items]
+    results = []
+    for name, case in CASES.items():
+        start = time.perf_counter()
+        errors = case(items, parsed)
+        seconds = time.perf_counter() - start
+        results.append({
+            'case': name,
+            'count': count,
+            'actions': actions,
+            'us_per_payload': round(seconds / count * 1e6, 1),
+            'errors': errors,
+        })
+    return results
+
+
+def main():
+    """Run benchmark and print results as JSON lines."""
+    argument_parser = argparse.ArgumentParser(description=__doc__)
+    argument_parser.add_argument('--count', type=int, default=1000)
+    argument_parser.add_argument('--actions', type=int, default=200, help='actions a day')
+    args = argument_parser.parse_args()
+    for result in run(args.count, args.actions):
+        print(json.dumps(result))
+
+
+if __name__ == '__main__':
+    main()
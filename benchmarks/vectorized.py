@@ -0,0 +1,55 @@
+"""Benchmark of vectorized conversion against the per-object path.
+
+Usage: PYTHONPATH=. python -m benchmarks.vectorized [--sizes 1000 100000 1000000]
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Callable, Dict, List
+
+from parser.batch import convert_item
+from parser.vectorized import convert_many
+
+from benchmarks.workloads import generate
+
+
+def _measure(function: Callable[[List[Any]], object], items: List[Any]) -> float:
+    start = time.perf_counter()
+    function(items)
+    return time.perf_counter() - start
+
+
+def _convert_items(items: List[Any]) -> object:
+    return [convert_item(raw) for raw in items]
+
+
+def run(sizes: List[int], workload: str) -> List[Dict]:
+    """Return timings of both engines for every size."""
+    results = []
+    for size in sizes:
+        items = generate(workload, size)
+        per_object = _measure(_convert_items, items)
+        vectorized = _measure(convert_many, items)
+        results.append({
+            'size': size,
+            'workload': workload,
+            'per_object_seconds': round(per_object, 4),
+            'vectorized_seconds': round(vectorized, 4),
+            'speedup': round(per_object / vectorized, 2),
+        })
+    return results
+
+
+def main():
+    """Run benchmark and print results as JSON lines."""
+    argument_parser = argparse.ArgumentParser(description=__doc__)
+    argument_parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 100000, 1000000])
+    argument_parser.add_argument('--workload', default='mixed')
+    args = argument_parser.parse_args()
+    for result in run(args.sizes, args.workload):
+        print(json.dumps(result))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""Generators of realistic benchmark workloads."""
+
+from random import Random
+from typing import Any, Callable, Dict, List
+
+WEEKDAYS = ('sunday', 'monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday')
+HOUR = 60 * 60
+
+Schedule = Dict[str, List[Dict[str, Any]]]
+
+
+def _action(action_type: str, value: int) -> Dict[str, Any]:
+    return {'type': action_type, 'value': value}
+
+
+def empty_week(rng: Random) -> Schedule:
+    """Venue closed on every day."""
+    return {weekday: [] for weekday in rng.sample(WEEKDAYS, 7)}
+
+
+def full_week(rng: Random) -> Schedule:
+    """Venue open once a day, mostly on round hours."""
+    opening = rng.choice((7, 8, 9, 10)) * HOUR + rng.choice((0, 0, 1800))
+    closing = rng.choice((17, 18, 20, 22)) * HOUR + rng.choice((0, 0, 1800))
+    return {
+        weekday: [_action('open', opening), _action('close', closing)]
+        for weekday in WEEKDAYS
+    }
+
+
+def many_splits(rng: Random) -> Schedule:
+    """Venue with several breaks every day."""
+    schedule: Schedule = {}
+    for weekday in WEEKDAYS:
+        values = sorted(rng.sample(range(1, 24 * 4), 2 * rng.randrange(3, 7)))
+        schedule[weekday] = [
+            _action('open' if index % 2 == 0 else 'close', value * 15 * 60)
+            for index, value in enumerate(values)
+        ]
+    return schedule
+
+
+def overnight(rng: Random) -> Schedule:
+    """Venue open past midnight, including Saturday to Sunday."""
+    schedule: Schedule = {}
+    for weekday in WEEKDAYS:
+        schedule[weekday] = [
+            _action('close', rng.randrange(1, 4) * HOUR),
+            _action('open', rng.randrange(17, 22) * HOUR),
+        ]
+    return schedule
+
+
+def invalid(rng: Random) -> Schedule:
+    """Venue with an opening that is never closed."""
+    schedule = full_week(rng)
+    schedule[rng.choice(WEEKDAYS)].pop()
+    return schedule
+
+
+def large_malformed(rng: Random, actions: int = 200) -> Schedule:
+    """Broken feed with many actions a day, some in the wrong order or of the wrong type."""
+    schedule: Schedule = {}
+    for weekday in rng.sample(WEEKDAYS, 7):
+        values = sorted(rng.sample(range(1, 24 * HOUR), actions))
+        index = rng.randrange(actions - 1)
+        values[index], values[index + 1] = values[index + 1], values[index]
+        schedule[weekday] = [
+            _action('open' if index % 2 == 0 or rng.random() < 0.01 else 'close', value)
+            for index, value in enumerate(values)
+        ]
+    return schedule
+
+
+WORKLOADS: Dict[str, Callable[[Random], Schedule]] = {
+    'empty_week': empty_week,
+    'full_week': full_week,
+    'many_splits': many_splits,
+    'overnight': overnight,
+}
+
+
+def generate(name: str, count: int, seed: int = 0) -> List[Schedule]:
+    """Return `count` schedules of the workload, "mixed" mixes all of them."""
+    rng = Random(seed)
+    if name == 'mixed':
+        factories = list(WORKLOADS.values())
+        return [rng.choice(factories)(rng) for _ in range(count)]
+    return [WORKLOADS[name](rng) for _ in range(count)]
@@ -1,16 +1,505 @@
 """Api views."""
-from typing import Dict
+import json
+import uuid
+from http import HTTPStatus
+from typing import Any, Dict, List, Optional, Tuple, Union
 
+from parser.algebra import CombineError, combine
+from parser.batch import Parser, convert_batch, convert_json, validate_batch, validate_item
+from parser.cache import ResultCache, SQLiteCache, result_key, schedule_key
+from parser.calendars import ExceptionCalendar
 from parser.convertor import Convertor
-from parser.models import DataModel
+from parser.enums import ErrorsModeEnum
+from parser.ingest import Actions, actions_key, decode_actions, validate_actions
+from parser.formatting import (
+    DEFAULT_LOCALE, LOCALES, find_locale, get_formatter, negotiate_locale,
+)
+from parser.index import WeekIndex, open_at, to_moment, to_week_second
+from parser.models import (
+    BatchDataModel, BulkQueryModel, CalendarQueryModel, CombineModel, DataModel, PatchModel,
+    QueryModel, get_error_rule,
+)
+from parser.schedule import Schedule
+from parser.sessions import ScheduleSession, to_actions
+from parser.validation import validate_all, validate_fast
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Header, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exceptions import RequestValidationError
+from fastapi.openapi.utils import get_openapi
+from fastapi.responses import JSONResponse, Response
+from pydantic import ValidationError
+from pydantic.error_wrappers import ErrorWrapper
+from pydantic.errors import MissingError
+
+from metrics import (
+    CONTENT_TYPE, cache_lookups, registry, request_bytes, stage_seconds, validation_failures,
+)
+from pool import ConversionPool, PoolSaturatedError
+from profiling import ProfileStore, ProfilingMiddleware, run_profiled
+from responses import NDJSONConversionResponse, OutputResponse, encode_output
+from settings import ValidatorEnum, settings
+
+PARSERS: Dict[ValidatorEnum, Parser] = {
+    ValidatorEnum.PYDANTIC: DataModel.parse_obj,
+    ValidatorEnum.FAST: validate_fast,
+}
+
+# Output lines, or the response body encoded by `encode_output`, and errors.
+ConvertResult = Tuple[Union[List[str], bytes], List[Dict]]
 
 app = FastAPI()
+parse = PARSERS[settings.validator]
+cache: ResultCache[ConvertResult] = ResultCache(settings.cache_size)
+sessions: ResultCache[ScheduleSession] = ResultCache(settings.session_store_size)
+persistent_cache: Optional[SQLiteCache] = None
+if settings.persistent_cache_path:
+    persistent_cache = SQLiteCache(settings.persistent_cache_path, settings.persistent_cache_size)
+app.state.pool = None
+profiles: Optional[ProfileStore] = None
+if settings.profile_dir:
+    profiles = ProfileStore(settings.profile_dir, settings.profile_keep)
+    app.add_middleware(
+        ProfilingMiddleware, store=profiles, sample_rate=settings.profile_sample_rate,
+    )
+
+
+@app.on_event('startup')
+def start_pool():
+    """Start worker processes if the pool is enabled."""
+    if settings.pool_workers > 0:
+        app.state.pool = ConversionPool(settings.pool_workers, settings.pool_max_pending)
+
+
+@app.on_event('shutdown')
+def stop_pool():
+    """Stop worker processes."""
+    if app.state.pool is not None:
+        app.state.pool.shutdown()
+        app.state.pool = None
+
+
+async def _run_in_pool(function, *args):
+    """Run function in the pool, respond with 429 if the pool is saturated."""
+    pool: ConversionPool = app.state.pool
+    try:
+        return await pool.run(function, *args)
+    except PoolSaturatedError as exc:
+        raise HTTPException(
+            status_code=HTTPStatus.TOO_MANY_REQUESTS, detail='Too many pending conversions',
+        ) from exc
+
+
+def _validation_error_response(errors: List[Dict]) -> JSONResponse:
+    """Return errors in the same format as FastAPI request validation does."""
+    return JSONResponse(
+        status_code=HTTPStatus.UNPROCESSABLE_ENTITY,
+        content={'detail': [{**error, 'loc': ('body', *error['loc'])} for error in errors]},
+    )
+
+
+def _etag_matches(etag: str, if_none_match: str) -> bool:
+    return etag in (tag.strip() for tag in if_none_match.split(','))
+
+
+def _decode_body(body: bytes) -> Any:
+    """Decode JSON body reporting errors the same way FastAPI does.
+
+    Empty body and JSON null are reported as a missing body.
+    """
+    data = None
+    if body:
+        try:
+            data = json.loads(body)
+        except json.JSONDecodeError as exc:
+            raise RequestValidationError(
+                [ErrorWrapper(exc, ('body', exc.pos))], body=exc.doc,
+            ) from exc
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=HTTPStatus.BAD_REQUEST, detail='There was an error parsing the body',
+            ) from exc
+
+    if data is None:
+        raise RequestValidationError([ErrorWrapper(MissingError(), loc=('body',))])
+    return data
+
+
+def _select_locale(locale: Optional[str], accept_language: str) -> str:
+    """Return locale of the query parameter, or the one preferred by the header."""
+    if locale is None:
+        return negotiate_locale(accept_language) or DEFAULT_LOCALE
+
+    supported = find_locale(locale)
+    if supported is None:
+        error = ValueError(f'Unsupported locale, supported are: {", ".join(LOCALES)}')
+        raise RequestValidationError([ErrorWrapper(error, loc=('query', 'locale'))])
+    return supported
+
+
+def _format(data: Union[DataModel, Schedule], locale: str, group: bool) -> ConvertResult:
+    with stage_seconds.time('format'):
+        convertor = Convertor(data, get_formatter(locale))
+        lines = convertor.get_grouped_data() if group else convertor.get_humanized_data()
+        if settings.fast_json:
+            return encode_output(lines), []
+        return list(lines), []
+
+
+def _convert(data: Any, locale: str, group: bool, all_errors: bool = False) -> ConvertResult:
+    with stage_seconds.time('validate'):
+        model, errors = validate_item(data, validate_all if all_errors else parse)
+    if model is None:
+        return [], errors
+    return _format(model, locale, group)
+
+
+def _convert_actions(actions: Actions, locale: str, group: bool,
+                     all_errors: bool = False) -> ConvertResult:
+    with stage_seconds.time('validate'):
+        schedule, errors = validate_actions(actions, all_errors)
+    if schedule is None:
+        return [], errors
+    return _format(schedule, locale, group)
+
+
+def _get_persistent(store: SQLiteCache, key: str) -> Optional[ConvertResult]:
+    """Return result from the persistent cache and store it in memory."""
+    stored = store.get(key)
+    if stored is None:
+        return None
+
+    lines, errors = stored
+    result: ConvertResult = (encode_output(lines) if settings.fast_json else lines, errors)
+    cache.set(key, result)
+    return result
+
+
+def _set_persistent(store: SQLiteCache, key: str, result: ConvertResult):
+    """Store result in the persistent cache, which keeps output lines."""
+    output, errors = result
+    if isinstance(output, bytes):
+        output = json.loads(output)['output']
+    store.set(key, (output, errors))
+
+
+def _convert_body(body: bytes, if_none_match: str, locale: str, group: bool,
+                  all_errors: bool = False) -> Response:
+    request_bytes.observe(len(body))
+    with stage_seconds.time('decode'):
+        # Canonical bodies are decoded straight into actions by the fast validator.
+        actions = decode_actions(body) if settings.validator == ValidatorEnum.FAST else None
+        if actions is None:
+            data = _decode_body(body)
+            key = schedule_key(data)
+        else:
+            key = actions_key(actions)
+    key = result_key(key, locale, group, all_errors)
+
+    etag = f'"{key}"'
+    result = cache.get(key)
+    cache_lookups.inc('miss' if result is None else 'hit')
+    if result is None and persistent_cache is not None:
+        result = _get_persistent(persistent_cache, key)
+        cache_lookups.inc('persistent_miss' if result is None else 'persistent_hit')
+    if result is not None and not result[1] and _etag_matches(etag, if_none_match):
+        return Response(status_code=HTTPStatus.NOT_MODIFIED, headers={'ETag': etag})
+
+    if result is None:
+        if actions is None:
+            result = _convert(data, locale, group, all_errors)
+        else:
+            result = _convert_actions(actions, locale, group, all_errors)
+        cache.set(key, result)
+        if persistent_cache is not None:
+            _set_persistent(persistent_cache, key, result)
+
+    return _result_response(result, {'ETag': etag, **_locale_headers(locale)})
+
+
+def _result_response(result: ConvertResult,
+                     headers: Optional[Dict[str, str]] = None) -> Response:
+    output, errors = result
+    for error in errors:
+        validation_failures.inc(get_error_rule(error))
+    with stage_seconds.time('serialize'):
+        if errors:
+            return _validation_error_response(errors)
+        if settings.fast_json or isinstance(output, bytes):
+            return OutputResponse(output, headers=headers or {})
+        return JSONResponse({'output': output}, headers=headers or {})
+
+
+def _locale_headers(locale: str) -> Dict[str, str]:
+    return {'Content-Language': locale, 'Vary': 'Accept-Language'}
+
+
+async def _convert_body_in_pool(body: bytes, locale: str, group: bool,
+                                all_errors: bool = False) -> Response:
+    """Convert body in a worker process, bypassing the results cache."""
+    request_bytes.observe(len(body))
+    with stage_seconds.time('pool'):
+        result = await _run_in_pool(
+            convert_json, body, validate_all if all_errors else parse, locale, group,
+        )
+    if result is None:
+        _decode_body(body)
+        raise AssertionError('body must be invalid JSON or null')
+    return _result_response(result, _locale_headers(locale))
 
 
 @app.post("/convert")
-def read_item(data: DataModel) -> Dict:
-    """View for API convert method."""
-    convertor = Convertor(data)
-    return {'output': convertor.get_humanized_data()}
+async def read_item(  # pylint: disable=too-many-arguments
+        request: Request, if_none_match: str = Header(''), accept_language: str = Header(''),
+        locale: Optional[str] = None, group: bool = False,
+        errors: ErrorsModeEnum = ErrorsModeEnum.FIRST) -> Response:
+    """View for API convert method.
+
+    Results are cached by the hash of the schedule, the same hash is used as
+    ETag, so repeated valid payloads can be short-circuited with "If-None-Match".
+    The body is decoded in the view to look up the cache before validation and
+    to measure every stage, the work runs in the threadpool. Large bodies are
+    converted in the process pool if it's enabled.
+
+    Output is formatted for the "locale" query parameter, or for the locale
+    preferred by "Accept-Language". With "group" weekdays following each
+    other with the same opening hours are joined into one line.
+
+    Validation stops at the first inconsistent action unless "errors" is
+    "all", then consistency errors of all weekdays are reported.
+
+    If profiling is enabled, the work of profiled requests runs under cProfile.
+    """
+    locale = _select_locale(locale, accept_language)
+    all_errors = errors == ErrorsModeEnum.ALL
+    body = await request.body()
+    if app.state.pool is not None and len(body) >= settings.pool_min_bytes:
+        return await _convert_body_in_pool(body, locale, group, all_errors)
+    if profiles is not None:
+        return await run_in_threadpool(
+            run_profiled, _convert_body, body, if_none_match, locale, group, all_errors,
+        )
+    return await run_in_threadpool(
+        _convert_body, body, if_none_match, locale, group, all_errors,
+    )
+
+
+@app.get("/metrics")
+def read_metrics() -> Response:
+    """View with metrics in Prometheus text format."""
+    return Response(registry.render(), media_type=CONTENT_TYPE)
+
+
+@app.get("/convert/cache")
+def read_cache_stats() -> Dict:
+    """View with statistics of the conversion cache.
+
+    Statistics of the persistent cache are in "persistent" if it's enabled.
+    """
+    if persistent_cache is None:
+        return cache.stats()
+    return {**cache.stats(), 'persistent': persistent_cache.stats()}
+
+
+def _get_profiles() -> ProfileStore:
+    if profiles is None:
+        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail='Profiling is disabled')
+    return profiles
+
+
+@app.get("/admin/profiles")
+def read_profiles() -> List[Dict]:
+    """View with descriptions of stored profiles of requests, the newest first."""
+    return _get_profiles().list()
+
+
+@app.get("/admin/profiles/{profile_id}")
+def read_profile(profile_id: str, raw: bool = False, sort: str = 'cumulative') -> Response:
+    """View with the text report of the profile, or with the pstats file if "raw" is set."""
+    store = _get_profiles()
+    entry = store.get(profile_id)
+    if entry is None:
+        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail='Profile not found')
+    if raw:
+        if not entry['profiled']:
+            raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail='Nothing was profiled')
+        with open(store.path(profile_id), 'rb') as profile:
+            return Response(profile.read(), media_type='application/octet-stream')
+    try:
+        return Response(store.report(profile_id, sort), media_type='text/plain')
+    except KeyError as exc:
+        raise HTTPException(
+            status_code=HTTPStatus.UNPROCESSABLE_ENTITY, detail=f'Unknown sort key {sort!r}',
+        ) from exc
+
+
+@app.post("/convert/batch")
+async def read_batch(data: BatchDataModel, request: Request) -> Dict:
+    """View for API batch convert method.
+
+    Batches with large bodies are converted in the process pool if it's enabled.
+    """
+    # The body has been read to validate the batch, it's returned from the request cache.
+    body = await request.body()
+    if app.state.pool is not None and len(body) >= settings.pool_min_bytes:
+        output, errors = await _run_in_pool(convert_batch, data.__root__, parse)
+    else:
+        output, errors = await run_in_threadpool(convert_batch, data.__root__, parse)
+    return {'output': output, 'errors': errors}
+
+
+@app.post("/convert/stream", response_class=NDJSONConversionResponse)
+async def read_stream() -> NDJSONConversionResponse:
+    """View for API streaming convert method, works with NDJSON.
+
+    The request body is read and converted by the response itself.
+    """
+    return NDJSONConversionResponse(settings.stream_max_line_length)
+
+
+def _get_session(handle: str) -> ScheduleSession:
+    session = sessions.get(handle)
+    if session is None:
+        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail='Session not found')
+    return session
+
+
+@app.post("/sessions")
+def create_session(data: DataModel) -> Dict:
+    """View storing the schedule to update it by changes of weekdays later.
+
+    Returns the handle of the session and the output of the schedule.
+    """
+    handle = uuid.uuid4().hex
+    session = ScheduleSession.from_model(data)
+    sessions.set(handle, session)
+    return {'handle': handle, 'output': session.output}
+
+
+@app.get("/sessions/{handle}")
+def read_session(handle: str) -> Dict:
+    """View with the output of the stored schedule."""
+    return {'handle': handle, 'output': _get_session(handle).output}
+
+
+@app.patch("/sessions/{handle}")
+def update_session(handle: str, data: PatchModel) -> Response:
+    """View replacing actions of weekdays of the stored schedule.
+
+    Only changed weekdays and their neighbours are validated and rendered
+    again, the full output is returned. The session isn't changed if the
+    result is invalid.
+    """
+    patch = {
+        weekday: None if actions is None else to_actions(actions)
+        for weekday, actions in data.__root__.items()
+    }
+    try:
+        session = _get_session(handle).apply(patch)
+    except ValidationError as exc:
+        return _validation_error_response(exc.errors())
+
+    sessions.set(handle, session)
+    return JSONResponse({'handle': handle, 'output': session.output})
+
+
+def _moment(week_second: Optional[int]) -> Optional[Dict]:
+    if week_second is None:
+        return None
+
+    weekday, value = to_moment(week_second)
+    return {'weekday': weekday, 'value': value}
+
+
+@app.post("/schedule/query")
+def read_query(data: QueryModel) -> Dict:
+    """View answering whether the schedule is open at the moment.
+
+    Also returns the next opening and closing after the moment.
+    """
+    index = WeekIndex(Schedule.from_model(data.schedule))
+    week_second = to_week_second(data.at.weekday, data.at.value)
+    return {
+        'is_open': index.is_open(week_second),
+        'next_opening': _moment(index.next_opening(week_second)),
+        'next_closing': _moment(index.next_closing(week_second)),
+    }
+
+
+@app.post("/schedule/open")
+def read_open(data: BulkQueryModel) -> Dict:
+    """View returning keys of schedules open at the moment."""
+    models, errors = validate_batch(data.schedules.__root__, parse)
+    schedules = {key: Schedule.from_model(model) for key, model in models.items()}
+    return {
+        'open': open_at(schedules, to_week_second(data.at.weekday, data.at.value)),
+        'errors': errors,
+    }
+
+
+@app.post("/combine")
+def read_combine(data: CombineModel, accept_language: str = Header(''),
+                 locale: Optional[str] = None, group: bool = False) -> Response:
+    """View combining schedules by union, intersection or difference.
+
+    Returns the result in the format of the input data of "/convert" and its
+    output, formatted the same way as "/convert" does.
+    """
+    locale = _select_locale(locale, accept_language)
+    try:
+        schedule = combine(
+            [Schedule.from_model(model) for model in data.schedules], data.operation,
+        )
+    except CombineError as exc:
+        error = ValidationError([ErrorWrapper(exc, loc='schedules')], CombineModel)
+        return _validation_error_response(error.errors())
+
+    convertor = Convertor(schedule, get_formatter(locale))
+    lines = convertor.get_grouped_data() if group else convertor.get_humanized_data()
+    return JSONResponse({
+        'data': {
+            weekday.value: [{'type': action.type.value, 'value': action.value}
+                            for action in actions]
+            for weekday, actions in schedule.to_actions().items()
+        },
+        'output': list(lines),
+    }, headers=_locale_headers(locale))
+
+
+@app.post("/calendar/resolve")
+def read_calendar(data: CalendarQueryModel, accept_language: str = Header(''),
+                  locale: Optional[str] = None) -> Response:
+    """View with hours of every date of the range of the calendar with overrides."""
+    locale = _select_locale(locale, accept_language)
+    calendar = ExceptionCalendar.from_model(data.calendar)
+    days = (data.end - data.start).days + 1
+    lines = calendar.humanize(data.start, days, get_formatter(locale))
+    return JSONResponse(
+        {'output': {day.isoformat(): line for day, line in lines}},
+        headers=_locale_headers(locale),
+    )
+
+
+def _openapi() -> Dict:
+    """Return OpenAPI schema with "DataModel" as request body of "/convert".
+
+    The view reads the raw body to look up the cache before validation, so the
+    schema of the body is documented here.
+    """
+    if app.openapi_schema:
+        return app.openapi_schema
+
+    schema = get_openapi(title=app.title, version=app.version, routes=app.routes)
+    model_schema = DataModel.schema(ref_template='#/components/schemas/{model}')
+    components = schema.setdefault('components', {}).setdefault('schemas', {})
+    components.update(model_schema.pop('definitions'))
+    components['DataModel'] = model_schema
+    schema['paths']['/convert']['post']['requestBody'] = {
+        'content': {'application/json': {'schema': {'$ref': '#/components/schemas/DataModel'}}},
+        'required': True,
+    }
+    app.openapi_schema = schema
+    return schema
+
+
+app.openapi = _openapi  # type: ignore
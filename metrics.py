@@ -0,0 +1,150 @@
+"""Metrics exported in Prometheus text format."""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence
+
+CONTENT_TYPE = 'text/plain; version=0.0.4'
+
+LATENCY_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25,
+)
+SIZE_BUCKETS = (64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384, 65536, 262144)
+
+
+def _format_labels(label_name: Optional[str], label: str, extra: str = '') -> str:
+    labels = [f'{label_name}="{label}"'] if label_name else []
+    if extra:
+        labels.append(extra)
+    return '{' + ','.join(labels) + '}' if labels else ''
+
+
+class Counter:
+    """Counter with an optional label."""
+
+    def __init__(self, name: str, documentation: str, label_name: Optional[str] = None):
+        self.name = name
+        self.documentation = documentation
+        self.label_name = label_name
+        self._values: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, label: str = '', amount: float = 1):
+        """Increase the counter of the label."""
+        with self._lock:
+            self._values[label] = self._values.get(label, 0) + amount
+
+    def get(self, label: str = '') -> float:
+        """Return value of the counter of the label."""
+        return self._values.get(label, 0)
+
+    def render(self) -> List[str]:
+        """Return lines of text format."""
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for label, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{_format_labels(self.label_name, label)} {value}')
+        return lines
+
+
+class _Series:  # pylint: disable=too-few-public-methods
+    """Observations of one histogram label."""
+    __slots__ = ('counts', 'sum')
+
+    def __init__(self, buckets: int):
+        self.counts = [0] * (buckets + 1)
+        self.sum = 0.0
+
+
+class Histogram:
+    """Histogram with fixed buckets and an optional label."""
+
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float],
+                 label_name: Optional[str] = None):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self.label_name = label_name
+        self._series: Dict[str, _Series] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, label: str = ''):
+        """Add observation of the label."""
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label)
+            if series is None:
+                series = self._series[label] = _Series(len(self.buckets))
+            series.counts[index] += 1
+            series.sum += value
+
+    @contextmanager
+    def time(self, label: str = '') -> Iterator[None]:
+        """Observe duration of the block in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, label)
+
+    def get_count(self, label: str = '') -> int:
+        """Return number of observations of the label."""
+        series = self._series.get(label)
+        return sum(series.counts) if series else 0
+
+    def render(self) -> List[str]:
+        """Return lines of text format."""
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for label, series in sorted(self._series.items()):
+                total = 0
+                for bound, count in zip((*self.buckets, '+Inf'), series.counts):
+                    total += count
+                    labels = _format_labels(self.label_name, label, f'le="{bound}"')
+                    lines.append(f'{self.name}_bucket{labels} {total}')
+                labels = _format_labels(self.label_name, label)
+                lines.append(f'{self.name}_sum{labels} {series.sum}')
+                lines.append(f'{self.name}_count{labels} {total}')
+        return lines
+
+
+class Registry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self) -> None:
+        self.metrics: List = []
+
+    def counter(self, name: str, documentation: str,
+                label_name: Optional[str] = None) -> Counter:
+        """Create and register counter."""
+        metric = Counter(name, documentation, label_name)
+        self.metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, buckets: Sequence[float],
+                  label_name: Optional[str] = None) -> Histogram:
+        """Create and register histogram."""
+        metric = Histogram(name, documentation, buckets, label_name)
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Return all metrics in text format."""
+        return ''.join(f'{line}\n' for metric in self.metrics for line in metric.render())
+
+
+registry = Registry()
+stage_seconds = registry.histogram(
+    'o_hours_convert_stage_seconds', 'Duration of /convert stages.', LATENCY_BUCKETS, 'stage',
+)
+request_bytes = registry.histogram(
+    'o_hours_convert_request_bytes', 'Size of /convert request bodies.', SIZE_BUCKETS,
+)
+validation_failures = registry.counter(
+    'o_hours_validation_failures_total', 'Validation failures of /convert by rule.', 'rule',
+)
+cache_lookups = registry.counter(
+    'o_hours_convert_cache_total', 'Lookups of /convert results cache.', 'result',
+)
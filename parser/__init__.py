@@ -0,0 +1,40 @@
+"""Opening hours parser.
+
+Public names are imported lazily on the first access (PEP 562), so
+`from parser import Convertor, Schedule` doesn't import pydantic, it's
+imported only with validation models.
+"""
+
+from importlib import import_module
+from typing import Any, List
+
+_EXPORTS = {
+    'ActionTypeEnum': 'parser.enums',
+    'ErrorsModeEnum': 'parser.enums',
+    'OperationEnum': 'parser.enums',
+    'WeekDaysEnum': 'parser.enums',
+    'Action': 'parser.schedule',
+    'Schedule': 'parser.schedule',
+    'Convertor': 'parser.convertor',
+    'combine': 'parser.algebra',
+    'ExceptionCalendar': 'parser.calendars',
+    'get_formatter': 'parser.formatting',
+    'DataModel': 'parser.models',
+    'ActionModel': 'parser.models',
+    'validate_fast': 'parser.validation',
+    'validate_all': 'parser.validation',
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted([*globals(), *_EXPORTS])
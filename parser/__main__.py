@@ -0,0 +1,5 @@
+"""Entry point of `python -m parser`."""
+
+from parser.cli import main
+
+main()
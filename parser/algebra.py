@@ -0,0 +1,92 @@
+"""Union, intersection and difference of schedules.
+
+Intervals of every schedule are cut at the end of the week and sorted, then
+one sweep over openings and closings of all schedules merged by time keeps
+the intervals where the operation holds. An interval open at the end of the
+week and at its start is joined back into one overnight opening, as
+`Schedule` stores it.
+"""
+
+from array import array
+from heapq import merge
+from itertools import groupby
+from operator import itemgetter
+from typing import Iterator, List, Sequence, Tuple
+
+from parser.enums import OperationEnum, WeekDaysEnum
+from parser.index import split_week_intervals
+from parser.schedule import DAY_SECONDS, WEEK_SECONDS, WEEKDAYS, Interval, Schedule
+
+# Event of the sweep: second of the week, change of the number of open
+# schedules, and whether it's an event of the first schedule.
+Event = Tuple[int, int, bool]
+
+
+class CombineError(ValueError):
+    """Result of the operation can't be represented by actions."""
+
+
+def _events(schedule: Schedule, first: bool) -> Iterator[Event]:
+    for opening, closing in sorted(split_week_intervals(schedule)):
+        yield opening, 1, first
+        yield closing, -1, first
+
+
+def _holds(operation: OperationEnum, count: int, open_count: int, first_open: int) -> bool:
+    if operation == OperationEnum.UNION:
+        return open_count > 0
+    if operation == OperationEnum.INTERSECTION:
+        return open_count == count
+    return first_open > 0 and open_count == 1
+
+
+def _sweep(schedules: Sequence[Schedule], operation: OperationEnum) -> List[Interval]:
+    """Return sorted intervals of week seconds, where the operation holds."""
+    intervals: List[Interval] = []
+    open_count = first_open = 0
+    start = None
+    events = merge(*(_events(schedule, index == 0) for index, schedule in enumerate(schedules)))
+    for second, changes in groupby(events, key=itemgetter(0)):
+        for _, change, first in changes:
+            open_count += change
+            if first:
+                first_open += change
+
+        holds = _holds(operation, len(schedules), open_count, first_open)
+        if holds and start is None:
+            start = second
+        elif not holds and start is not None:
+            intervals.append((start, second))
+            start = None
+    return intervals
+
+
+def _weekdays(schedules: Sequence[Schedule]) -> Tuple[WeekDaysEnum, ...]:
+    """Return weekdays of all schedules in the order of their first appearance."""
+    return tuple(dict.fromkeys(weekday for schedule in schedules for weekday in schedule.weekdays))
+
+
+def combine(schedules: Sequence[Schedule], operation: OperationEnum) -> Schedule:
+    """Return union or intersection of schedules, or the first one without the others.
+
+    Weekdays of the result are the weekdays of all schedules. Raise
+    CombineError if the result is open all week or through a whole day,
+    which actions can't describe.
+    """
+    if not schedules:
+        raise ValueError('At least one schedule is required')
+
+    intervals = _sweep(schedules, operation)
+    if intervals == [(0, WEEK_SECONDS)]:
+        raise CombineError('The result is open all week')
+
+    if len(intervals) > 1 and intervals[0][0] == 0 and intervals[-1][1] == WEEK_SECONDS:
+        intervals = [*intervals[1:-1], (intervals[-1][0], WEEK_SECONDS + intervals[0][1])]
+
+    for opening, closing in intervals:
+        if closing // DAY_SECONDS - opening // DAY_SECONDS > 1:
+            weekday = WEEKDAYS[opening // DAY_SECONDS]
+            raise CombineError(f'The result is open through the whole day after "{weekday.value}"')
+
+    values = array('l', (second for interval in intervals for second in interval))
+    return Schedule(_weekdays(schedules), values)
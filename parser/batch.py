@@ -0,0 +1,98 @@
+"""Batch conversion of multiple schedules."""
+
+import json
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from parser.cache import schedule_key
+from parser.convertor import Convertor
+from parser.formatting import DEFAULT_LOCALE, get_formatter
+from parser.models import DataModel
+
+from pydantic import ValidationError
+
+BatchOutput = Dict[str, List[str]]
+BatchErrors = Dict[str, List[Dict[str, Any]]]
+Parser = Callable[[Any], DataModel]
+
+
+def validate_item(raw: Any, parse: Parser = DataModel.parse_obj,
+                  ) -> Tuple[Optional[DataModel], List[Dict[str, Any]]]:
+    """Validate one raw schedule.
+
+    Return data model and an empty errors list, or None and the list of
+    validation errors in the same format as pydantic reports them.
+    """
+    try:
+        return parse(raw), []
+    except ValidationError as exc:
+        return None, exc.errors()
+
+
+def convert_item(raw: Any, parse: Parser = DataModel.parse_obj, locale: str = DEFAULT_LOCALE,
+                 group: bool = False) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """Validate and convert one raw schedule.
+
+    Return humanized output for the locale, with ranges of weekdays if `group`
+    is set, and an empty errors list, or an empty output and the list of
+    validation errors.
+    """
+    data, errors = validate_item(raw, parse)
+    if data is None:
+        return [], errors
+
+    convertor = Convertor(data, get_formatter(locale))
+    return list(convertor.get_grouped_data() if group else convertor.get_humanized_data()), []
+
+
+def convert_json(body: bytes, parse: Parser = DataModel.parse_obj, locale: str = DEFAULT_LOCALE,
+                 group: bool = False) -> Optional[Tuple[List[str], List[Dict[str, Any]]]]:
+    """Decode, validate and convert one JSON schedule.
+
+    Return the same result as `convert_item`, or None if the body isn't valid
+    JSON or is null, which callers report as a missing body.
+    """
+    try:
+        raw = json.loads(body)
+    except ValueError:
+        return None
+
+    if raw is None:
+        return None
+    return convert_item(raw, parse, locale, group)
+
+
+def convert_batch(items: Dict[str, Any],
+                  parse: Parser = DataModel.parse_obj) -> Tuple[BatchOutput, BatchErrors]:
+    """Convert keyed raw schedules, invalid items don't affect the others.
+
+    Identical schedules are validated and converted only once per batch.
+    """
+    output: BatchOutput = {}
+    errors: BatchErrors = {}
+    results: Dict[str, Tuple[List[str], List[Dict[str, Any]]]] = {}
+    for key, raw in items.items():
+        item_key = schedule_key(raw)
+        result = results.get(item_key)
+        if result is None:
+            result = results[item_key] = convert_item(raw, parse)
+
+        lines, item_errors = result
+        if item_errors:
+            errors[key] = item_errors
+        else:
+            output[key] = lines
+    return output, errors
+
+
+def validate_batch(items: Dict[str, Any], parse: Parser = DataModel.parse_obj,
+                   ) -> Tuple[Dict[str, DataModel], BatchErrors]:
+    """Validate keyed raw schedules, invalid items don't affect the others."""
+    models: Dict[str, DataModel] = {}
+    errors: BatchErrors = {}
+    for key, raw in items.items():
+        data, item_errors = validate_item(raw, parse)
+        if data is None:
+            errors[key] = item_errors
+        else:
+            models[key] = data
+    return models, errors
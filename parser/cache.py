@@ -0,0 +1,207 @@
+"""Cache of conversion results."""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Generic, Iterable, Optional, Tuple, TypeVar
+
+from parser.formatting import DEFAULT_LOCALE
+
+ValueT = TypeVar('ValueT')
+
+
+def schedule_key(raw: Any) -> str:
+    """Return canonical hash of raw schedule.
+
+    Weekdays order is kept because it defines the order of output lines,
+    keys of nested objects are sorted.
+    """
+    if isinstance(raw, dict):
+        raw = list(raw.items())
+    dump = json.dumps(raw, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(dump.encode()).hexdigest()
+
+
+def result_key(key: str, locale: str = DEFAULT_LOCALE, group: bool = False,
+               all_errors: bool = False) -> str:
+    """Return key of the result of the schedule with key `key` in the output mode."""
+    if locale != DEFAULT_LOCALE:
+        key = f'{key}.{locale}'
+    if group:
+        key = f'{key}.grouped'
+    if all_errors:
+        key = f'{key}.all-errors'
+    return key
+
+
+class ResultCache(Generic[ValueT]):
+    """In-process LRU cache with hit and miss counters.
+
+    Cache with zero size doesn't store anything. Cache is safe to share
+    between threads.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: 'OrderedDict[str, ValueT]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str) -> Optional[ValueT]:
+        """Return cached value and mark it as recently used."""
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: ValueT):
+        """Store value, evicting the least recently used one on overflow."""
+        if self.maxsize <= 0:
+            return
+
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """Remove all values and reset counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache counters."""
+        with self._lock:
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+class SQLiteCache:  # pylint: disable=too-many-instance-attributes
+    """Cache of JSON serializable values in SQLite database.
+
+    The database file may be shared by processes of the host, every process
+    opens its own connection. Values used least recently are evicted when the
+    number of values exceeds `maxsize`, the size is checked after every
+    hundredth part of `maxsize` of writes of the process. Time of use is
+    updated on reading at most once in `touch_interval` seconds, so hits
+    rarely write.
+    """
+
+    def __init__(self, path: str, maxsize: int, touch_interval: float = 60.0):
+        self.path = path
+        self.maxsize = maxsize
+        self.touch_interval = touch_interval
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._pid: Optional[int] = None
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return connection of the current process, creating the table if needed."""
+        if self._connection is None or self._pid != os.getpid():
+            connection = sqlite3.connect(
+                self.path, timeout=30, isolation_level=None, check_same_thread=False,
+            )
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS results '
+                '(key TEXT PRIMARY KEY, value TEXT NOT NULL, used REAL NOT NULL)',
+            )
+            connection.execute('CREATE INDEX IF NOT EXISTS results_used ON results (used)')
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connect().execute('SELECT COUNT(*) FROM results').fetchone()[0]
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return stored value."""
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute(
+                'SELECT value, used FROM results WHERE key = ?', (key,),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            value, used = row
+            now = time.time()
+            if now - used > self.touch_interval:
+                connection.execute('UPDATE results SET used = ? WHERE key = ?', (now, key))
+            return json.loads(value)
+
+    def set(self, key: str, value: Any):
+        """Store value."""
+        self.set_many([(key, value)])
+
+    def set_many(self, items: Iterable[Tuple[str, Any]]) -> int:
+        """Store values in one transaction, return the number of values."""
+        if self.maxsize <= 0:
+            return 0
+
+        now = time.time()
+        rows = [(key, json.dumps(value, separators=(',', ':')), now) for key, value in items]
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute('BEGIN')
+                connection.executemany(
+                    'INSERT OR REPLACE INTO results (key, value, used) VALUES (?, ?, ?)', rows,
+                )
+            self._writes += len(rows)
+            if self._writes >= max(self.maxsize // 100, 1):
+                self._writes = 0
+                self._evict(connection)
+        return len(rows)
+
+    def _evict(self, connection: sqlite3.Connection):
+        size = connection.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+        if size > self.maxsize:
+            connection.execute(
+                'DELETE FROM results WHERE key IN '
+                '(SELECT key FROM results ORDER BY used LIMIT ?)',
+                (size - self.maxsize,),
+            )
+
+    def clear(self):
+        """Remove all values and reset counters."""
+        with self._lock:
+            self._connect().execute('DELETE FROM results')
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache counters."""
+        return {
+            'size': len(self),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
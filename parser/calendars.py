@@ -0,0 +1,93 @@
+"""Weekly schedules with dated overrides.
+
+An override replaces actions of the weekday of its date, e.g. an empty list
+closes the venue on a holiday. Hours of every date are interned day patterns:
+patterns of weekdays are built once per calendar, patterns of overridden
+dates and of the dates before them (their openings may be closed by the
+override) are built once too. Dates of a range map to weekdays the same way
+for all calendars, so a range is resolved by one cached `itemgetter` over
+the patterns of weekdays, only overridden dates are replaced afterwards.
+"""
+
+from datetime import date
+from functools import lru_cache
+from operator import itemgetter
+from typing import (
+    TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, Mapping, Optional, Sequence, Tuple,
+)
+
+from parser.dates import ONE_DAY, Actions, dated_actions, weekday_of
+from parser.enums import WeekDaysEnum
+from parser.formatting import Formatter, get_formatter
+from parser.patterns import DayPattern, intern_day
+from parser.schedule import WEEKDAY_INDEXES, WEEKDAYS, day_intervals
+
+if TYPE_CHECKING:  # pragma: no cover
+    from parser.models import CalendarModel
+
+
+@lru_cache(maxsize=1024)
+def _weekday_getter(first: int, days: int) -> Callable[[Sequence[Any]], Tuple[Any, ...]]:
+    """Return function picking items of weekdays of `days` dates from the week."""
+    indexes = [(first + offset) % 7 for offset in range(days)]
+    if days == 1:
+        return lambda week: (week[indexes[0]],)
+    return itemgetter(*indexes)
+
+
+class ExceptionCalendar:
+    """Weekly schedule with validated dated overrides."""
+    __slots__ = ('week', 'dates')
+
+    def __init__(self, weekly: Mapping[WeekDaysEnum, Actions],
+                 overrides: Mapping[date, Actions]):
+        self.week: Tuple[DayPattern, ...] = tuple(
+            intern_day(day_intervals(weekly.get(weekday, ()), weekly.get(weekday.next, ())))
+            for weekday in WEEKDAYS
+        )
+        self.dates: Dict[date, DayPattern] = {}
+        for day in sorted({*overrides, *(day - ONE_DAY for day in overrides)}):
+            self.dates[day] = intern_day(day_intervals(
+                dated_actions(weekly, overrides, day),
+                dated_actions(weekly, overrides, day + ONE_DAY),
+            ))
+
+    @classmethod
+    def from_model(cls, model: 'CalendarModel') -> 'ExceptionCalendar':
+        """Build calendar from validated calendar model."""
+        return cls(model.weekly.__root__, model.overrides)
+
+    def day(self, day: date) -> DayPattern:
+        """Return the pattern of hours opened on the date."""
+        pattern = self.dates.get(day)
+        if pattern is None:
+            return self.week[WEEKDAY_INDEXES[weekday_of(day)]]
+        return pattern
+
+    def resolve(self, start: date, days: int) -> Tuple[DayPattern, ...]:
+        """Return patterns of `days` dates from `start`."""
+        patterns = _weekday_getter(start.isoweekday() % 7, days)(self.week)
+        end = start + days * ONE_DAY
+        changed = [(day, pattern) for day, pattern in self.dates.items() if start <= day < end]
+        if not changed:
+            return patterns
+
+        dated = list(patterns)
+        for day, pattern in changed:
+            dated[(day - start).days] = pattern
+        return tuple(dated)
+
+    def humanize(self, start: date, days: int,
+                 formatter: Optional[Formatter] = None) -> Iterator[Tuple[date, str]]:
+        """Yield dates with output lines of their hours."""
+        formatter = formatter or get_formatter()
+        for offset, pattern in enumerate(self.resolve(start, days)):
+            day = start + offset * ONE_DAY
+            yield day, pattern.line(weekday_of(day), formatter)
+
+
+def resolve_many(calendars: Iterable[ExceptionCalendar], start: date,
+                 days: int) -> Iterator[Tuple[DayPattern, ...]]:
+    """Yield patterns of `days` dates from `start` of every calendar."""
+    for calendar in calendars:
+        yield calendar.resolve(start, days)
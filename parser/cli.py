@@ -0,0 +1,292 @@
+"""Command line interface.
+
+Usage:
+    python -m parser convert schedules/ --output converted/ --workers 4
+    python -m parser warm-cache catalogue.ndjson --path cache.sqlite3
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import IO, Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from parser.batch import convert_item
+from parser.cache import SQLiteCache, result_key, schedule_key
+from parser.formatting import DEFAULT_LOCALE, LOCALES
+from parser.models import DataModel
+from parser.validation import validate_fast
+
+from pydantic import ValidationError
+from pydantic.error_wrappers import ErrorWrapper
+from pydantic.errors import MissingError
+
+CHUNK_SIZE = 1000
+INPUT_SUFFIXES = ('.json', '.ndjson')
+PARSE_ERROR_BODY = b'{"detail":"There was an error parsing the body"}'
+
+# Response body and errors of the response, errors are empty on success.
+Converted = Tuple[bytes, List[Dict[str, Any]]]
+
+
+def _dumps(content: Any) -> bytes:
+    """Encode content the same way `JSONResponse` does."""
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(',', ':'),
+    ).encode('utf-8')
+
+
+def _body_errors(errors: List[ErrorWrapper]) -> List[Dict[str, Any]]:
+    return ValidationError(errors, DataModel).errors()
+
+
+def convert_body(body: bytes, locale: str = DEFAULT_LOCALE, group: bool = False) -> Converted:
+    """Return the body of `/convert` response to the request body, and errors.
+
+    Errors are in the "detail" of the response body: validation errors with
+    locations prefixed by "body", or the error of body parsing.
+    """
+    raw = None
+    if body:
+        try:
+            raw = json.loads(body)
+        except json.JSONDecodeError as exc:
+            errors = _body_errors([ErrorWrapper(exc, ('body', exc.pos))])
+            return _dumps({'detail': errors}), errors
+        except ValueError:
+            error = {
+                'loc': ('body',), 'msg': 'There was an error parsing the body', 'type': 'parse',
+            }
+            return PARSE_ERROR_BODY, [error]
+
+    if raw is None:
+        errors = _body_errors([ErrorWrapper(MissingError(), loc=('body',))])
+        return _dumps({'detail': errors}), errors
+
+    output, item_errors = convert_item(raw, validate_fast, locale, group)
+    if item_errors:
+        errors = [{**error, 'loc': ('body', *error['loc'])} for error in item_errors]
+        return _dumps({'detail': errors}), errors
+    return _dumps({'output': output}), []
+
+
+def convert_lines(lines: List[bytes], locale: str = DEFAULT_LOCALE,
+                  group: bool = False) -> List[Converted]:
+    """Convert bodies, it's the task of worker processes."""
+    return [convert_body(line, locale, group) for line in lines]
+
+
+def map_ordered(function: Callable[..., Any], chunks: Iterable[Any], workers: int,
+                *args: Any) -> Iterator[Any]:
+    """Yield results of the function for chunks in the order of chunks.
+
+    With several workers chunks are processed in worker processes, at most
+    two chunks per worker are read ahead, so memory use doesn't depend on
+    the size of input.
+    """
+    if workers <= 1:
+        for chunk in chunks:
+            yield function(chunk, *args)
+        return
+
+    with ProcessPoolExecutor(workers) as executor:
+        pending: Deque[Future] = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(function, chunk, *args))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def find_inputs(paths: Iterable[str]) -> Iterator[Tuple[Path, Path]]:
+    """Yield JSON and NDJSON files with paths of outputs relative to the output directory.
+
+    Directories are searched recursively, relative paths of files in them are kept.
+    """
+    for name in paths:
+        path = Path(name)
+        if path.is_dir():
+            for file_path in sorted(path.rglob('*')):
+                if file_path.suffix in INPUT_SUFFIXES and file_path.is_file():
+                    yield file_path, file_path.relative_to(path)
+        else:
+            yield path, Path(path.name)
+
+
+class Progress:
+    """Counters of converted schedules reported to stderr."""
+
+    def __init__(self, stream: Optional[IO[str]], interval: float = 1.0):
+        self.stream = stream
+        self.interval = interval
+        self.converted = 0
+        self.failed = 0
+        self.started = time.perf_counter()
+        self._reported = self.started
+
+    def update(self, results: List[Converted]):
+        """Count results and report progress not more often than the interval."""
+        self.converted += len(results)
+        self.failed += sum(1 for _, errors in results if errors)
+        now = time.perf_counter()
+        if now - self._reported >= self.interval:
+            self._reported = now
+            self.report()
+
+    def report(self):
+        """Write counters and throughput."""
+        if self.stream is None:
+            return
+
+        elapsed = time.perf_counter() - self.started
+        rate = self.converted / elapsed if elapsed else 0.0
+        print(
+            f'{self.converted} schedules, {self.failed} failed, '
+            f'{elapsed:.1f} s, {rate:.0f} schedules/s',
+            file=self.stream,
+        )
+
+
+def _read_chunks(path: Path) -> Iterator[List[bytes]]:
+    """Read file by chunks of bodies: the whole JSON file, or non-empty NDJSON lines."""
+    with path.open('rb') as input_file:
+        if path.suffix != '.ndjson':
+            yield [input_file.read()]
+            return
+
+        lines = (line.rstrip(b'\r\n') for line in input_file if line.strip())
+        while True:
+            chunk = list(islice(lines, CHUNK_SIZE))
+            if not chunk:
+                return
+            yield chunk
+
+
+class FileConvertor:  # pylint: disable=too-few-public-methods
+    """Convertor of JSON and NDJSON files to files with the same names in `output_dir`.
+
+    Every schedule is converted to the body `/convert` responds with, one
+    per line for NDJSON. Errors are written to `errors_file` as NDJSON with
+    the file, the line number and "detail".
+    """
+
+    def __init__(self, output_dir: str, workers: int = 1,
+                 errors_file: Optional[IO[str]] = None, progress: Optional[Progress] = None):
+        self.output_dir = Path(output_dir)
+        self.workers = workers
+        self.errors_file = errors_file
+        self.progress = progress or Progress(None)
+
+    def _write_errors(self, path: Path, number: int, errors: List[Dict[str, Any]]):
+        if self.errors_file is not None:
+            record = {'file': str(path), 'line': number, 'detail': errors}
+            self.errors_file.write(_dumps(record).decode('utf-8') + '\n')
+
+    def _convert_file(self, path: Path, output_path: Path, locale: str, group: bool):
+        chunks = _read_chunks(path)
+        separator = b'\n' if path.suffix == '.ndjson' else b''
+        number = 0
+        with output_path.open('wb') as output:
+            for results in map_ordered(convert_lines, chunks, self.workers, locale, group):
+                for body, errors in results:
+                    number += 1
+                    output.write(body + separator)
+                    if errors:
+                        self._write_errors(path, number, errors)
+                self.progress.update(results)
+
+    def convert(self, paths: Iterable[str], locale: str = DEFAULT_LOCALE,
+                group: bool = False) -> Progress:
+        """Convert files and files of directories, return progress counters."""
+        for path, relative in find_inputs(paths):
+            output_path = self.output_dir / relative
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            self._convert_file(path, output_path, locale, group)
+        self.progress.report()
+        return self.progress
+
+
+def warm_cache(dump: IO[str], store: SQLiteCache, locale: str = DEFAULT_LOCALE,
+               group: bool = False) -> Tuple[int, int]:
+    """Store results of schedules of the NDJSON dump in the persistent cache.
+
+    Results are stored under the same keys as `/convert` uses for the output
+    mode, in transactions of `CHUNK_SIZE` results. Return numbers of stored
+    results and of skipped lines which aren't JSON.
+    """
+    stored = skipped = 0
+    chunk: List[Tuple[str, Any]] = []
+    for line in dump:
+        if not line.strip():
+            continue
+
+        try:
+            raw = json.loads(line)
+        except ValueError:
+            skipped += 1
+            continue
+
+        key = result_key(schedule_key(raw), locale, group)
+        chunk.append((key, convert_item(raw, validate_fast, locale, group)))
+        if len(chunk) == CHUNK_SIZE:
+            stored += store.set_many(chunk)
+            chunk = []
+    return stored + store.set_many(chunk), skipped
+
+
+def _warm_cache_command(args: argparse.Namespace):
+    store = SQLiteCache(args.path, args.size)
+    if args.dump == '-':
+        stored, skipped = warm_cache(sys.stdin, store, args.locale, args.group)
+    else:
+        with open(args.dump, encoding='utf-8') as dump:
+            stored, skipped = warm_cache(dump, store, args.locale, args.group)
+    print(f'Stored {stored} results, skipped {skipped} lines', file=sys.stderr)
+
+
+def _convert_command(args: argparse.Namespace):
+    progress = Progress(None if args.quiet else sys.stderr)
+    if args.errors:
+        with open(args.errors, 'w', encoding='utf-8') as errors_file:
+            convertor = FileConvertor(args.output, args.workers, errors_file, progress)
+            convertor.convert(args.inputs, args.locale, args.group)
+    else:
+        convertor = FileConvertor(args.output, args.workers, None, progress)
+        convertor.convert(args.inputs, args.locale, args.group)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Run the command."""
+    argument_parser = argparse.ArgumentParser(
+        prog='python -m parser', description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    commands = argument_parser.add_subparsers(dest='command', required=True)
+
+    convert = commands.add_parser(
+        'convert', help='convert JSON and NDJSON files to the output of /convert',
+    )
+    convert.add_argument('inputs', nargs='+', help='JSON or NDJSON files, or directories')
+    convert.add_argument('--output', required=True, help='directory to write outputs to')
+    convert.add_argument('--workers', type=int, default=1, help='number of worker processes')
+    convert.add_argument('--errors', help='path to write the NDJSON error report to')
+    convert.add_argument('--locale', choices=sorted(LOCALES), default=DEFAULT_LOCALE)
+    convert.add_argument('--group', action='store_true', help='join equal weekdays')
+    convert.add_argument('--quiet', action='store_true', help="don't report progress")
+    convert.set_defaults(handler=_convert_command)
+
+    warm = commands.add_parser('warm-cache', help='preload the persistent cache from NDJSON')
+    warm.add_argument('dump', help='NDJSON file with a schedule per line, "-" for stdin')
+    warm.add_argument('--path', required=True, help='path to the SQLite database')
+    warm.add_argument('--size', type=int, default=1000000, help='maximal number of results')
+    warm.add_argument('--locale', choices=sorted(LOCALES), default=DEFAULT_LOCALE)
+    warm.add_argument('--group', action='store_true', help='store grouped output')
+    warm.set_defaults(handler=_warm_cache_command)
+
+    args = argument_parser.parse_args(argv)
+    args.handler(args)
@@ -1,25 +1,35 @@
 """Convertor class."""
 
-from copy import deepcopy
-from datetime import datetime
-from typing import Dict, Iterator, Tuple, List, Union
+from typing import TYPE_CHECKING, Any, Iterator, Tuple, List, Optional, Union
 
-from parser.models import ActionTypeEnum, WeekDaysEnum, ActionModel, DataModel
+from parser.formatting import (
+    SECONDS_PER_MINUTE, Formatter, ParsedDay, build_time_labels, get_formatter,
+)
+from parser.patterns import intern_day
+from parser.schedule import WEEKDAY_INDEXES, Schedule
+
+if TYPE_CHECKING:  # pragma: no cover
+    from parser.models import DataModel
+
+# 12-hour clock labels for every minute of a day.
+TIME_LABELS = build_time_labels(12, '.')
 
 
 class Convertor:
-    """Convert input data to human-readable format."""
+    """Convert input data to human-readable format.
+
+    Output is formatted by the formatter of the default locale unless another
+    formatter is passed. Converting a `Schedule` doesn't import pydantic.
+    """
 
-    def __init__(self, data: DataModel):
-        self.data = data.__root__
+    def __init__(self, data: Union['DataModel', Schedule],
+                 formatter: Optional[Formatter] = None):
+        self.schedule = data if isinstance(data, Schedule) else Schedule.from_model(data)
+        self.formatter = formatter or get_formatter()
 
     @staticmethod
     def _seconds_to_time_string(seconds: int) -> str:
-        time = datetime.utcfromtimestamp(seconds)
-        if time.minute:
-            return time.strftime('%-I.%M %p')
-
-        return time.strftime('%-I %p')
+        return TIME_LABELS[seconds // SECONDS_PER_MINUTE]
 
     @staticmethod
     def _humanize_action_item(value: Union[str, List[Tuple[str, str]]]) -> str:
@@ -28,35 +38,40 @@ class Convertor:
 
         return ', '.join(' - '.join(pair) for pair in value)
 
-    def _get_normalized_data(self) -> Dict[WeekDaysEnum, List[ActionModel]]:
-        data = deepcopy(self.data)
-        for weekday, actions in data.items():
-            if not actions:
-                continue
-
-            if actions[0].type == ActionTypeEnum.CLOSE:
-                data[weekday.prev].append(actions.pop(0))
-        return data
-
-    def get_parsed_data(self) -> Iterator[Tuple[str, Union[str, List[Tuple[str, str]]]]]:
+    def get_parsed_data(self) -> Iterator[ParsedDay]:
         """Return data in convenient format."""
-        data = self._get_normalized_data()
-        for weekday, actions in data.items():
-            if actions:
-                actions_pairs = zip(actions[::2], actions[1::2])
-                yield weekday.capitalize(), [
-                    (
-                        self._seconds_to_time_string(open_action.value),
-                        self._seconds_to_time_string(close_action.value),
-                    ) for open_action, close_action in actions_pairs
-                ]
-            else:
-                yield weekday.capitalize(), 'Closed'
+        for weekday, intervals in self.schedule.get_day_intervals().items():
+            yield self.formatter.parse_day(weekday, intervals)
 
     def get_humanized_data(self) -> Iterator[str]:
-        """Return data in human-readable format."""
-        for weekday, value in self.get_parsed_data():
-            yield '{weekday}: {value}'.format(
-                weekday=weekday,
-                value=self._humanize_action_item(value),
-            )
+        """Return data in human-readable format.
+
+        Lines are looked up in interned day patterns, every distinct line is
+        rendered once.
+        """
+        formatter = self.formatter
+        for weekday, intervals in self.schedule.get_day_intervals().items():
+            yield intern_day(intervals).line(weekday, formatter)
+
+    def get_grouped_data(self) -> Iterator[str]:
+        """Return data in human-readable format with ranges of weekdays.
+
+        Weekdays following each other in the week and in the data with equal
+        intervals are joined into one line, e.g. "Monday - Friday: 9 AM - 5 PM".
+        """
+        groups: List[List[Any]] = []
+        for weekday, intervals in self.schedule.get_day_intervals().items():
+            if groups:
+                _, last, last_intervals = groups[-1]
+                if (intervals == last_intervals
+                        and WEEKDAY_INDEXES[weekday] == (WEEKDAY_INDEXES[last] + 1) % 7):
+                    groups[-1][1] = weekday
+                    continue
+            groups.append([weekday, weekday, intervals])
+
+        formatter = self.formatter
+        for first, last, intervals in groups:
+            if first == last:
+                yield intern_day(intervals).line(first, formatter)
+            else:
+                yield formatter.format_days(first, last, intervals)
@@ -0,0 +1,36 @@
+"""Dates of calendars with overrides of weekdays, importable without pydantic."""
+
+from datetime import date, timedelta
+from typing import Any, Dict, Mapping, Sequence
+
+from parser.enums import WEEKDAYS_RING, WeekDaysEnum
+
+ONE_DAY = timedelta(days=1)
+
+Actions = Sequence[Any]
+
+
+def weekday_of(day: date) -> WeekDaysEnum:
+    """Return weekday of the date."""
+    return WEEKDAYS_RING[day.isoweekday() % 7]
+
+
+def dated_actions(weekly: Mapping[WeekDaysEnum, Actions], overrides: Mapping[date, Actions],
+                  day: date) -> Actions:
+    """Return actions of the date, missing weekdays have no actions."""
+    if day in overrides:
+        return overrides[day]
+    return weekly.get(weekday_of(day), ())
+
+
+def override_window(weekly: Mapping[WeekDaysEnum, Actions], overrides: Mapping[date, Actions],
+                    day: date) -> Dict[WeekDaysEnum, Actions]:
+    """Return actions of two dates before and after the date by their weekdays.
+
+    Consistency rules of the date and its neighbours can be checked on the
+    window as on a week.
+    """
+    return {
+        weekday_of(day + offset * ONE_DAY): dated_actions(weekly, overrides, day + offset * ONE_DAY)
+        for offset in range(-2, 3)
+    }
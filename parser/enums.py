@@ -0,0 +1,54 @@
+"""Enumerators of input data, importable without pydantic."""
+
+from enum import Enum
+from typing import Dict, Tuple
+
+
+class WeekDaysEnum(str, Enum):
+    """Enumerator of weekdays."""
+    SUNDAY = 'sunday'
+    MONDAY = 'monday'
+    TUESDAY = 'tuesday'
+    WEDNESDAY = 'wednesday'
+    THURSDAY = 'thursday'
+    FRIDAY = 'friday'
+    SATURDAY = 'saturday'
+
+    @property
+    def prev(self) -> 'WeekDaysEnum':
+        """Return previous weekday."""
+        return _PREV_DAYS[self]
+
+    @property
+    def next(self) -> 'WeekDaysEnum':
+        """Return next weekday."""
+        return _NEXT_DAYS[self]
+
+
+# Ring of weekdays, neighbours are looked up without scanning the enumerator.
+WEEKDAYS_RING: Tuple[WeekDaysEnum, ...] = tuple(WeekDaysEnum)
+_PREV_DAYS: Dict[WeekDaysEnum, WeekDaysEnum] = dict(
+    zip(WEEKDAYS_RING, WEEKDAYS_RING[-1:] + WEEKDAYS_RING[:-1]),
+)
+_NEXT_DAYS: Dict[WeekDaysEnum, WeekDaysEnum] = dict(
+    zip(WEEKDAYS_RING, WEEKDAYS_RING[1:] + WEEKDAYS_RING[:1]),
+)
+
+
+class ActionTypeEnum(str, Enum):
+    """Enumerator of actions types."""
+    OPEN = 'open'
+    CLOSE = 'close'
+
+
+class ErrorsModeEnum(str, Enum):
+    """Enumerator of validation error reporting modes."""
+    FIRST = 'first'
+    ALL = 'all'
+
+
+class OperationEnum(str, Enum):
+    """Enumerator of operations combining schedules."""
+    UNION = 'union'
+    INTERSECTION = 'intersection'
+    DIFFERENCE = 'difference'
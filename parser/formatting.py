@@ -0,0 +1,206 @@
+"""Locale dependent formatting of output lines."""
+
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from parser.enums import WeekDaysEnum
+from parser.schedule import Interval
+
+SECONDS_PER_MINUTE = 60
+MINUTES_PER_DAY = 24 * 60
+DEFAULT_LOCALE = 'en'
+
+ParsedDay = Tuple[str, Union[str, List[Tuple[str, str]]]]
+
+
+class LocaleSpec(NamedTuple):
+    """Formatting rules of a locale.
+
+    Day names are in the order of `WeekDaysEnum`, starting from Sunday.
+    """
+    day_names: Tuple[str, ...]
+    closed: str
+    clock: int = 24
+    time_separator: str = ':'
+    range_separator: str = ' - '
+    list_separator: str = ', '
+
+
+LOCALES: Dict[str, LocaleSpec] = {
+    'en': LocaleSpec(
+        ('Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday'),
+        'Closed', clock=12, time_separator='.',
+    ),
+    'en-GB': LocaleSpec(
+        ('Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday'),
+        'Closed',
+    ),
+    'da': LocaleSpec(
+        ('Søndag', 'Mandag', 'Tirsdag', 'Onsdag', 'Torsdag', 'Fredag', 'Lørdag'),
+        'Lukket', time_separator='.',
+    ),
+    'de': LocaleSpec(
+        ('Sonntag', 'Montag', 'Dienstag', 'Mittwoch', 'Donnerstag', 'Freitag', 'Samstag'),
+        'Geschlossen',
+    ),
+    'es': LocaleSpec(
+        ('Domingo', 'Lunes', 'Martes', 'Miércoles', 'Jueves', 'Viernes', 'Sábado'),
+        'Cerrado',
+    ),
+    'fi': LocaleSpec(
+        ('Sunnuntai', 'Maanantai', 'Tiistai', 'Keskiviikko', 'Torstai', 'Perjantai',
+         'Lauantai'),
+        'Suljettu', time_separator='.', range_separator='–',
+    ),
+    'fr': LocaleSpec(
+        ('Dimanche', 'Lundi', 'Mardi', 'Mercredi', 'Jeudi', 'Vendredi', 'Samedi'),
+        'Fermé',
+    ),
+    'it': LocaleSpec(
+        ('Domenica', 'Lunedì', 'Martedì', 'Mercoledì', 'Giovedì', 'Venerdì', 'Sabato'),
+        'Chiuso',
+    ),
+    'nb': LocaleSpec(
+        ('Søndag', 'Mandag', 'Tirsdag', 'Onsdag', 'Torsdag', 'Fredag', 'Lørdag'),
+        'Stengt',
+    ),
+    'nl': LocaleSpec(
+        ('Zondag', 'Maandag', 'Dinsdag', 'Woensdag', 'Donderdag', 'Vrijdag', 'Zaterdag'),
+        'Gesloten',
+    ),
+    'pl': LocaleSpec(
+        ('Niedziela', 'Poniedziałek', 'Wtorek', 'Środa', 'Czwartek', 'Piątek', 'Sobota'),
+        'Zamknięte',
+    ),
+    'pt': LocaleSpec(
+        ('Domingo', 'Segunda-feira', 'Terça-feira', 'Quarta-feira', 'Quinta-feira',
+         'Sexta-feira', 'Sábado'),
+        'Fechado',
+    ),
+    'ru': LocaleSpec(
+        ('Воскресенье', 'Понедельник', 'Вторник', 'Среда', 'Четверг', 'Пятница', 'Суббота'),
+        'Закрыто', range_separator='–',
+    ),
+    'sv': LocaleSpec(
+        ('Söndag', 'Måndag', 'Tisdag', 'Onsdag', 'Torsdag', 'Fredag', 'Lördag'),
+        'Stängt', range_separator='–',
+    ),
+}
+
+
+@lru_cache(maxsize=None)
+def build_time_labels(clock: int, time_separator: str) -> Tuple[str, ...]:
+    """Return labels for every minute of a day by 12-hour or 24-hour clock.
+
+    12-hour labels omit zero minutes: "10 AM", "10.05 AM".
+    """
+    labels = []
+    for minutes in range(MINUTES_PER_DAY):
+        hour, minute = divmod(minutes, 60)
+        if clock == 24:
+            labels.append(f'{hour:02d}{time_separator}{minute:02d}')
+            continue
+
+        period = 'AM' if hour < 12 else 'PM'
+        hour = hour % 12 or 12
+        if minute:
+            labels.append(f'{hour}{time_separator}{minute:02d} {period}')
+        else:
+            labels.append(f'{hour} {period}')
+    return tuple(labels)
+
+
+class Formatter:
+    """Formatter of output lines compiled from the locale spec."""
+    __slots__ = ('day_names', 'prefixes', 'closed_lines', 'time_labels',
+                 'range_separator', 'list_separator', 'closed')
+
+    def __init__(self, spec: LocaleSpec):
+        self.day_names = dict(zip(WeekDaysEnum, spec.day_names))
+        self.prefixes = {weekday: f'{name}: ' for weekday, name in self.day_names.items()}
+        self.closed_lines = {
+            weekday: f'{prefix}{spec.closed}' for weekday, prefix in self.prefixes.items()
+        }
+        self.time_labels = build_time_labels(spec.clock, spec.time_separator)
+        self.range_separator = spec.range_separator
+        self.list_separator = spec.list_separator
+        self.closed = spec.closed
+
+    def parse_day(self, weekday: WeekDaysEnum, intervals: Sequence[Interval]) -> ParsedDay:
+        """Return the day name with pairs of time labels, or with the closed text."""
+        if not intervals:
+            return self.day_names[weekday], self.closed
+
+        labels = self.time_labels
+        return self.day_names[weekday], [
+            (labels[opening // SECONDS_PER_MINUTE], labels[closing // SECONDS_PER_MINUTE])
+            for opening, closing in intervals
+        ]
+
+    def _format_intervals(self, intervals: Sequence[Interval]) -> str:
+        if not intervals:
+            return self.closed
+
+        labels = self.time_labels
+        separator = self.range_separator
+        return self.list_separator.join(
+            labels[opening // SECONDS_PER_MINUTE] + separator
+            + labels[closing // SECONDS_PER_MINUTE]
+            for opening, closing in intervals
+        )
+
+    def format_day(self, weekday: WeekDaysEnum, intervals: Sequence[Interval]) -> str:
+        """Return output line of the weekday with intervals of day seconds."""
+        if not intervals:
+            return self.closed_lines[weekday]
+        return self.prefixes[weekday] + self._format_intervals(intervals)
+
+    def format_days(self, first: WeekDaysEnum, last: WeekDaysEnum,
+                    intervals: Sequence[Interval]) -> str:
+        """Return output line of the range of weekdays with the same intervals."""
+        if first == last:
+            return self.format_day(first, intervals)
+
+        days = f'{self.day_names[first]}{self.range_separator}{self.day_names[last]}'
+        return f'{days}: {self._format_intervals(intervals)}'
+
+
+@lru_cache(maxsize=None)
+def get_formatter(locale: str = DEFAULT_LOCALE) -> Formatter:
+    """Return formatter of the locale, raise KeyError if it isn't supported."""
+    return Formatter(LOCALES[locale])
+
+
+_LOWERED_LOCALES = {locale.lower(): locale for locale in LOCALES}
+
+
+def find_locale(tag: str) -> Optional[str]:
+    """Return the supported locale of the language tag, or None.
+
+    Locales are matched case-insensitively or by the language, e.g. "de-AT"
+    selects "de".
+    """
+    tag = tag.lower()
+    return _LOWERED_LOCALES.get(tag) or _LOWERED_LOCALES.get(tag.split('-')[0])
+
+
+@lru_cache(maxsize=1024)
+def negotiate_locale(accept_language: str) -> Optional[str]:
+    """Return the supported locale preferred by the Accept-Language header."""
+    ranges = []
+    for index, item in enumerate(accept_language.split(',')):
+        tag, _, params = item.strip().partition(';')
+        quality = 1.0
+        if params.strip().startswith('q='):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                continue
+        if tag and quality > 0:
+            ranges.append((-quality, index, tag.strip()))
+
+    for _, _, tag in sorted(ranges):
+        locale = find_locale(tag)
+        if locale is not None:
+            return locale
+    return None
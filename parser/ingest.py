@@ -0,0 +1,88 @@
+"""Decoding of raw JSON bodies straight into actions.
+
+JSON is decoded and checked in one pass: every action object is turned into
+`Action` by the hook of the decoder, so neither dicts of actions nor pydantic
+models are built. Only bodies in the canonical form are handled, for any
+other body `decode_actions` returns None and the caller falls back to
+`json.loads` and pydantic to get identical results and errors.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from parser.schedule import Schedule
+from parser.validation import ACTION_TYPES, MAX_VALUE, WEEKDAYS, Action, check_parsed
+
+from pydantic import ValidationError
+
+Actions = Dict[Any, List[Action]]
+
+
+class _NotCanonical(Exception):
+    """Body isn't in the canonical form."""
+
+
+def _object_hook(pairs: List[Tuple[str, Any]]) -> Any:
+    if len(pairs) == 2:
+        (type_key, action_type), (value_key, value) = pairs
+        if type_key == 'type' and value_key == 'value':
+            action_type = ACTION_TYPES.get(action_type) if isinstance(action_type, str) else None
+            # bool is a subclass of int, so the class is compared exactly.
+            if action_type is not None and value.__class__ is int and 0 < value <= MAX_VALUE:
+                return Action(action_type, value)
+
+    data = {}
+    for key, actions in pairs:
+        weekday = WEEKDAYS.get(key)
+        if weekday is None or not isinstance(actions, list):
+            raise _NotCanonical()
+        for action in actions:
+            if not isinstance(action, Action):
+                raise _NotCanonical()
+
+        data[weekday] = actions
+    return data
+
+
+_decoder = json.JSONDecoder(object_pairs_hook=_object_hook)
+
+
+def decode_actions(body: bytes) -> Optional[Actions]:
+    """Decode body with canonical JSON schedule into actions by weekday.
+
+    Return None if the body isn't valid UTF-8 JSON in the canonical form.
+    """
+    try:
+        data = _decoder.decode(body.decode('utf-8'))
+    except (_NotCanonical, ValueError):
+        return None
+
+    return data if isinstance(data, dict) else None
+
+
+def actions_key(data: Actions) -> str:
+    """Return the same hash as `schedule_key` returns for the raw schedule."""
+    days = ','.join(
+        '["{}",[{}]]'.format(weekday.value, ','.join(
+            f'{{"type":"{action.type.value}","value":{action.value}}}' for action in actions
+        ))
+        for weekday, actions in data.items()
+    )
+    return hashlib.sha256(f'[{days}]'.encode()).hexdigest()
+
+
+def validate_actions(data: Actions, collect_all: bool = False,
+                     ) -> Tuple[Optional[Schedule], List[Dict[str, Any]]]:
+    """Validate decoded actions.
+
+    Return schedule and an empty errors list, or None and the list of
+    validation errors in the same format as pydantic reports them, errors of
+    all actions if `collect_all` is set.
+    """
+    try:
+        check_parsed(data, collect_all=collect_all)
+    except ValidationError as exc:
+        return None, exc.errors()
+
+    return Schedule.from_actions(data), []
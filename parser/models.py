@@ -1,40 +1,34 @@
 """Models of input data."""
 
-from enum import Enum
-from typing import List, Tuple, Dict
+from datetime import date
+from itertools import islice
+from typing import Any, Collection, Dict, Iterator, List, Mapping, Optional, Sequence
 
-from pydantic import BaseModel, validator, root_validator, Extra, PositiveInt
+from parser.dates import ONE_DAY, override_window, weekday_of
+from parser.enums import ActionTypeEnum, OperationEnum, WeekDaysEnum
 
+from pydantic import BaseModel, validator, root_validator, conint, conlist, Extra, PositiveInt
 
-class WeekDaysEnum(str, Enum):
-    """Enumerator of weekdays."""
-    SUNDAY = 'sunday'
-    MONDAY = 'monday'
-    TUESDAY = 'tuesday'
-    WEDNESDAY = 'wednesday'
-    THURSDAY = 'thursday'
-    FRIDAY = 'friday'
-    SATURDAY = 'saturday'
+MAX_BATCH_SIZE = 10000
+MAX_COMBINED_SCHEDULES = 1000
+MAX_CALENDAR_DAYS = 731
 
-    def _get_shifted_day(self, shift: int) -> 'WeekDaysEnum':
-        weekdays: Tuple = tuple(self.__class__)
-        return weekdays[(weekdays.index(self) + shift) % 7]
+# Fragments of consistency errors messages and names of rules producing them.
+RULE_MESSAGES = {
+    'two actions in a row': 'type_order',
+    'multiple items have the same value': 'value_order',
+    'must be after': 'value_order',
+    'The previous day before': 'first_action',
+    'The next day after': 'last_action',
+}
 
-    @property
-    def prev(self) -> 'WeekDaysEnum':
-        """Return previous weekday."""
-        return self._get_shifted_day(-1)
 
-    @property
-    def next(self) -> 'WeekDaysEnum':
-        """Return next weekday."""
-        return self._get_shifted_day(1)
-
-
-class ActionTypeEnum(str, Enum):
-    """Enumerator of actions types."""
-    OPEN = 'open'
-    CLOSE = 'close'
+def get_error_rule(error: Dict[str, Any]) -> str:
+    """Return name of the rule of the validation error, or the error type."""
+    for fragment, rule in RULE_MESSAGES.items():
+        if fragment in error['msg']:
+            return rule
+    return error['type']
 
 
 class ActionModel(BaseModel, extra=Extra.forbid):
@@ -57,66 +51,143 @@ class DataModel(BaseModel):
     __root__: Dict[WeekDaysEnum, List[ActionModel]]
 
     @classmethod
-    def _validate_actions_type_order(cls, weekday: WeekDaysEnum, action: ActionModel,
-                                     prev_action: ActionModel):
-        if action.type == prev_action.type:
-            raise ValueError((
-                f'Wrong actions for "{weekday}", two actions in a row '
-                f'can\'t be of type "{action.type}"'
-            ))
-
-    @classmethod
-    def _validate_actions_values_order(cls, weekday: WeekDaysEnum, action: ActionModel,
-                                       prev_action: ActionModel):
-        if prev_action.value == action.value:
-            raise ValueError((
-                f'Wrong actions for "{weekday}", multiple items have the '
-                f'same value "{action.value}"'
-            ))
-
-        if prev_action.value >= action.value:
-            raise ValueError((
-                f'Wrong actions for "{weekday}", the value "{prev_action.value}" '
-                f'must be after "{action.value}"'
-            ))
+    def iter_errors(cls, data: Mapping[WeekDaysEnum, Sequence[Any]],
+                    weekdays: Optional[Collection[WeekDaysEnum]] = None) -> Iterator[str]:
+        """Yield messages of consistency errors of actions in one pass.
+
+        Actions may be any objects with `type` and `value` attributes. Only
+        actions of `weekdays` are checked if they are passed. Errors of every
+        day are in the order of its actions, days of neighbours are looked up
+        by the ring of weekdays.
+        """
+        for weekday, actions in data.items():
+            if not actions or (weekdays is not None and weekday not in weekdays):
+                continue
+
+            prev_action = actions[0]
+            if prev_action.type == ActionTypeEnum.CLOSE:
+                prev_actions = data.get(weekday.prev)
+                if not prev_actions or prev_actions[-1].type != ActionTypeEnum.OPEN:
+                    yield f'The previous day before "{weekday}" must end with an "open" action'
+
+            for action in islice(actions, 1, None):
+                if action.type == prev_action.type:
+                    yield (
+                        f'Wrong actions for "{weekday}", two actions in a row '
+                        f'can\'t be of type "{action.type}"'
+                    )
+                if prev_action.value == action.value:
+                    yield (
+                        f'Wrong actions for "{weekday}", multiple items have the '
+                        f'same value "{action.value}"'
+                    )
+                elif prev_action.value > action.value:
+                    yield (
+                        f'Wrong actions for "{weekday}", the value "{prev_action.value}" '
+                        f'must be after "{action.value}"'
+                    )
+                prev_action = action
 
-    @classmethod
-    def _validate_first_action(cls, weekday: WeekDaysEnum, action: ActionModel,
-                               data: Dict[WeekDaysEnum, List[ActionModel]]):
-        if action.type == ActionTypeEnum.CLOSE:
-            prev_actions = data.get(weekday.prev, [])
-            if not prev_actions or prev_actions[-1].type != ActionTypeEnum.OPEN:
-                raise ValueError(
-                    f'The previous day before "{weekday}" must end with an "open" action',
-                )
+            if prev_action.type == ActionTypeEnum.OPEN:
+                next_actions = data.get(weekday.next)
+                if not next_actions or next_actions[0].type != ActionTypeEnum.CLOSE:
+                    yield f'The next day after "{weekday}" should start with a "close" action'
 
     @classmethod
-    def _validate_last_action(cls, weekday: WeekDaysEnum, action: ActionModel,
-                              data: Dict[WeekDaysEnum, List[ActionModel]]):
-        if action.type == ActionTypeEnum.OPEN:
-            next_actions = data.get(weekday.next, [])
-            if not next_actions or next_actions[0].type != ActionTypeEnum.CLOSE:
-                raise ValueError(
-                    f'The next day after "{weekday}" should start with a "close" action',
-                )
+    def check_actions(cls, data: Mapping[WeekDaysEnum, Sequence[Any]],
+                      weekdays: Optional[Collection[WeekDaysEnum]] = None):
+        """Validate consistency of actions, raise ValueError on the first problem."""
+        for message in cls.iter_errors(data, weekdays):
+            raise ValueError(message)
 
     @root_validator
     @classmethod
     def check_consistency(cls, values: Dict) -> Dict:
         """Validate input data."""
         data = values.get('__root__')
-        if not data:
-            return {}
+        if data:
+            cls.check_actions(data)
+        return values
 
-        for weekday, actions in data.items():
-            prev_action = None
-            for index, action in enumerate(actions):
-                if prev_action:
-                    cls._validate_actions_type_order(weekday, action, prev_action)
-                    cls._validate_actions_values_order(weekday, action, prev_action)
-                if index == 0:
-                    cls._validate_first_action(weekday, action, data)
-                if index == len(actions) - 1:
-                    cls._validate_last_action(weekday, action, data)
-                prev_action = action
+
+class PatchModel(BaseModel):
+    """Changes of weekdays of a schedule, null removes the weekday."""
+    __root__: Dict[WeekDaysEnum, Optional[List[ActionModel]]]
+
+
+class BatchDataModel(BaseModel):
+    """Batch input data model, items are validated separately."""
+    __root__: Dict[str, Any]
+
+    @validator('__root__')
+    @classmethod
+    def validate_max_size(cls, value: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate maximum number of items."""
+        if len(value) > MAX_BATCH_SIZE:
+            raise ValueError(f'Must contain <= {MAX_BATCH_SIZE} items')
+
+        return value
+
+
+class MomentModel(BaseModel, extra=Extra.forbid):
+    """Moment of the week model."""
+    weekday: WeekDaysEnum
+    value: conint(ge=0, le=86399)  # type: ignore
+
+
+class QueryModel(BaseModel, extra=Extra.forbid):
+    """Query of one schedule model."""
+    schedule: DataModel
+    at: MomentModel
+
+
+class BulkQueryModel(BaseModel, extra=Extra.forbid):
+    """Query of many schedules model, schedules are validated separately."""
+    schedules: BatchDataModel
+    at: MomentModel
+
+
+class CombineModel(BaseModel, extra=Extra.forbid):
+    """Schedules combined by the operation, the difference subtracts the others from the first."""
+    operation: OperationEnum
+    schedules: conlist(DataModel, min_items=1, max_items=MAX_COMBINED_SCHEDULES)  # type: ignore
+
+
+class CalendarModel(BaseModel, extra=Extra.forbid):
+    """Weekly schedule with actions of dates replacing actions of their weekdays."""
+    weekly: DataModel
+    overrides: Dict[date, List[ActionModel]] = {}
+
+    @root_validator
+    @classmethod
+    def check_overrides(cls, values: Dict) -> Dict:
+        """Validate overrides together with actions of the dates around them."""
+        weekly, overrides = values.get('weekly'), values.get('overrides')
+        if weekly is None or not overrides:
+            return values
+
+        for day in sorted(overrides):
+            window = override_window(weekly.__root__, overrides, day)
+            weekdays = {weekday_of(day + offset * ONE_DAY) for offset in (-1, 0, 1)}
+            for message in DataModel.iter_errors(window, weekdays):
+                raise ValueError(f'Wrong override of "{day}": {message}')
+        return values
+
+
+class CalendarQueryModel(BaseModel, extra=Extra.forbid):
+    """Query of hours of the calendar from the start to the end date inclusive."""
+    calendar: CalendarModel
+    start: date
+    end: date
+
+    @root_validator
+    @classmethod
+    def check_range(cls, values: Dict) -> Dict:
+        """Validate the range of dates."""
+        start, end = values.get('start'), values.get('end')
+        if start is not None and end is not None:
+            if end < start:
+                raise ValueError('The end must not be before the start')
+            if (end - start).days >= MAX_CALENDAR_DAYS:
+                raise ValueError(f'Must contain <= {MAX_CALENDAR_DAYS} days')
         return values
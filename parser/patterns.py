@@ -0,0 +1,72 @@
+"""Interning of repeated day patterns.
+
+Few distinct days exist across real schedules, so days are kept once in
+global tables: actions of a day as a shared tuple, and intervals of a day as
+`DayPattern` with output lines rendered once per formatter and weekday. The
+tables are limited by `MAX_PATTERNS`, days beyond the limit aren't shared.
+"""
+
+from typing import Dict, Iterable, Sequence, Tuple
+
+from parser.enums import WeekDaysEnum
+from parser.formatting import Formatter
+from parser.schedule import Action, Interval
+
+MAX_PATTERNS = 100000
+
+
+class DayPattern:
+    """Immutable intervals of day seconds opened on a day."""
+    __slots__ = ('intervals', '_lines')
+
+    def __init__(self, intervals: Tuple[Interval, ...]):
+        self.intervals = intervals
+        self._lines: Dict[Tuple[Formatter, WeekDaysEnum], str] = {}
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.intervals!r})'
+
+    def line(self, weekday: WeekDaysEnum, formatter: Formatter) -> str:
+        """Return output line of the weekday, rendered on the first use."""
+        key = (formatter, weekday)
+        line = self._lines.get(key)
+        if line is None:
+            line = self._lines[key] = formatter.format_day(weekday, self.intervals)
+        return line
+
+
+_days: Dict[Tuple[Interval, ...], DayPattern] = {}
+_actions: Dict[Tuple[Action, ...], Tuple[Action, ...]] = {}
+
+
+def intern_day(intervals: Iterable[Interval]) -> DayPattern:
+    """Return the shared pattern of day intervals."""
+    key = tuple(intervals)
+    pattern = _days.get(key)
+    if pattern is None:
+        pattern = DayPattern(key)
+        if len(_days) < MAX_PATTERNS:
+            pattern = _days.setdefault(key, pattern)
+    return pattern
+
+
+def intern_actions(actions: Sequence[Action]) -> Tuple[Action, ...]:
+    """Return the shared tuple of actions equal to actions of a day."""
+    key = tuple(actions)
+    shared = _actions.get(key)
+    if shared is None:
+        shared = key
+        if len(_actions) < MAX_PATTERNS:
+            shared = _actions.setdefault(key, key)
+    return shared
+
+
+def stats() -> Dict[str, int]:
+    """Return numbers of interned days."""
+    return {'days': len(_days), 'actions': len(_actions)}
+
+
+def clear():
+    """Remove all interned days."""
+    _days.clear()
+    _actions.clear()
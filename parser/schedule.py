@@ -0,0 +1,120 @@
+"""Compact representation of normalized schedules."""
+
+from array import array
+from typing import (
+    TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Sequence, Tuple,
+)
+
+from parser.enums import ActionTypeEnum, WeekDaysEnum
+
+if TYPE_CHECKING:  # pragma: no cover
+    from parser.models import DataModel
+
+DAY_SECONDS = 24 * 60 * 60
+WEEK_SECONDS = 7 * DAY_SECONDS
+
+WEEKDAYS: Tuple[WeekDaysEnum, ...] = tuple(WeekDaysEnum)
+WEEKDAY_INDEXES: Dict[WeekDaysEnum, int] = {
+    weekday: index for index, weekday in enumerate(WEEKDAYS)
+}
+
+Interval = Tuple[int, int]
+
+
+class Action(NamedTuple):
+    """Lightweight replacement of ActionModel."""
+    type: ActionTypeEnum
+    value: int
+
+
+def day_intervals(actions: Sequence[Any], next_actions: Sequence[Any]) -> List[Interval]:
+    """Return intervals of day seconds opened at the day of validated actions.
+
+    Leading closing belongs to the previous day, trailing opening is closed by
+    the first action of the next day.
+    """
+    start = 1 if actions and actions[0].type == ActionTypeEnum.CLOSE else 0
+    closings = [action.value for action in actions[start + 1::2]]
+    if len(actions) - start > 2 * len(closings):
+        closings.append(next_actions[0].value)
+    return list(zip((action.value for action in actions[start::2]), closings))
+
+
+class Schedule:
+    """Normalized schedule as sorted week-relative intervals.
+
+    Intervals are stored in one flat array of pairs of opening and closing
+    seconds since the start of the week (Sunday 00:00). Opening which is
+    closed after the end of the week has closing second beyond `WEEK_SECONDS`.
+    `weekdays` keeps the order of weekdays of the input data.
+    """
+    __slots__ = ('weekdays', 'intervals')
+
+    def __init__(self, weekdays: Iterable[WeekDaysEnum], intervals: 'array[int]'):
+        self.weekdays = tuple(weekdays)
+        self.intervals = intervals
+
+    @classmethod
+    def from_actions(cls, data: Mapping[WeekDaysEnum, Sequence[Any]]) -> 'Schedule':
+        """Build schedule from validated actions grouped by weekday.
+
+        Actions may be any objects with `type` and `value` attributes.
+        """
+        values = array('l')
+        first_close = None
+        for index, weekday in enumerate(WEEKDAYS):
+            offset = index * DAY_SECONDS
+            for action in data.get(weekday, ()):
+                if not values and first_close is None and action.type == ActionTypeEnum.CLOSE:
+                    first_close = offset + action.value
+                else:
+                    values.append(offset + action.value)
+
+        if first_close is not None:
+            values.append(first_close + WEEK_SECONDS)
+        return cls(data.keys(), values)
+
+    @classmethod
+    def from_model(cls, data: 'DataModel') -> 'Schedule':
+        """Build schedule from validated data model."""
+        return cls.from_actions(data.__root__)
+
+    def __len__(self) -> int:
+        return len(self.intervals) // 2
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Schedule):
+            return NotImplemented
+        return self.weekdays == other.weekdays and self.intervals == other.intervals
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({list(self.weekdays)!r}, {list(self)!r})'
+
+    def __iter__(self) -> Iterator[Interval]:
+        """Iterate over (opening, closing) pairs of week seconds."""
+        intervals = self.intervals
+        return zip(intervals[::2], intervals[1::2])
+
+    def get_day_intervals(self) -> Dict[WeekDaysEnum, List[Interval]]:
+        """Return intervals of day seconds grouped by the day of opening."""
+        days: Dict[WeekDaysEnum, List[Interval]] = {weekday: [] for weekday in self.weekdays}
+        for opening, closing in self:
+            days[WEEKDAYS[opening // DAY_SECONDS]].append(
+                (opening % DAY_SECONDS, closing % DAY_SECONDS),
+            )
+        return days
+
+    def to_actions(self) -> Dict[WeekDaysEnum, List[Action]]:
+        """Return actions by weekday describing the schedule, as `DataModel` does."""
+        data: Dict[WeekDaysEnum, List[Action]] = {weekday: [] for weekday in self.weekdays}
+        for opening, closing in self:
+            closing %= WEEK_SECONDS
+            data.setdefault(WEEKDAYS[opening // DAY_SECONDS], []).append(
+                Action(ActionTypeEnum.OPEN, opening % DAY_SECONDS),
+            )
+            data.setdefault(WEEKDAYS[closing // DAY_SECONDS], []).append(
+                Action(ActionTypeEnum.CLOSE, closing % DAY_SECONDS),
+            )
+        for actions in data.values():
+            actions.sort(key=lambda action: action.value)
+        return data
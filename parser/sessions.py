@@ -0,0 +1,72 @@
+"""Schedules kept between requests and updated by changes of weekdays."""
+
+from typing import Dict, Iterable, List, Optional
+
+from parser.formatting import get_formatter
+from parser.models import ActionModel, DataModel, WeekDaysEnum
+from parser.patterns import intern_day
+from parser.schedule import day_intervals
+from parser.validation import Action, check_parsed
+
+Actions = Dict[WeekDaysEnum, List[Action]]
+Patch = Dict[WeekDaysEnum, Optional[List[Action]]]
+
+
+def to_actions(models: Iterable[ActionModel]) -> List[Action]:
+    """Return lightweight actions of action models."""
+    return [Action(model.type, model.value) for model in models]
+
+
+class ScheduleSession:
+    """Validated schedule with rendered output line of every weekday.
+
+    Sessions are immutable, `apply` returns a new session, so a stored
+    session may be shared between requests.
+    """
+    __slots__ = ('data', 'lines')
+
+    def __init__(self, data: Actions, lines: Dict[WeekDaysEnum, str]):
+        self.data = data
+        self.lines = lines
+
+    @classmethod
+    def from_model(cls, model: DataModel) -> 'ScheduleSession':
+        """Build session from validated data model."""
+        data = {weekday: to_actions(actions) for weekday, actions in model.__root__.items()}
+        return cls(data, {weekday: cls._render(data, weekday) for weekday in data})
+
+    @staticmethod
+    def _render(data: Actions, weekday: WeekDaysEnum) -> str:
+        intervals = day_intervals(data[weekday], data.get(weekday.next, []))
+        return intern_day(intervals).line(weekday, get_formatter())
+
+    @property
+    def output(self) -> List[str]:
+        """Return output lines in the order of weekdays of the schedule."""
+        return [self.lines[weekday] for weekday in self.data]
+
+    def apply(self, patch: Patch) -> 'ScheduleSession':
+        """Return session with replaced actions of weekdays, None removes a weekday.
+
+        Only changed weekdays and their neighbours are validated, since other
+        weekdays were valid and depend only on their neighbours. Lines of
+        changed weekdays and the weekdays before them are rendered again.
+        Raise ValidationError with the same errors as `DataModel` reports for
+        the whole schedule.
+        """
+        data = dict(self.data)
+        for weekday, actions in patch.items():
+            if actions is None:
+                data.pop(weekday, None)
+            else:
+                data[weekday] = actions
+
+        changed = set(patch)
+        previous = {weekday.prev for weekday in changed}
+        check_parsed(data, changed | previous | {weekday.next for weekday in changed})
+
+        lines = {weekday: line for weekday, line in self.lines.items() if weekday in data}
+        for weekday in changed | previous:
+            if weekday in data:
+                lines[weekday] = self._render(data, weekday)
+        return self.__class__(data, lines)
@@ -0,0 +1,111 @@
+"""Streaming conversion of newline-delimited JSON."""
+
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from parser.batch import convert_item
+
+MAX_LINE_LENGTH = 1024 * 1024
+
+# Line is None if it was longer than the limit and has been discarded.
+NumberedLine = Tuple[int, Optional[bytes]]
+
+
+class LineSplitter:
+    """Split incoming chunks of bytes into numbered lines.
+
+    Only the unfinished tail of the stream is kept in memory, lines longer
+    than `max_line_length` bytes are discarded while they are received.
+    """
+
+    def __init__(self, max_line_length: int = MAX_LINE_LENGTH):
+        self.max_line_length = max_line_length
+        self._buffer = bytearray()
+        self._oversized = False
+        self._number = 0
+
+    def _append(self, segment: bytes):
+        if self._oversized:
+            return
+
+        if len(self._buffer) + len(segment) > self.max_line_length:
+            self._oversized = True
+            self._buffer.clear()
+        else:
+            self._buffer += segment
+
+    def _pop(self) -> Optional[bytes]:
+        line = None if self._oversized else bytes(self._buffer)
+        self._buffer.clear()
+        self._oversized = False
+        return line
+
+    def _numbered(self, lines: List[Optional[bytes]]) -> Iterator[NumberedLine]:
+        for line in lines:
+            self._number += 1
+            if line is None or line.strip():
+                yield self._number, line
+
+    def feed(self, chunk: bytes) -> Iterator[NumberedLine]:
+        """Return complete non-empty lines received so far."""
+        *segments, tail = chunk.split(b'\n')
+        lines = []
+        for segment in segments:
+            self._append(segment)
+            lines.append(self._pop())
+        self._append(tail)
+        return self._numbered(lines)
+
+    def close(self) -> Iterator[NumberedLine]:
+        """Return the last line if the stream doesn't end with a newline."""
+        if not self._buffer and not self._oversized:
+            return iter(())
+        return self._numbered([self._pop()])
+
+
+def convert_line(number: int, line: Optional[bytes],
+                 max_line_length: int = MAX_LINE_LENGTH) -> Dict[str, Any]:
+    """Convert one NDJSON line to a result record."""
+    if line is None:
+        return {
+            'line': number,
+            'errors': [{
+                'loc': (),
+                'msg': f'ensure line has at most {max_line_length} bytes',
+                'type': 'value_error.line.max_length',
+            }],
+        }
+
+    try:
+        raw = json.loads(line)
+    except ValueError as exc:
+        return {
+            'line': number,
+            'errors': [{'loc': (), 'msg': str(exc), 'type': 'value_error.jsondecode'}],
+        }
+
+    output, errors = convert_item(raw)
+    if errors:
+        return {'line': number, 'errors': errors}
+    return {'line': number, 'output': output}
+
+
+def encode_record(record: Dict[str, Any]) -> bytes:
+    """Serialize result record as one NDJSON line."""
+    return json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode() + b'\n'
+
+
+def convert_lines(lines: Iterable[NumberedLine],
+                  max_line_length: int = MAX_LINE_LENGTH) -> Iterator[bytes]:
+    """Convert numbered lines to encoded result records."""
+    for number, line in lines:
+        yield encode_record(convert_line(number, line, max_line_length))
+
+
+def convert_ndjson(chunks: Iterable[bytes],
+                   max_line_length: int = MAX_LINE_LENGTH) -> Iterator[bytes]:
+    """Convert a stream of NDJSON chunks, yielding NDJSON results."""
+    splitter = LineSplitter(max_line_length)
+    for chunk in chunks:
+        yield from convert_lines(splitter.feed(chunk), max_line_length)
+    yield from convert_lines(splitter.close(), max_line_length)
@@ -0,0 +1,115 @@
+"""Fast validation of input data over plain dicts."""
+
+from typing import Any, Collection, Dict, List, Mapping, Optional, Sequence
+
+from parser.models import ActionModel, ActionTypeEnum, DataModel, WeekDaysEnum
+from parser.patterns import intern_actions
+from parser.schedule import Action
+
+from pydantic import ValidationError, parse_obj_as
+from pydantic.error_wrappers import ErrorWrapper
+from pydantic.utils import ROOT_KEY
+
+MAX_VALUE = 86399
+
+WEEKDAYS: Dict[str, WeekDaysEnum] = {weekday.value: weekday for weekday in WeekDaysEnum}
+ACTION_TYPES: Dict[str, ActionTypeEnum] = {
+    action_type.value: action_type for action_type in ActionTypeEnum
+}
+ACTION_KEYS = {'type', 'value'}
+
+
+def _parse_actions(raw: Any) -> Optional[List[Action]]:
+    if not isinstance(raw, list):
+        return None
+
+    actions = []
+    for item in raw:
+        if not isinstance(item, dict) or item.keys() != ACTION_KEYS:
+            return None
+
+        action_type = ACTION_TYPES.get(item['type']) if isinstance(item['type'], str) else None
+        value = item['value']
+        if (action_type is None or isinstance(value, bool)
+                or not isinstance(value, int) or not 0 < value <= MAX_VALUE):
+            return None
+
+        actions.append(Action(action_type, value))
+    return actions
+
+
+def _parse(raw: Any) -> Optional[Dict[WeekDaysEnum, List[Action]]]:
+    """Return parsed data, or None if input isn't in the canonical form."""
+    if not isinstance(raw, dict):
+        return None
+
+    data = {}
+    for key, value in raw.items():
+        weekday = WEEKDAYS.get(key) if isinstance(key, str) else None
+        actions = _parse_actions(value)
+        if weekday is None or actions is None:
+            return None
+
+        data[weekday] = actions
+    return data
+
+
+def check_parsed(data: Mapping[WeekDaysEnum, Sequence[Any]],
+                 weekdays: Optional[Collection[WeekDaysEnum]] = None,
+                 collect_all: bool = False):
+    """Apply consistency rules of `DataModel` to parsed actions of `weekdays`.
+
+    Raise ValidationError with the same errors as `DataModel` reports, or with
+    errors of all actions if `collect_all` is set.
+    """
+    if not collect_all:
+        try:
+            DataModel.check_actions(data, weekdays)
+        except ValueError as exc:
+            raise ValidationError([ErrorWrapper(exc, loc=ROOT_KEY)], DataModel) from exc
+        return
+
+    errors = [
+        ErrorWrapper(ValueError(message), loc=ROOT_KEY)
+        for message in DataModel.iter_errors(data, weekdays)
+    ]
+    if errors:
+        raise ValidationError(errors, DataModel)
+
+
+def validate_fast(raw: Any) -> DataModel:
+    """Validate raw input data without building pydantic models for actions.
+
+    Consistency rules of `DataModel` are applied to plain tuples, so errors are
+    the same. Input which doesn't look exactly like canonical JSON (wrong types,
+    values requiring coercion, unknown fields) is passed to pydantic to get
+    identical errors or coercion. Actions of days are shared with other
+    models with equal days.
+    """
+    data = _parse(raw)
+    if data is None:
+        return DataModel.parse_obj(raw)
+
+    check_parsed(data)
+    return DataModel.construct(__root__={
+        weekday: intern_actions(actions) for weekday, actions in data.items()
+    })
+
+
+def validate_all(raw: Any) -> DataModel:
+    """Validate raw input data reporting consistency errors of all weekdays.
+
+    Errors are in the same format as `DataModel` reports them, but validation
+    doesn't stop at the first inconsistent action. Consistency isn't checked if
+    pydantic reports errors of fields.
+    """
+    data = _parse(raw)
+    if data is None:
+        models = parse_obj_as(Dict[WeekDaysEnum, List[ActionModel]], raw)
+        check_parsed(models, collect_all=True)
+        return DataModel.construct(__root__=models)
+
+    check_parsed(data, collect_all=True)
+    return DataModel.construct(__root__={
+        weekday: intern_actions(actions) for weekday, actions in data.items()
+    })
@@ -0,0 +1,177 @@
+"""Vectorized conversion of many schedules with NumPy.
+
+NumPy is an optional dependency, `convert_many` raises ImportError without it.
+"""
+
+from typing import Any, Dict, List, Sequence, Tuple
+
+from parser.batch import convert_item
+from parser.convertor import SECONDS_PER_MINUTE, TIME_LABELS
+from parser.enums import WeekDaysEnum
+from parser.validation import ACTION_KEYS, MAX_VALUE
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+OPEN, CLOSE = 0, 1
+ACTION_CODES = {'open': OPEN, 'close': CLOSE}
+WEEKDAY_CODES = {weekday.value: index for index, weekday in enumerate(WeekDaysEnum)}
+WEEKDAY_PREFIXES = [f'{weekday.capitalize()}: ' for weekday in WeekDaysEnum]
+
+Result = Tuple[List[str], List[Dict[str, Any]]]
+
+
+class _Packed:  # pylint: disable=too-few-public-methods
+    """Schedules packed into flat lists.
+
+    Every weekday of every schedule is a slot, every action is a row.
+    """
+
+    def __init__(self):
+        self.slot_venue: List[int] = []
+        self.slot_day: List[int] = []
+        self.slot_length: List[int] = []
+        self.row_type: List[int] = []
+        self.row_value: List[int] = []
+
+    def _pack_actions(self, actions: Any) -> bool:
+        if not isinstance(actions, list):
+            return False
+
+        for action in actions:
+            if not isinstance(action, dict) or action.keys() != ACTION_KEYS:
+                return False
+
+            action_type, value = action['type'], action['value']
+            if (not isinstance(action_type, str) or action_type not in ACTION_CODES
+                    or isinstance(value, bool) or not isinstance(value, int)
+                    or not 0 < value <= MAX_VALUE):
+                return False
+
+            self.row_type.append(ACTION_CODES[action_type])
+            self.row_value.append(value)
+        self.slot_length.append(len(actions))
+        return True
+
+    def pack(self, venue: int, raw: Any) -> bool:
+        """Pack schedule in canonical form, return False for any other input."""
+        if not isinstance(raw, dict):
+            return False
+
+        slots, rows = len(self.slot_venue), len(self.row_type)
+        for key, actions in raw.items():
+            day = WEEKDAY_CODES.get(key) if isinstance(key, str) else None
+            if day is None or not self._pack_actions(actions):
+                for values in (self.slot_venue, self.slot_day, self.slot_length):
+                    del values[slots:]
+                del self.row_type[rows:]
+                del self.row_value[rows:]
+                return False
+
+            self.slot_venue.append(venue)
+            self.slot_day.append(day)
+        return True
+
+
+class _Arrays:  # pylint: disable=too-many-instance-attributes
+    """Packed schedules as NumPy arrays of slots and rows."""
+
+    def __init__(self, packed: _Packed, venues: int):
+        self.venue = np.array(packed.slot_venue, dtype=np.int64)
+        self.day = np.array(packed.slot_day, dtype=np.int64)
+        self.length = np.array(packed.slot_length, dtype=np.int64)
+        self.row_type = np.array(packed.row_type, dtype=np.int64)
+        self.value = np.array(packed.row_value, dtype=np.int64)
+        self.row_start = np.cumsum(self.length) - self.length
+        self.row_slot = np.repeat(np.arange(len(self.venue)), self.length)
+        self.position = np.arange(len(self.row_slot)) - self.row_start[self.row_slot]
+        self.slot_of = np.full((venues, 7), -1, dtype=np.int64)
+        self.slot_of[self.venue, self.day] = np.arange(len(self.venue))
+
+    def _neighbour_slot(self, rows, shift: int):
+        """Return slots of the previous or the next weekday of rows."""
+        slots = self.row_slot[rows]
+        return self.slot_of[self.venue[slots], (self.day[slots] + shift) % 7]
+
+    def _edge_types(self, offset):
+        """Return types of the first or the last actions of slots, -1 for empty slots."""
+        types = np.full(len(self.length), -1)
+        has_rows = self.length > 0
+        types[has_rows] = self.row_type[(self.row_start + offset)[has_rows]]
+        return types
+
+    def find_invalid(self):
+        """Return mask of venues violating consistency rules of `DataModel`."""
+        row_type, value = self.row_type, self.value
+        invalid = np.zeros(len(self.row_slot), dtype=bool)
+
+        current = np.flatnonzero(self.position > 0)
+        invalid[current] |= row_type[current] == row_type[current - 1]
+        invalid[current] |= value[current] <= value[current - 1]
+
+        first = np.flatnonzero((self.position == 0) & (row_type == CLOSE))
+        prev_slot = self._neighbour_slot(first, -1)
+        last_type = self._edge_types(self.length - 1)
+        invalid[first] |= (prev_slot < 0) | (last_type[prev_slot] != OPEN)
+
+        is_last = self.position == self.length[self.row_slot] - 1
+        last = np.flatnonzero(is_last & (row_type == OPEN))
+        next_slot = self._neighbour_slot(last, 1)
+        first_type = self._edge_types(0)
+        invalid[last] |= (next_slot < 0) | (first_type[next_slot] != CLOSE)
+
+        venue_invalid = np.zeros(self.slot_of.shape[0], dtype=bool)
+        venue_invalid[self.venue[self.row_slot[invalid]]] = True
+        return venue_invalid
+
+    def format_slots(self, rows):
+        """Return humanized lines for every slot, using only given rows."""
+        position, row_type = self.position[rows], self.row_type[rows]
+        labels = np.array(TIME_LABELS, dtype=object)[self.value[rows] // SECONDS_PER_MINUTE]
+        moved = (position == 0) & (row_type == CLOSE)
+        display_slot = self.row_slot[rows]
+        display_slot[moved] = self._neighbour_slot(rows[moved], -1)
+        order = np.lexsort((position, moved, display_slot))
+        pair_slot = display_slot[order][::2]
+        pairs = labels[order][::2] + ' - ' + labels[order][1::2]
+
+        values = np.full(len(self.day), 'Closed', dtype=object)
+        if len(pairs):
+            starts = np.flatnonzero(np.diff(pair_slot, prepend=-1))
+            separators = np.full(len(pairs), ', ', dtype=object)
+            separators[starts] = ''
+            values[pair_slot[starts]] = np.add.reduceat(separators + pairs, starts)
+        return np.array(WEEKDAY_PREFIXES, dtype=object)[self.day] + values
+
+
+def convert_many(items: Sequence[Any]) -> List[Result]:
+    """Validate and convert many raw schedules at once.
+
+    Results are the same as `parser.batch.convert_item` returns for every
+    item. Schedules in canonical JSON form are checked and formatted with
+    array operations; invalid schedules and input requiring coercion are
+    passed to `convert_item` to get identical errors.
+    """
+    if np is None:
+        raise ImportError('NumPy is required for vectorized conversion')
+
+    packed = _Packed()
+    results: List[Any] = [None] * len(items)
+    for index, raw in enumerate(items):
+        if not packed.pack(index, raw):
+            results[index] = convert_item(raw)
+
+    arrays = _Arrays(packed, len(items))
+    invalid = arrays.find_invalid()
+    for index in np.flatnonzero(invalid).tolist():
+        results[index] = convert_item(items[index])
+
+    rows = np.flatnonzero(~invalid[arrays.venue[arrays.row_slot]])
+    lines = arrays.format_slots(rows).tolist()
+    bounds = np.searchsorted(arrays.venue, np.arange(len(items) + 1)).tolist()
+    for index, result in enumerate(results):
+        if result is None:
+            results[index] = (lines[bounds[index]:bounds[index + 1]], [])
+    return results
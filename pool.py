@@ -0,0 +1,42 @@
+"""Process pool for CPU-heavy conversions."""
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, TypeVar
+
+ResultT = TypeVar('ResultT')
+
+
+class PoolSaturatedError(Exception):
+    """Raised when the pool already has the maximum number of pending tasks."""
+
+
+class ConversionPool:
+    """Process pool with a bounded number of pending tasks.
+
+    Tasks are submitted from the event loop only, so the counter of pending
+    tasks doesn't need a lock.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self._executor = ProcessPoolExecutor(workers)
+
+    async def run(self, function: Callable[..., ResultT], *args: Any) -> ResultT:
+        """Run function in a worker process, raise PoolSaturatedError if the pool is full."""
+        if self.pending >= self.max_pending:
+            raise PoolSaturatedError(f'More than {self.max_pending} pending tasks')
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(self._executor, partial(function, *args))
+        finally:
+            self.pending -= 1
+
+    def shutdown(self):
+        """Stop worker processes."""
+        self._executor.shutdown()
@@ -0,0 +1,134 @@
+"""Profiling of single requests on demand.
+
+`ProfilingMiddleware` marks requests with the "X-Profile" header, or a random
+sample of requests, as profiled. Work of a marked request passed through
+`run_profiled` runs under cProfile in the thread it runs in, so validation
+and rendering in the threadpool are profiled, other requests are not.
+Profiles are written to a directory in the format of `pstats`, together
+with the wall time of the request.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+ResultT = TypeVar('ResultT')
+
+PROFILE_HEADER = b'x-profile'
+PROFILE_ID_HEADER = b'x-profile-id'
+
+_current: ContextVar[Optional[List[cProfile.Profile]]] = ContextVar('profiles', default=None)
+
+
+def run_profiled(function: Callable[..., ResultT], *args: Any) -> ResultT:
+    """Call function, under the profiler if the current request is profiled."""
+    profiles = _current.get()
+    if profiles is None:
+        return function(*args)
+
+    profile = cProfile.Profile()
+    profiles.append(profile)
+    return profile.runcall(function, *args)
+
+
+class ProfileStore:
+    """Directory with profiles of the last `keep` requests."""
+
+    def __init__(self, directory: str, keep: int = 100):
+        self.directory = directory
+        self.keep = keep
+        self._entries: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, profile_id: str) -> str:
+        """Return path of the pstats file of the profile."""
+        return os.path.join(self.directory, f'{profile_id}.prof')
+
+    def save(self, profile_id: str, profiles: List[cProfile.Profile], entry: Dict[str, Any]):
+        """Write profiles of a request, remove the oldest profiles above the limit.
+
+        Requests without profiled work are kept with the wall time only.
+        """
+        if profiles:
+            pstats.Stats(*profiles).dump_stats(self.path(profile_id))
+        with self._lock:
+            self._entries[profile_id] = {'id': profile_id, 'profiled': bool(profiles), **entry}
+            while len(self._entries) > self.keep:
+                old_id, _ = self._entries.popitem(last=False)
+                try:
+                    os.remove(self.path(old_id))
+                except OSError:
+                    pass
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Return descriptions of stored profiles, the newest first."""
+        with self._lock:
+            return list(reversed(self._entries.values()))
+
+    def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        """Return description of the profile, or None if it isn't stored."""
+        return self._entries.get(profile_id)
+
+    def report(self, profile_id: str, sort: str = 'cumulative', limit: int = 50) -> str:
+        """Return text report of the profile with the top `limit` functions."""
+        if not os.path.exists(self.path(profile_id)):
+            return 'No work of the request was profiled.\n'
+
+        output = io.StringIO()
+        pstats.Stats(self.path(profile_id), stream=output).sort_stats(sort).print_stats(limit)
+        return output.getvalue()
+
+
+class ProfilingMiddleware:  # pylint: disable=too-few-public-methods
+    """ASGI middleware profiling requests with the header or a random sample."""
+
+    def __init__(self, app: Any, store: ProfileStore, sample_rate: float = 0.0):
+        self.app = app
+        self.store = store
+        self.sample_rate = sample_rate
+
+    def _is_profiled(self, scope: Dict[str, Any]) -> bool:
+        if any(name == PROFILE_HEADER for name, _ in scope['headers']):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable):
+        if scope['type'] != 'http' or not self._is_profiled(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = f'{int(time.time())}-{uuid.uuid4().hex[:12]}'
+        status = 0
+
+        async def send_with_id(message: Dict[str, Any]):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+                headers = [*message.get('headers', []), (PROFILE_ID_HEADER, profile_id.encode())]
+                message = {**message, 'headers': headers}
+            await send(message)
+
+        profiles: List[cProfile.Profile] = []
+        token = _current.set(profiles)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            wall = time.perf_counter() - start
+            _current.reset(token)
+            self.store.save(profile_id, profiles, {
+                'method': scope['method'],
+                'path': scope['path'],
+                'status': int(status),
+                'wall_ms': round(wall * 1000, 3),
+                'created': int(time.time()),
+            })
@@ -0,0 +1,89 @@
+"""Custom API responses."""
+
+import json
+from parser.stream import LineSplitter, convert_lines
+from typing import Any, Callable, Iterable, List, Union
+
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+
+
+def _json_dumps(content: Any) -> bytes:
+    return json.dumps(content, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+_dumps: Callable[[Any], bytes]
+try:
+    import orjson  # type: ignore
+    _dumps = orjson.dumps
+except ImportError:  # pragma: no cover
+    _dumps = _json_dumps
+
+
+def encode_output(lines: Iterable[str]) -> bytes:
+    """Encode lines as the `{"output": [...]}` JSON object.
+
+    Uses orjson if it's installed and the C encoder of `json` otherwise. The
+    result is the same as `JSONResponse` renders.
+    """
+    return _dumps({'output': list(lines)})
+
+
+class OutputResponse(Response):
+    """JSON response with output lines.
+
+    Accepts lines, or the body already encoded by `encode_output`, which is
+    sent as is, so cached results aren't encoded again.
+    """
+    media_type = 'application/json'
+
+    def render(self, content: Union[bytes, Iterable[str]]) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return encode_output(content)
+
+
+def _convert_chunk(splitter: LineSplitter, chunk: bytes, last: bool) -> bytes:
+    lines = list(splitter.feed(chunk))
+    if last:
+        lines.extend(splitter.close())
+    records: List[bytes] = list(convert_lines(lines, splitter.max_line_length))
+    return b''.join(records)
+
+
+class NDJSONConversionResponse(Response):
+    """Response converting NDJSON request body while it is being received.
+
+    The response is the only consumer of request messages: starlette's
+    `StreamingResponse` listens for client disconnect at the same time and
+    would swallow chunks of the request body. Conversion of every chunk runs
+    in the threadpool to keep the event loop free.
+    """
+    media_type = 'application/x-ndjson'
+
+    def __init__(self, max_line_length: int):
+        super().__init__()
+        self.max_line_length = max_line_length
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({
+            'type': 'http.response.start',
+            'status': self.status_code,
+            'headers': self.raw_headers,
+        })
+        splitter = LineSplitter(self.max_line_length)
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return
+
+            more_body = message.get('more_body', False)
+            body = await run_in_threadpool(
+                _convert_chunk, splitter, message.get('body', b''), not more_body,
+            )
+            if body:
+                await send({'type': 'http.response.body', 'body': body, 'more_body': True})
+        await send({'type': 'http.response.body', 'body': b''})
@@ -0,0 +1,44 @@
+"""Application settings."""
+
+from enum import Enum
+
+from pydantic import BaseSettings
+
+
+class ValidatorEnum(str, Enum):
+    """Enumerator of input data validators."""
+    PYDANTIC = 'pydantic'
+    FAST = 'fast'
+
+
+class Settings(BaseSettings):
+    """Settings loaded from environment variables prefixed by "O_HOURS_"."""
+    cache_size: int = 10000
+    # SQLite database shared by workers of the host, the cache is disabled if empty.
+    persistent_cache_path: str = ''
+    persistent_cache_size: int = 1000000
+    validator: ValidatorEnum = ValidatorEnum.PYDANTIC
+    # Encode /convert output by `responses.encode_output` instead of JSONResponse.
+    fast_json: bool = False
+    # Number of worker processes for large conversions, 0 disables the pool.
+    pool_workers: int = 0
+    pool_max_pending: int = 64
+    # Bodies of /convert and /convert/batch smaller than this are converted in
+    # the server process.
+    pool_min_bytes: int = 16384
+    stream_max_line_length: int = 1024 * 1024
+    # Number of stored schedules of the incremental API, the oldest are dropped.
+    session_store_size: int = 10000
+
+    # Directory to write profiles of requests to, profiling is disabled if empty.
+    profile_dir: str = ''
+    # Part of requests profiled without the "X-Profile" header.
+    profile_sample_rate: float = 0.0
+    profile_keep: int = 100
+
+    class Config:  # pylint: disable=too-few-public-methods
+        """Settings config."""
+        env_prefix = 'o_hours_'
+
+
+settings = Settings()
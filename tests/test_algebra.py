@@ -0,0 +1,158 @@
+"""Tests for union, intersection and difference of schedules."""
+
+from http import HTTPStatus
+from random import Random
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from parser.algebra import CombineError, combine
+from parser.enums import OperationEnum
+from parser.index import WeekIndex
+from parser.models import DataModel
+from parser.schedule import DAY_SECONDS, WEEK_SECONDS, Schedule
+from tests.utils import s_time, valid_schedule
+
+client = TestClient(app)
+
+
+def _schedule(raw):
+    return Schedule.from_model(DataModel.parse_obj(raw))
+
+
+def _day(opening, closing):
+    return [{'type': 'open', 'value': opening}, {'type': 'close', 'value': closing}]
+
+
+VENUE = {
+    'monday': _day(s_time(9), s_time(22)),
+    'friday': [{'type': 'open', 'value': s_time(18)}],
+    'saturday': [{'type': 'close', 'value': s_time(2)}, {'type': 'open', 'value': s_time(20)}],
+    'sunday': [{'type': 'close', 'value': s_time(3)}],
+}
+KITCHEN = {
+    'monday': _day(s_time(12), s_time(14)) + _day(s_time(18), s_time(23)),
+    'saturday': _day(s_time(1), s_time(4)) + [{'type': 'open', 'value': s_time(23)}],
+    'sunday': [{'type': 'close', 'value': s_time(1)}],
+}
+
+
+def test_union():
+    schedule = combine([_schedule(VENUE), _schedule(KITCHEN)], OperationEnum.UNION)
+    assert list(schedule) == [
+        (s_time(24 + 9), s_time(24 + 23)),
+        (s_time(5 * 24 + 18), s_time(6 * 24 + 4)),
+        (s_time(6 * 24 + 20), WEEK_SECONDS + s_time(3)),
+    ]
+    assert schedule.weekdays[:4] == tuple(DataModel.parse_obj(VENUE).__root__)
+
+
+def test_intersection():
+    schedule = combine([_schedule(VENUE), _schedule(KITCHEN)], OperationEnum.INTERSECTION)
+    assert list(schedule) == [
+        (s_time(24 + 12), s_time(24 + 14)),
+        (s_time(24 + 18), s_time(24 + 22)),
+        (s_time(6 * 24 + 1), s_time(6 * 24 + 2)),
+        (s_time(6 * 24 + 23), WEEK_SECONDS + s_time(1)),
+    ]
+
+
+def test_difference():
+    schedule = combine([_schedule(VENUE), _schedule(KITCHEN)], OperationEnum.DIFFERENCE)
+    assert list(schedule) == [
+        (s_time(1), s_time(3)),
+        (s_time(24 + 9), s_time(24 + 12)),
+        (s_time(24 + 14), s_time(24 + 18)),
+        (s_time(5 * 24 + 18), s_time(6 * 24 + 1)),
+        (s_time(6 * 24 + 20), s_time(6 * 24 + 23)),
+    ]
+
+
+def test_combine_errors():
+    whole_day = {
+        'monday': [{'type': 'open', 'value': s_time(20)}],
+        'tuesday': [{'type': 'close', 'value': s_time(2)}, {'type': 'open', 'value': s_time(3)}],
+        'wednesday': [{'type': 'close', 'value': s_time(1)}],
+    }
+    other = {'tuesday': _day(s_time(1), s_time(4))}
+    with pytest.raises(CombineError, match='whole day after "monday"'):
+        combine([_schedule(whole_day), _schedule(other)], OperationEnum.UNION)
+    with pytest.raises(ValueError):
+        combine([], OperationEnum.UNION)
+
+
+@pytest.mark.parametrize('operation', list(OperationEnum))
+def test_combine_matches_moments(operation):
+    rng = Random(0)
+    checks = {
+        OperationEnum.UNION: any,
+        OperationEnum.INTERSECTION: all,
+        OperationEnum.DIFFERENCE: lambda opens: opens[0] and not any(opens[1:]),
+    }
+    for _ in range(30):
+        schedules = [_schedule(valid_schedule(rng)) for _ in range(rng.randrange(1, 5))]
+        try:
+            result = WeekIndex(combine(schedules, operation))
+        except CombineError:
+            continue
+        indexes = [WeekIndex(schedule) for schedule in schedules]
+        for second in range(0, WEEK_SECONDS, 450):
+            opens = [index.is_open(second) for index in indexes]
+            assert result.is_open(second) == checks[operation](opens)
+
+
+def test_to_actions_round_trip():
+    rng = Random(1)
+    for _ in range(100):
+        raw = valid_schedule(rng)
+        schedule = _schedule(raw)
+        data = {
+            weekday.value: [{'type': action.type.value, 'value': action.value}
+                            for action in actions]
+            for weekday, actions in schedule.to_actions().items()
+        }
+        assert Schedule.from_model(DataModel.parse_obj(data)) == schedule
+
+
+def test_api_combine():
+    response = client.post('/combine', json={
+        'operation': 'intersection', 'schedules': [VENUE, KITCHEN],
+    })
+    assert response.status_code == HTTPStatus.OK
+    body = response.json()
+    assert body['output'] == [
+        'Monday: 12 PM - 2 PM, 6 PM - 10 PM',
+        'Friday: Closed',
+        'Saturday: 1 AM - 2 AM, 11 PM - 1 AM',
+        'Sunday: Closed',
+    ]
+    assert Schedule.from_model(DataModel.parse_obj(body['data'])) == combine(
+        [_schedule(VENUE), _schedule(KITCHEN)], OperationEnum.INTERSECTION,
+    )
+    response = client.post('/combine?locale=de', json={
+        'operation': 'union', 'schedules': [{'monday': _day(s_time(9), s_time(17))}],
+    })
+    assert response.json()['output'] == ['Montag: 09:00 - 17:00']
+
+
+def test_api_combine_errors():
+    response = client.post('/combine', json={'operation': 'xor', 'schedules': [VENUE]})
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    response = client.post('/combine', json={'operation': 'union', 'schedules': []})
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+    day = DAY_SECONDS - 1
+    schedules = [
+        {'monday': [{'type': 'open', 'value': s_time(20)}],
+         'tuesday': [{'type': 'close', 'value': s_time(2)}]},
+        {'tuesday': [{'type': 'open', 'value': s_time(1)}],
+         'wednesday': [{'type': 'close', 'value': day}]},
+    ]
+    response = client.post('/combine', json={'operation': 'union', 'schedules': schedules})
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert response.json() == {'detail': [{
+        'loc': ['body', 'schedules'],
+        'msg': 'The result is open through the whole day after "monday"',
+        'type': 'value_error.combine',
+    }]}
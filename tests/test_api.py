@@ -1,10 +1,20 @@
 """Test HTTP API."""
 
+import asyncio
+import json
 from http import HTTPStatus
 
+import pytest
 from fastapi.testclient import TestClient
 
-from main import app
+import main
+from main import app, cache
+from metrics import stage_seconds, validation_failures
+from pool import ConversionPool
+from settings import ValidatorEnum, settings
+from parser.cache import SQLiteCache, schedule_key
+from parser.models import MAX_BATCH_SIZE
+from parser.validation import validate_fast
 from tests.utils import s_time
 
 client = TestClient(app)
@@ -36,6 +46,560 @@ def test_api_convert_wrong_data_format_fails():
     assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
 
 
+def test_api_convert_validation_error_format():
+    response = client.post('/convert', json={
+        'monday': [
+            {
+                'type': 'open',
+                'value': s_time(10),
+            },
+        ],
+    })
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert response.json() == {
+        'detail': [
+            {
+                'loc': ['body', '__root__'],
+                'msg': 'The next day after "monday" should start with a "close" action',
+                'type': 'value_error',
+            },
+        ],
+    }
+
+
+def test_api_convert_cache_hit():
+    cache.clear()
+    payload = {'friday': []}
+    first = client.post('/convert', json=payload)
+    second = client.post('/convert', json=payload)
+    assert first.json() == second.json() == {'output': ['Friday: Closed']}
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+    assert client.get('/convert/cache').json() == cache.stats()
+
+
+def test_api_convert_etag_not_modified():
+    payload = {'saturday': []}
+    response = client.post('/convert', json=payload)
+    etag = response.headers['etag']
+    response = client.post('/convert', json=payload, headers={'If-None-Match': etag})
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.headers['etag'] == etag
+    assert response.content == b''
+
+
+def test_api_convert_etag_changed():
+    response = client.post('/convert', json={'saturday': []}, headers={
+        'If-None-Match': '"other"',
+    })
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_api_convert_etag_invalid_payload_not_short_circuited():
+    payload = {
+        'monday': [
+            {
+                'type': 'open',
+                'value': s_time(10),
+            },
+        ],
+    }
+    etag = f'"{schedule_key(payload)}"'
+    for _ in range(2):
+        response = client.post('/convert', json=payload, headers={'If-None-Match': etag})
+        assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_api_convert_etag_wildcard_ignored():
+    response = client.post('/convert', json={'sunday': []}, headers={'If-None-Match': '*'})
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_api_convert_openapi_request_schema():
+    schema = client.get('/openapi.json').json()
+    body = schema['paths']['/convert']['post']['requestBody']
+    assert body['content']['application/json']['schema'] == {
+        '$ref': '#/components/schemas/DataModel',
+    }
+    assert 'ActionModel' in schema['components']['schemas']
+
+
+def test_api_convert_fast_validator(monkeypatch):
+    monkeypatch.setattr(main, 'parse', validate_fast)
+    monkeypatch.setattr(settings, 'validator', ValidatorEnum.FAST)
+    cache.clear()
+    response = client.post('/convert', json={
+        'monday': [
+            {
+                'type': 'open',
+                'value': s_time(10),
+            },
+        ],
+    })
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert response.json()['detail'][0]['loc'] == ['body', '__root__']
+    response = client.post('/convert', json={'monday': []})
+    assert response.json() == {'output': ['Monday: Closed']}
+
+
+@pytest.mark.parametrize(
+    'body',
+    [
+        b'{"monday":[{"type":"open","value":3600},{"type":"close","value":7200}]}',
+        b'{"monday": [{"value": 3600, "type": "open"}, {"type": "close", "value": 7200}]}',
+        b'{"monday":[{"type":"open","value":3600.0},{"type":"close","value":7200}]}',
+        b'{"monday":[{"type":"open","value":3600}]}',
+        b'{"mon":[]}',
+        b'{}',
+        b'[]',
+        b'{"monday":[',
+        b'',
+        b'null',
+    ]
+)
+def test_api_convert_raw_decoding_same_as_pydantic(monkeypatch, body):
+    cache.clear()
+    expected = client.post('/convert', data=body)
+    monkeypatch.setattr(main, 'parse', validate_fast)
+    monkeypatch.setattr(settings, 'validator', ValidatorEnum.FAST)
+    cache.clear()
+    response = client.post('/convert', data=body)
+    assert response.status_code == expected.status_code
+    assert response.content == expected.content
+    assert response.headers.get('etag') == expected.headers.get('etag')
+
+
+def test_api_schedule_query():
+    response = client.post('/schedule/query', json={
+        'schedule': {
+            'friday': [
+                {
+                    'type': 'open',
+                    'value': s_time(18),
+                },
+            ],
+            'saturday': [
+                {
+                    'type': 'close',
+                    'value': s_time(2),
+                },
+            ],
+        },
+        'at': {
+            'weekday': 'friday',
+            'value': s_time(23, 30),
+        },
+    })
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        'is_open': True,
+        'next_opening': {'weekday': 'friday', 'value': s_time(18)},
+        'next_closing': {'weekday': 'saturday', 'value': s_time(2)},
+    }
+
+
+def test_api_schedule_query_wrong_moment_fails():
+    response = client.post('/schedule/query', json={
+        'schedule': {},
+        'at': {
+            'weekday': 'friday',
+            'value': s_time(24),
+        },
+    })
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_api_schedule_open():
+    response = client.post('/schedule/open', json={
+        'schedules': {
+            'open': {
+                'friday': [
+                    {
+                        'type': 'open',
+                        'value': s_time(18),
+                    },
+                    {
+                        'type': 'close',
+                        'value': s_time(23, 45),
+                    },
+                ],
+            },
+            'closed': {
+                'friday': [],
+            },
+            'broken': {
+                'friday': [
+                    {
+                        'type': 'close',
+                        'value': s_time(18),
+                    },
+                ],
+            },
+        },
+        'at': {
+            'weekday': 'friday',
+            'value': s_time(23, 30),
+        },
+    })
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['open'] == ['open']
+    assert list(response.json()['errors']) == ['broken']
+
+
+@pytest.mark.parametrize('body', [b'', b'null', b' null\n'])
+def test_api_convert_empty_body_fails(body):
+    cache.clear()
+    response = client.post('/convert', data=body)
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert response.json() == {
+        'detail': [{'loc': ['body'], 'msg': 'field required', 'type': 'value_error.missing'}],
+    }
+
+
+def test_api_convert_wrong_encoding_fails():
+    response = client.post('/convert', data=b'\xff\xfe\xfa')
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_api_metrics():
+    failures = validation_failures.get('last_action')
+    decodes = stage_seconds.get_count('decode')
+    client.post('/convert', json={'monday': [{'type': 'open', 'value': s_time(9)}]})
+    client.post('/convert', json={'wednesday': []})
+    assert validation_failures.get('last_action') == failures + 1
+    assert stage_seconds.get_count('decode') == decodes + 2
+    response = client.get('/metrics')
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'].startswith('text/plain; version=0.0.4')
+    assert 'o_hours_convert_stage_seconds_bucket{stage="format",le="+Inf"}' in response.text
+    assert 'o_hours_validation_failures_total{rule="last_action"}' in response.text
+    assert 'o_hours_convert_request_bytes_count' in response.text
+
+
+def test_api_convert_fast_json(monkeypatch):
+    payload = {'friday': [{'type': 'open', 'value': 3600}, {'type': 'close', 'value': 7200}]}
+    expected = client.post('/convert', json=payload)
+    monkeypatch.setattr(settings, 'fast_json', True)
+    cache.clear()
+    response = client.post('/convert', json=payload)
+    assert response.status_code == HTTPStatus.OK
+    assert response.content == expected.content
+    assert response.headers['content-type'] == 'application/json'
+    assert response.headers['etag'] == expected.headers['etag']
+    assert client.post('/convert', json=payload).content == expected.content
+
+    monkeypatch.setattr(settings, 'fast_json', False)
+    assert client.post('/convert', json=payload).content == expected.content
+    response = client.post('/convert', json={'friday': [{'type': 'close', 'value': 1}]})
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_api_convert_locale():
+    payload = {
+        'monday': [
+            {
+                'type': 'open',
+                'value': s_time(9),
+            },
+            {
+                'type': 'close',
+                'value': s_time(18),
+            },
+        ],
+    }
+    english = client.post('/convert', json=payload)
+    assert english.json() == {'output': ['Monday: 9 AM - 6 PM']}
+    assert english.headers['content-language'] == 'en'
+
+    response = client.post('/convert?locale=de', json=payload)
+    assert response.json() == {'output': ['Montag: 09:00 - 18:00']}
+    assert response.headers['content-language'] == 'de'
+    assert response.headers['etag'] != english.headers['etag']
+
+    headers = {'Accept-Language': 'fr-CA, en;q=0.5'}
+    response = client.post('/convert', json=payload, headers=headers)
+    assert response.json() == {'output': ['Lundi: 09:00 - 18:00']}
+    response = client.post('/convert', json=payload, headers={'Accept-Language': 'xx'})
+    assert response.json() == english.json()
+
+    response = client.post('/convert?locale=xx', json=payload)
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert response.json()['detail'][0]['loc'] == ['query', 'locale']
+
+
+def test_api_convert_grouped():
+    payload = {'monday': [], 'tuesday': [], 'wednesday': []}
+    response = client.post('/convert?group=true', json=payload)
+    assert response.json() == {'output': ['Monday - Wednesday: Closed']}
+    grouped_etag = response.headers['etag']
+    response = client.post('/convert?group=true&locale=de', json=payload)
+    assert response.json() == {'output': ['Montag - Mittwoch: Geschlossen']}
+    response = client.post('/convert', json=payload)
+    assert len(response.json()['output']) == 3
+    assert response.headers['etag'] != grouped_etag
+
+
+@pytest.mark.parametrize('validator', list(ValidatorEnum))
+def test_api_convert_all_errors(monkeypatch, validator):
+    monkeypatch.setattr(main.settings, 'validator', validator)
+    monkeypatch.setattr(main, 'parse', main.PARSERS[validator])
+    payload = {
+        'monday': [{'type': 'open', 'value': s_time(9)}],
+        'wednesday': [{'type': 'close', 'value': s_time(9)}],
+    }
+    response = client.post('/convert', json=payload)
+    assert len(response.json()['detail']) == 1
+    for _ in range(2):
+        response = client.post('/convert?errors=all', json=payload)
+        assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+        assert [error['msg'] for error in response.json()['detail']] == [
+            'The next day after "monday" should start with a "close" action',
+            'The previous day before "wednesday" must end with an "open" action',
+        ]
+
+    response = client.post('/convert?errors=all', json={'sunday': []})
+    assert response.json() == {'output': ['Sunday: Closed']}
+    response = client.post('/convert?errors=some', json={'sunday': []})
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_api_convert_persistent_cache(tmp_path, monkeypatch):
+    store = SQLiteCache(str(tmp_path / 'cache.sqlite3'), 10)
+    monkeypatch.setattr(main, 'persistent_cache', store)
+    payload = {'sunday': []}
+    cache.clear()
+    response = client.post('/convert', json=payload)
+    assert store.get(schedule_key(payload)) == [['Sunday: Closed'], []]
+
+    cache.clear()
+    store.set(schedule_key(payload), [['Sunday: Stored'], []])
+    assert client.post('/convert', json=payload).json() == {'output': ['Sunday: Stored']}
+    assert cache.get(schedule_key(payload)) is not None
+    assert client.get('/convert/cache').json()['persistent']['size'] == 1
+
+    monkeypatch.setattr(settings, 'fast_json', True)
+    cache.clear()
+    response = client.post('/convert', json=payload)
+    assert response.content == b'{"output":["Sunday: Stored"]}'
+    response = client.post('/convert', json={'monday': []})
+    assert store.get(schedule_key({'monday': []})) == [['Monday: Closed'], []]
+
+
+def test_api_sessions():
+    response = client.post('/sessions', json={
+        'friday': [
+            {
+                'type': 'open',
+                'value': s_time(18),
+            },
+        ],
+        'saturday': [
+            {
+                'type': 'close',
+                'value': s_time(1),
+            },
+        ],
+    })
+    assert response.status_code == HTTPStatus.OK
+    handle = response.json()['handle']
+    assert response.json()['output'] == ['Friday: 6 PM - 1 AM', 'Saturday: Closed']
+
+    response = client.patch(f'/sessions/{handle}', json={
+        'saturday': [
+            {
+                'type': 'close',
+                'value': s_time(2),
+            },
+            {
+                'type': 'open',
+                'value': s_time(10),
+            },
+        ],
+    })
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert response.json()['detail'][0]['loc'] == ['body', '__root__']
+
+    response = client.patch(f'/sessions/{handle}', json={
+        'saturday': [
+            {
+                'type': 'close',
+                'value': s_time(2),
+            },
+        ],
+        'monday': [],
+    })
+    assert response.status_code == HTTPStatus.OK
+    expected = ['Friday: 6 PM - 2 AM', 'Saturday: Closed', 'Monday: Closed']
+    assert response.json() == {'handle': handle, 'output': expected}
+    assert client.get(f'/sessions/{handle}').json()['output'] == expected
+
+    response = client.patch(f'/sessions/{handle}', json={'saturday': None})
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    response = client.patch(f'/sessions/{handle}', json={'friday': None, 'saturday': None})
+    assert response.json()['output'] == ['Monday: Closed']
+
+
+def test_api_sessions_not_found():
+    response = client.patch('/sessions/missing', json={'monday': []})
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert client.get('/sessions/missing').status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.fixture(name='pool')
+def fixture_pool(monkeypatch):
+    pool = ConversionPool(workers=1, max_pending=4)
+    monkeypatch.setattr(app.state, 'pool', pool)
+    monkeypatch.setattr(settings, 'pool_min_bytes', 0)
+    yield pool
+    pool.shutdown()
+
+
+def test_api_convert_in_pool(pool):
+    response = client.post('/convert', json={'thursday': []})
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {'output': ['Thursday: Closed']}
+    response = client.post('/convert', json={'thursday': [{'type': 'open', 'value': 1}]})
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    response = client.post('/convert', data=b'xx')
+    assert response.json()['detail'][0]['type'] == 'value_error.jsondecode'
+    response = client.post('/convert', data=b'null')
+    assert response.json()['detail'][0]['type'] == 'value_error.missing'
+    response = client.post('/convert/batch', json={'first': {'thursday': []}})
+    assert response.json() == {'output': {'first': ['Thursday: Closed']}, 'errors': {}}
+
+
+def test_api_convert_small_bodies_not_in_pool(pool, monkeypatch):
+    monkeypatch.setattr(settings, 'pool_min_bytes', 1024)
+    monkeypatch.setattr(pool, 'pending', pool.max_pending)
+    response = client.post('/convert/batch', json={'first': {'thursday': []}})
+    assert response.json() == {'output': {'first': ['Thursday: Closed']}, 'errors': {}}
+    response = client.post('/convert', json={'thursday': []})
+    assert response.status_code == HTTPStatus.OK
+    response = client.post('/convert/batch', json={
+        str(number): {'thursday': []} for number in range(100)
+    })
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+
+
+def test_api_convert_pool_saturated(pool, monkeypatch):
+    monkeypatch.setattr(pool, 'pending', pool.max_pending)
+    response = client.post('/convert', json={'thursday': []})
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    response = client.post('/convert/batch', json={'first': {'thursday': []}})
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+
+
 def test_api_convert_wrong_method_fails():
     response = client.get('/convert')
     assert response.status_code == HTTPStatus.METHOD_NOT_ALLOWED
+
+
+def test_api_convert_batch_success():
+    response = client.post('/convert/batch', json={
+        'venue-1': {
+            'monday': [
+                {
+                    'type': 'open',
+                    'value': s_time(10),
+                },
+                {
+                    'type': 'close',
+                    'value': s_time(18),
+                },
+            ],
+        },
+        'venue-2': {
+            'monday': [
+                {
+                    'type': 'close',
+                    'value': s_time(10),
+                },
+            ],
+        },
+    })
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        'output': {
+            'venue-1': ['Monday: 10 AM - 6 PM'],
+        },
+        'errors': {
+            'venue-2': [
+                {
+                    'loc': ['__root__'],
+                    'msg': 'The previous day before "monday" must end with an "open" action',
+                    'type': 'value_error',
+                },
+            ],
+        },
+    }
+
+
+def test_api_convert_batch_too_many_items_fails():
+    response = client.post('/convert/batch', json={
+        str(index): {} for index in range(MAX_BATCH_SIZE + 1)
+    })
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert response.json()['detail'][0]['msg'] == f'Must contain <= {MAX_BATCH_SIZE} items'
+
+
+def test_api_convert_empty_schedule():
+    response = client.post('/convert', json={})
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {'output': []}
+
+
+def test_api_convert_batch_wrong_data_format_fails():
+    response = client.post('/convert/batch', json=['fail'])
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_api_convert_stream_success():
+    response = client.post(
+        '/convert/stream',
+        data=b'{"tuesday": []}\n{"monday_s": []}\n',
+        headers={'Content-Type': 'application/x-ndjson'},
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    lines = response.content.splitlines()
+    assert json.loads(lines[0]) == {'line': 1, 'output': ['Tuesday: Closed']}
+    assert json.loads(lines[1])['line'] == 2
+    assert 'errors' in json.loads(lines[1])
+
+
+def test_api_convert_stream_multiple_chunks():
+    chunks = [b'{"tuesday": []}\n' for _ in range(20)]
+    messages = []
+    disconnected = asyncio.Event()
+
+    async def receive():
+        if chunks:
+            return {'type': 'http.request', 'body': chunks.pop(0), 'more_body': bool(chunks)}
+        await disconnected.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        messages.append(message)
+
+    async def call_app():
+        scope = {
+            'type': 'http',
+            'http_version': '1.1',
+            'method': 'POST',
+            'scheme': 'http',
+            'path': '/convert/stream',
+            'raw_path': b'/convert/stream',
+            'root_path': '',
+            'query_string': b'',
+            'headers': [(b'content-type', b'application/x-ndjson')],
+            'client': ('testclient', 50000),
+            'server': ('testserver', 80),
+        }
+        await asyncio.wait_for(app(scope, receive, send), timeout=10)
+        disconnected.set()
+
+    asyncio.run(call_app())
+    assert messages[0]['status'] == HTTPStatus.OK
+    assert messages[-1].get('more_body', False) is False
+    lines = b''.join(message.get('body', b'') for message in messages[1:]).splitlines()
+    assert [json.loads(line)['line'] for line in lines] == list(range(1, 21))
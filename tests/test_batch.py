@@ -0,0 +1,93 @@
+"""Tests for batch conversion."""
+
+from unittest import mock
+
+from parser.batch import convert_batch, convert_item
+from tests.utils import s_time
+
+
+def test_convert_item_success():
+    output, errors = convert_item({
+        'monday': [
+            {
+                'type': 'open',
+                'value': s_time(10),
+            },
+            {
+                'type': 'close',
+                'value': s_time(18),
+            },
+        ],
+    })
+    assert output == ['Monday: 10 AM - 6 PM']
+    assert errors == []
+
+
+def test_convert_item_fails():
+    output, errors = convert_item({
+        'monday': [
+            {
+                'type': 'open',
+                'value': s_time(10),
+            },
+        ],
+    })
+    assert output == []
+    assert errors == [{
+        'loc': ('__root__',),
+        'msg': 'The next day after "monday" should start with a "close" action',
+        'type': 'value_error',
+    }]
+
+
+def test_convert_batch_keeps_valid_items():
+    output, errors = convert_batch({
+        'first': {
+            'tuesday': [],
+        },
+        'second': {
+            'monday_s': [],
+        },
+        'third': {
+            'monday': [
+                {
+                    'type': 'open',
+                    'value': s_time(10, 30),
+                },
+                {
+                    'type': 'close',
+                    'value': s_time(18),
+                },
+            ],
+        },
+    })
+    assert output == {
+        'first': ['Tuesday: Closed'],
+        'third': ['Monday: 10.30 AM - 6 PM'],
+    }
+    assert list(errors) == ['second']
+    assert 'value is not a valid enumeration member' in errors['second'][0]['msg']
+
+
+def test_convert_batch_empty():
+    assert convert_batch({}) == ({}, {})
+
+
+def test_convert_item_empty_schedule():
+    assert convert_item({}) == ([], [])
+
+
+def test_convert_batch_converts_identical_schedules_once():
+    with mock.patch('parser.batch.convert_item', wraps=convert_item) as convert:
+        output, errors = convert_batch({
+            'first': {'tuesday': []},
+            'second': {'tuesday': []},
+            'third': {'monday': []},
+        })
+    assert convert.call_count == 2
+    assert output == {
+        'first': ['Tuesday: Closed'],
+        'second': ['Tuesday: Closed'],
+        'third': ['Monday: Closed'],
+    }
+    assert errors == {}
@@ -0,0 +1,118 @@
+"""Tests for benchmark suite."""
+
+from benchmarks.importtime import measure, parse_importtime
+import asyncio
+from random import Random
+
+from benchmarks.load import HTTPClient, payload_mix, percentile, run as run_load
+from benchmarks.run import compare, run
+from benchmarks.validation import legacy_check_actions, run as run_validation
+from benchmarks.workloads import WORKLOADS, generate, large_malformed
+from parser.models import DataModel
+from parser.validation import _parse
+
+
+def test_workloads_are_valid():
+    for name in (*WORKLOADS, 'mixed'):
+        for raw in generate(name, 20):
+            DataModel.parse_obj(raw)
+
+
+def test_run_results():
+    results = run(count=2, repeat=1, cases=['datamodel_parse', 'http_convert'])
+    assert set(results['results']) == {
+        f'{case}/{workload}'
+        for case in ('datamodel_parse', 'http_convert')
+        for workload in WORKLOADS
+    }
+
+
+def test_compare_reports_regressions():
+    baseline = {'results': {'a': {'median': 1.0}, 'b': {'median': 1.0}}}
+    current = {'results': {
+        'a': {'median': 1.05},
+        'b': {'median': 1.5},
+        'c': {'median': 9.0},
+    }}
+    assert compare(current, baseline, threshold=0.1) == ['b: +50.0%']
+
+
+def test_parse_importtime():
+    assert parse_importtime(
+        'import time: self [us] | cumulative | imported package\n'
+        'import time:       120 |        120 |   parser.enums\n'
+        'import time:      1982 |      82994 | parser.convertor\n'
+    ) == {'parser.enums': 120, 'parser.convertor': 82994}
+
+
+def test_library_doesnt_import_pydantic():
+    times = measure('parser.convertor')
+    assert 'parser.convertor' in times
+    assert 'pydantic' not in times
+    assert 'fastapi' not in times
+
+
+def test_legacy_check_matches_single_pass():
+    rng = Random(0)
+    for _ in range(50):
+        data = _parse(large_malformed(rng, actions=rng.randrange(2, 8)))
+        try:
+            legacy_check_actions(data)
+        except ValueError:
+            legacy_valid = False
+        else:
+            legacy_valid = True
+        assert legacy_valid == (next(DataModel.iter_errors(data), None) is None)
+
+
+def test_run_validation_results():
+    results = {result['case']: result for result in run_validation(count=3, actions=20)}
+    assert results['legacy_first']['errors'] == results['single_pass_first']['errors'] == 3
+    assert results['single_pass_all']['errors'] == results['validate_all']['errors'] >= 3
+
+
+def test_percentile():
+    values = [float(value) for value in range(1, 101)]
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile(values[:1], 95) == 1
+    assert percentile([], 50) == 0
+
+
+def test_payload_mix():
+    payloads = payload_mix(40)
+    assert len(payloads) == 40
+    assert {kind for kind, _ in payloads} == {'closed', 'overnight', 'many_splits', 'invalid'}
+
+
+def test_load_in_process():
+    results = run_load([1, 4], requests=20, payloads=8, use_cache=False)
+    assert [result['concurrency'] for result in results] == [1, 4]
+    for result in results:
+        assert sum(result['statuses'].values()) == 20
+        assert set(result['statuses']) == {'200', '422'}
+        assert result['rejected_rate'] == 0.25
+        assert result['error_rate'] == 0
+        assert 0 < result['latency_ms']['p50'] <= result['latency_ms']['p99']
+
+
+def test_http_client():
+    bodies = []
+
+    async def handle(reader, writer):
+        while True:
+            head = await reader.readuntil(b'\r\n\r\n')
+            length = int(head.lower().split(b'content-length: ')[1].split(b'\r\n')[0])
+            bodies.append(await reader.readexactly(length))
+            writer.write(b'HTTP/1.1 422 Unprocessable Entity\r\nContent-Length: 2\r\n\r\n{}')
+
+    async def send():
+        server = await asyncio.start_server(handle, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        post = await HTTPClient(f'http://127.0.0.1:{port}').connect()
+        statuses = [await post(b'{"a":1}'), await post(b'[]')]
+        server.close()
+        return statuses
+
+    assert asyncio.run(send()) == [422, 422]
+    assert bodies == [b'{"a":1}', b'[]']
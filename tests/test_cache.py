@@ -0,0 +1,106 @@
+"""Tests for conversion results cache."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from parser.cache import ResultCache, SQLiteCache, result_key, schedule_key
+
+
+def test_schedule_key_ignores_action_keys_order():
+    assert schedule_key({
+        'monday': [{'type': 'open', 'value': 1}],
+    }) == schedule_key({
+        'monday': [{'value': 1, 'type': 'open'}],
+    })
+
+
+def test_schedule_key_keeps_weekdays_order():
+    assert schedule_key({
+        'monday': [],
+        'tuesday': [],
+    }) != schedule_key({
+        'tuesday': [],
+        'monday': [],
+    })
+
+
+def test_schedule_key_non_dict():
+    assert schedule_key([1]) != schedule_key({})
+
+
+def test_cache_lru_eviction():
+    cache = ResultCache(2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert cache.stats() == {'size': 2, 'maxsize': 2, 'hits': 3, 'misses': 1}
+
+
+def test_cache_zero_size():
+    cache = ResultCache(0)
+    cache.set('a', 1)
+    assert cache.get('a') is None
+    assert len(cache) == 0
+
+
+def test_cache_clear():
+    cache = ResultCache(1)
+    cache.set('a', 1)
+    cache.get('a')
+    cache.clear()
+    assert cache.stats() == {'size': 0, 'maxsize': 1, 'hits': 0, 'misses': 0}
+
+
+def test_cache_concurrent_access():
+    cache = ResultCache(8)
+
+    def worker(number):
+        for index in range(1000):
+            key = str((number + index) % 16)
+            cache.set(key, index)
+            cache.get(key)
+
+    with ThreadPoolExecutor(4) as executor:
+        list(executor.map(worker, range(4)))
+
+    stats = cache.stats()
+    assert stats['size'] == 8
+    assert stats['hits'] + stats['misses'] == 4000
+
+
+def test_result_key():
+    assert result_key('key') == 'key'
+    assert result_key('key', 'de', True) == 'key.de.grouped'
+    assert result_key('key', all_errors=True) == 'key.all-errors'
+
+
+def test_sqlite_cache(tmp_path):
+    path = str(tmp_path / 'cache.sqlite3')
+    cache = SQLiteCache(path, maxsize=10)
+    assert cache.get('a') is None
+    cache.set('a', [['Monday: Closed'], []])
+    assert cache.get('a') == [['Monday: Closed'], []]
+    assert SQLiteCache(path, maxsize=10).get('a') == [['Monday: Closed'], []]
+    assert cache.stats() == {'size': 1, 'maxsize': 10, 'hits': 1, 'misses': 1}
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_sqlite_cache_eviction(tmp_path):
+    cache = SQLiteCache(str(tmp_path / 'cache.sqlite3'), maxsize=3, touch_interval=0)
+    for key in 'abc':
+        cache.set(key, key)
+    cache.get('a')
+    cache.set('d', 'd')
+    assert len(cache) == 3
+    assert cache.get('b') is None
+    assert cache.get('a') == 'a'
+
+
+def test_sqlite_cache_disabled(tmp_path):
+    cache = SQLiteCache(str(tmp_path / 'cache.sqlite3'), maxsize=0)
+    cache.set('a', 'a')
+    assert cache.get('a') is None
@@ -0,0 +1,133 @@
+"""Tests for weekly schedules with dated overrides."""
+
+from datetime import date, timedelta
+from http import HTTPStatus
+from random import Random
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from main import app
+from parser.calendars import ExceptionCalendar, resolve_many, weekday_of
+from parser.convertor import Convertor
+from parser.models import CalendarModel, DataModel, WeekDaysEnum
+from tests.utils import s_time, valid_schedule
+
+client = TestClient(app)
+
+# 2026-12-24 is Thursday.
+CHRISTMAS_EVE = date(2026, 12, 24)
+
+
+def _day(opening, closing):
+    return [{'type': 'open', 'value': opening}, {'type': 'close', 'value': closing}]
+
+
+WEEKLY = {
+    'monday': _day(s_time(9), s_time(17)),
+    'tuesday': _day(s_time(9), s_time(17)),
+    'wednesday': _day(s_time(9), s_time(17)),
+    'thursday': [{'type': 'open', 'value': s_time(18)}],
+    'friday': [{'type': 'close', 'value': s_time(2)}] + _day(s_time(9), s_time(17)),
+}
+
+
+def _calendar(overrides, weekly=None):
+    model = CalendarModel.parse_obj({'weekly': weekly or WEEKLY, 'overrides': overrides})
+    return ExceptionCalendar.from_model(model)
+
+
+def test_weekday_of():
+    assert weekday_of(CHRISTMAS_EVE) == WeekDaysEnum.THURSDAY
+    assert weekday_of(date(2026, 10, 18)) == WeekDaysEnum.SUNDAY
+
+
+def test_calendar_without_overrides_repeats_week():
+    rng = Random(0)
+    for _ in range(20):
+        raw = valid_schedule(rng)
+        calendar = _calendar({}, raw)
+        model = DataModel.parse_obj(raw)
+        lines = dict(zip(model.__root__, Convertor(model).get_humanized_data()))
+        for day, line in calendar.humanize(date(2026, 1, 1), 14):
+            weekday = weekday_of(day)
+            if weekday in lines:
+                assert line == lines[weekday]
+
+
+def test_calendar_overrides():
+    calendar = _calendar({
+        '2026-12-25': [{'type': 'close', 'value': s_time(2)}],
+        '2026-12-31': [{'type': 'open', 'value': s_time(20)}],
+        '2027-01-01': [{'type': 'close', 'value': s_time(3)}],
+    })
+    lines = dict(calendar.humanize(CHRISTMAS_EVE, 9))
+    assert lines == {
+        date(2026, 12, 24): 'Thursday: 6 PM - 2 AM',
+        date(2026, 12, 25): 'Friday: Closed',
+        date(2026, 12, 26): 'Saturday: Closed',
+        date(2026, 12, 27): 'Sunday: Closed',
+        date(2026, 12, 28): 'Monday: 9 AM - 5 PM',
+        date(2026, 12, 29): 'Tuesday: 9 AM - 5 PM',
+        date(2026, 12, 30): 'Wednesday: 9 AM - 5 PM',
+        date(2026, 12, 31): 'Thursday: 8 PM - 3 AM',
+        date(2027, 1, 1): 'Friday: Closed',
+    }
+    assert calendar.day(date(2027, 1, 8)).intervals == ((s_time(9), s_time(17)),)
+    assert calendar.resolve(CHRISTMAS_EVE, 1) == (calendar.day(CHRISTMAS_EVE),)
+
+
+def test_calendar_override_closes_previous_opening():
+    calendar = _calendar({'2026-12-25': [{'type': 'close', 'value': s_time(1)}]})
+    assert calendar.day(CHRISTMAS_EVE).intervals == ((s_time(18), s_time(1)),)
+    assert calendar.day(CHRISTMAS_EVE + timedelta(days=7)).intervals == (
+        (s_time(18), s_time(2)),
+    )
+
+
+def test_calendar_patterns_are_shared():
+    calendars = [_calendar({'2026-12-25': [{'type': 'close', 'value': s_time(1)}]}), _calendar({})]
+    year = list(resolve_many(calendars, date(2026, 1, 1), 365))
+    assert [len(patterns) for patterns in year] == [365, 365]
+    assert all(first is second for first, second in zip(*year)
+               if first.intervals == second.intervals)
+    assert {id(pattern) for patterns in year for pattern in patterns} == {
+        id(pattern) for pattern in (*calendars[0].week, *calendars[0].dates.values())
+    }
+
+
+@pytest.mark.parametrize('overrides, message', [
+    ({'2026-12-25': []}, 'Wrong override of "2026-12-25": The next day after "thursday"'),
+    ({'2026-12-24': []}, 'Wrong override of "2026-12-24": The previous day before "friday"'),
+    ({'2026-12-28': [{'type': 'open', 'value': s_time(9)}]},
+     'Wrong override of "2026-12-28": The next day after "monday"'),
+])
+def test_calendar_override_errors(overrides, message):
+    with pytest.raises(ValidationError) as info:
+        CalendarModel.parse_obj({'weekly': WEEKLY, 'overrides': overrides})
+    assert info.value.errors()[0]['msg'].startswith(message)
+
+
+def test_api_calendar_resolve():
+    response = client.post('/calendar/resolve?locale=de', json={
+        'calendar': {'weekly': WEEKLY, 'overrides': {'2026-12-25': [
+            {'type': 'close', 'value': s_time(2)},
+        ]}},
+        'start': '2026-12-24',
+        'end': '2026-12-25',
+    })
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {'output': {
+        '2026-12-24': 'Donnerstag: 18:00 - 02:00',
+        '2026-12-25': 'Freitag: Geschlossen',
+    }}
+    assert response.headers['content-language'] == 'de'
+
+
+@pytest.mark.parametrize('start, end', [('2026-12-25', '2026-12-24'), ('2026-01-01', '2029-01-01')])
+def test_api_calendar_resolve_range_errors(start, end):
+    response = client.post('/calendar/resolve', json={
+        'calendar': {'weekly': WEEKLY}, 'start': start, 'end': end,
+    })
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
@@ -0,0 +1,109 @@
+"""Tests for command line interface."""
+
+import json
+from random import Random
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app, cache
+from parser.batch import convert_item
+from parser.cache import SQLiteCache, result_key, schedule_key
+from parser.cli import convert_body, main
+from tests.utils import random_schedule, s_time
+
+client = TestClient(app)
+
+SCHEDULE = {
+    'monday': [
+        {
+            'type': 'open',
+            'value': s_time(9),
+        },
+        {
+            'type': 'close',
+            'value': s_time(17),
+        },
+    ],
+}
+
+
+def test_warm_cache(tmp_path, capsys):
+    dump = tmp_path / 'dump.ndjson'
+    dump.write_text('\n'.join([json.dumps(SCHEDULE), '{', '', json.dumps({'monday': [1]})]))
+    path = str(tmp_path / 'cache.sqlite3')
+    main(['warm-cache', str(dump), '--path', path])
+    assert 'Stored 2 results, skipped 1 lines' in capsys.readouterr().err
+
+    store = SQLiteCache(path, 10)
+    assert len(store) == 2
+    assert store.get(schedule_key(SCHEDULE)) == [['Monday: 9 AM - 5 PM'], []]
+    assert store.get(schedule_key({'monday': [1]}))[1] == json.loads(
+        json.dumps(convert_item({'monday': [1]})[1]),
+    )
+
+    main(['warm-cache', str(dump), '--path', path, '--locale', 'de', '--group'])
+    assert store.get(result_key(schedule_key(SCHEDULE), 'de', True)) == [
+        ['Montag: 09:00 - 17:00'], [],
+    ]
+
+
+BODIES = [
+    b'',
+    b'null',
+    b'{',
+    b'[]',
+    b'\xff',
+    b'{"monday": []}',
+    b'{"monday": [{"type": "open", "value": 3600}]}',
+    b'{"monday": [{"type": "open", "value": "x"}]}',
+    '{"monday": [], "пн": []}'.encode(),
+]
+
+
+@pytest.mark.parametrize('body', BODIES)
+def test_convert_body_same_as_api(body):
+    cache.clear()
+    assert convert_body(body)[0] == client.post('/convert', data=body).content
+
+
+def test_convert_body_same_as_api_random():
+    rng = Random(0)
+    for _ in range(200):
+        body = json.dumps(random_schedule(rng, broken_rate=0.1)).encode()
+        assert convert_body(body)[0] == client.post('/convert', data=body).content
+
+
+def test_convert_body_locale():
+    body = json.dumps({'monday': [], 'tuesday': []}).encode()
+    expected = client.post('/convert?locale=de&group=true', data=body).content
+    assert convert_body(body, 'de', True)[0] == expected
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_convert_files(tmp_path, capsys, workers):
+    source = tmp_path / 'source'
+    (source / 'nested').mkdir(parents=True)
+    lines = [json.dumps(SCHEDULE), '', '{', json.dumps({'monday': []})]
+    (source / 'nested' / 'batch.ndjson').write_text('\n'.join(lines) + '\n')
+    (source / 'one.json').write_text(json.dumps(SCHEDULE))
+    (source / 'skipped.txt').write_text('{}')
+    output = tmp_path / 'output'
+    report = tmp_path / 'errors.ndjson'
+    main([
+        'convert', str(source), '--output', str(output),
+        '--workers', str(workers), '--errors', str(report),
+    ])
+
+    assert (output / 'one.json').read_bytes() == b'{"output":["Monday: 9 AM - 5 PM"]}'
+    assert (output / 'nested' / 'batch.ndjson').read_bytes().splitlines() == [
+        b'{"output":["Monday: 9 AM - 5 PM"]}',
+        convert_body(b'{')[0],
+        b'{"output":["Monday: Closed"]}',
+    ]
+    assert not (output / 'skipped.txt').exists()
+    errors = [json.loads(line) for line in report.read_text().splitlines()]
+    assert [(error['file'], error['line']) for error in errors] == [
+        (str(source / 'nested' / 'batch.ndjson'), 2),
+    ]
+    assert '4 schedules, 1 failed' in capsys.readouterr().err
@@ -1,8 +1,10 @@
 """Tests for workdays convertor."""
 
+from datetime import datetime
+
 import pytest
 
-from parser.convertor import Convertor
+from parser.convertor import Convertor, TIME_LABELS
 from parser.models import DataModel, WeekDaysEnum
 from tests.utils import s_time
 
@@ -207,6 +209,15 @@ def test_seconds_to_time_string_method(test_input, expected):
     assert Convertor._seconds_to_time_string(test_input) == expected
 
 
+def test_time_labels_match_strftime():
+    assert len(TIME_LABELS) == 24 * 60
+    for seconds in range(0, 86400, 60):
+        time = datetime.utcfromtimestamp(seconds)
+        expected = time.strftime('%I.%M %p' if time.minute else '%I %p').lstrip('0')
+        assert Convertor._seconds_to_time_string(seconds) == expected
+        assert Convertor._seconds_to_time_string(seconds + 59) == expected
+
+
 @pytest.mark.parametrize(
     'test_input,expected',
     [
@@ -217,3 +228,79 @@ def test_seconds_to_time_string_method(test_input, expected):
 )
 def test_humanize_action_item_method(test_input, expected):
     assert Convertor._humanize_action_item(test_input) == expected
+
+
+def _day(opening, closing):
+    return [
+        {
+            'type': 'open',
+            'value': opening,
+        },
+        {
+            'type': 'close',
+            'value': closing,
+        },
+    ]
+
+
+def test_grouped_data():
+    data = DataModel(__root__={
+        'monday': _day(s_time(9), s_time(17)),
+        'tuesday': _day(s_time(9), s_time(17)),
+        'wednesday': _day(s_time(9), s_time(17)),
+        'thursday': _day(s_time(9), s_time(18)),
+        'friday': _day(s_time(9), s_time(17)),
+        'saturday': [],
+        'sunday': [],
+    })
+    assert list(Convertor(data).get_grouped_data()) == [
+        'Monday - Wednesday: 9 AM - 5 PM',
+        'Thursday: 9 AM - 6 PM',
+        'Friday: 9 AM - 5 PM',
+        'Saturday - Sunday: Closed',
+    ]
+
+
+def test_grouped_data_not_consecutive():
+    data = DataModel(__root__={
+        'monday': [],
+        'wednesday': [],
+        'thursday': [],
+        'tuesday': [],
+    })
+    assert list(Convertor(data).get_grouped_data()) == [
+        'Monday: Closed',
+        'Wednesday - Thursday: Closed',
+        'Tuesday: Closed',
+    ]
+
+
+def test_grouped_data_overnight():
+    data = DataModel(__root__={
+        'friday': [
+            {
+                'type': 'open',
+                'value': s_time(20),
+            },
+        ],
+        'saturday': [
+            {
+                'type': 'close',
+                'value': s_time(2),
+            },
+            {
+                'type': 'open',
+                'value': s_time(20),
+            },
+        ],
+        'sunday': [
+            {
+                'type': 'close',
+                'value': s_time(2),
+            },
+        ],
+    })
+    assert list(Convertor(data).get_grouped_data()) == [
+        'Friday - Saturday: 8 PM - 2 AM',
+        'Sunday: Closed',
+    ]
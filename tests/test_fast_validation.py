@@ -0,0 +1,118 @@
+"""Differential tests of fast validation against pydantic models."""
+
+from random import Random
+
+import pytest
+from pydantic import error_wrappers
+
+from parser.convertor import Convertor
+from parser.models import DataModel
+from parser.validation import validate_all, validate_fast
+from tests.utils import random_schedule, s_time, valid_schedule
+
+
+def _validate(parse, raw):
+    try:
+        data = parse(raw)
+    except error_wrappers.ValidationError as exc:
+        return None, exc.errors()
+    return list(Convertor(data).get_humanized_data()), None
+
+
+def _assert_same(raw):
+    assert _validate(validate_fast, raw) == _validate(DataModel.parse_obj, raw), raw
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_fast_validation_matches_pydantic_random(seed):
+    rng = Random(seed)
+    for _ in range(200):
+        _assert_same(random_schedule(rng, broken_rate=0.05))
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_fast_validation_matches_pydantic_valid(seed):
+    rng = Random(seed)
+    for _ in range(100):
+        raw = valid_schedule(rng)
+        assert _validate(validate_fast, raw)[0] is not None
+        _assert_same(raw)
+
+
+@pytest.mark.parametrize(
+    'raw',
+    [
+        {},
+        [],
+        {'monday': [{'type': 'open', 'value': '3600'}, {'type': 'close', 'value': 7200}]},
+        {'monday': [{'type': 'open', 'value': True}, {'type': 'close', 'value': 7200}]},
+        {'monday': [{'type': 'open', 'value': s_time(8)}, {'type': 'open', 'value': s_time(9)}]},
+        {'monday': [{'type': 'open', 'value': s_time(8)}, {'type': 'close', 'value': s_time(8)}]},
+        {'monday': [{'type': 'open', 'value': s_time(8)}, {'type': 'close', 'value': s_time(7)}]},
+        {'monday': [{'type': 'open', 'value': s_time(8)}]},
+        {'tuesday': [{'type': 'close', 'value': s_time(8)}]},
+        {'saturday': [{'type': 'open', 'value': s_time(9)}],
+         'sunday': [{'type': 'close', 'value': s_time(1)}]},
+    ]
+)
+def test_fast_validation_matches_pydantic(raw):
+    _assert_same(raw)
+
+
+def test_fast_validation_builds_no_action_models():
+    data = validate_fast({
+        'monday': [
+            {
+                'type': 'open',
+                'value': s_time(10),
+            },
+            {
+                'type': 'close',
+                'value': s_time(18),
+            },
+        ],
+    })
+    assert isinstance(data, DataModel)
+    assert [tuple(action) for action in data.__root__['monday']] == [
+        ('open', s_time(10)),
+        ('close', s_time(18)),
+    ]
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_all_errors_validation_extends_first_error(seed):
+    rng = Random(seed)
+    for _ in range(200):
+        raw = random_schedule(rng, broken_rate=0.05)
+        output, errors = _validate(DataModel.parse_obj, raw)
+        all_output, all_errors = _validate(validate_all, raw)
+        assert all_output == output, raw
+        if errors is None:
+            assert all_errors is None, raw
+        elif errors[0]['loc'] == ('__root__',):
+            assert all_errors[0] == errors[0], raw
+            assert all(error['loc'] == ('__root__',) for error in all_errors), raw
+        else:
+            assert all_errors == errors, raw
+
+
+@pytest.mark.parametrize('coerce', [False, True])
+def test_all_errors_validation_reports_every_day(coerce):
+    value = str if coerce else int
+    raw = {
+        'monday': [{'type': 'close', 'value': value(s_time(8))}],
+        'tuesday': [
+            {'type': 'open', 'value': value(s_time(9))},
+            {'type': 'open', 'value': value(s_time(9))},
+        ],
+        'friday': [{'type': 'open', 'value': value(s_time(18))}],
+    }
+    with pytest.raises(error_wrappers.ValidationError) as info:
+        validate_all(raw)
+    assert [error['msg'] for error in info.value.errors()] == [
+        'The previous day before "monday" must end with an "open" action',
+        'Wrong actions for "tuesday", two actions in a row can\'t be of type "open"',
+        'Wrong actions for "tuesday", multiple items have the same value "32400"',
+        'The next day after "tuesday" should start with a "close" action',
+        'The next day after "friday" should start with a "close" action',
+    ]
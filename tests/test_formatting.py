@@ -0,0 +1,88 @@
+"""Tests for locale dependent formatting."""
+
+from random import Random
+
+import pytest
+
+from parser.convertor import Convertor
+from parser.formatting import (
+    LOCALES, build_time_labels, find_locale, get_formatter, negotiate_locale,
+)
+from parser.models import DataModel, WeekDaysEnum
+from tests.utils import s_time, valid_schedule
+
+
+def test_default_formatter_matches_english_output():
+    rng = Random(0)
+    for _ in range(50):
+        data = DataModel.parse_obj(valid_schedule(rng))
+        convertor = Convertor(data)
+        expected = [
+            f'{day}: {Convertor._humanize_action_item(value)}'
+            for day, value in convertor.get_parsed_data()
+        ]
+        assert list(convertor.get_humanized_data()) == expected
+
+
+@pytest.mark.parametrize('locale', LOCALES)
+def test_locale_spec(locale):
+    formatter = get_formatter(locale)
+    assert formatter is get_formatter(locale)
+    assert len(formatter.day_names) == len(WeekDaysEnum)
+    assert len(set(formatter.time_labels)) == 24 * 60
+
+
+@pytest.mark.parametrize(
+    'locale, expected',
+    [
+        ('en', ['Monday: 9 AM - 5.30 PM, 8 PM - 1 AM', 'Tuesday: Closed']),
+        ('en-GB', ['Monday: 09:00 - 17:30, 20:00 - 01:00', 'Tuesday: Closed']),
+        ('de', ['Montag: 09:00 - 17:30, 20:00 - 01:00', 'Dienstag: Geschlossen']),
+        ('fi', ['Maanantai: 09.00–17.30, 20.00–01.00', 'Tiistai: Suljettu']),
+    ]
+)
+def test_convertor_locale(locale, expected):
+    data = DataModel.parse_obj({
+        'monday': [
+            {'type': 'open', 'value': s_time(9)},
+            {'type': 'close', 'value': s_time(17, 30)},
+            {'type': 'open', 'value': s_time(20)},
+        ],
+        'tuesday': [
+            {'type': 'close', 'value': s_time(1)},
+        ],
+    })
+    assert list(Convertor(data, get_formatter(locale)).get_humanized_data()) == expected
+
+
+def test_build_time_labels():
+    assert build_time_labels(24, ':')[:2] == ('00:00', '00:01')
+    assert build_time_labels(12, '.')[:2] == ('12 AM', '12.01 AM')
+
+
+@pytest.mark.parametrize(
+    'tag, expected',
+    [
+        ('de', 'de'),
+        ('DE-at', 'de'),
+        ('en-gb', 'en-GB'),
+        ('en-US', 'en'),
+        ('xx', None),
+    ]
+)
+def test_find_locale(tag, expected):
+    assert find_locale(tag) == expected
+
+
+@pytest.mark.parametrize(
+    'header, expected',
+    [
+        ('', None),
+        ('*', None),
+        ('de-DE,de;q=0.9,en;q=0.8', 'de'),
+        ('xx, fr;q=0.5, sv;q=0.7', 'sv'),
+        ('de;q=0, fr;q=bad, it;q=0.1', 'it'),
+    ]
+)
+def test_negotiate_locale(header, expected):
+    assert negotiate_locale(header) == expected
@@ -0,0 +1,142 @@
+"""Tests for "is open at" indexes."""
+
+from random import Random
+
+import pytest
+
+from parser.index import BulkWeekIndex, WeekIndex, open_at, to_moment, to_week_second
+from parser.models import DataModel, WeekDaysEnum
+from parser.schedule import DAY_SECONDS, WEEK_SECONDS, Schedule
+from tests.utils import s_time, valid_schedule
+
+
+def _schedule(raw):
+    return Schedule.from_model(DataModel.parse_obj(raw))
+
+
+def _is_open(schedule, week_second):
+    return any(
+        opening <= moment < closing
+        for opening, closing in schedule
+        for moment in (week_second, week_second + WEEK_SECONDS)
+    )
+
+
+OVERNIGHT = {
+    'friday': [
+        {
+            'type': 'open',
+            'value': s_time(18),
+        },
+    ],
+    'saturday': [
+        {
+            'type': 'close',
+            'value': s_time(2),
+        },
+        {
+            'type': 'open',
+            'value': s_time(20),
+        },
+    ],
+    'sunday': [
+        {
+            'type': 'close',
+            'value': s_time(1),
+        },
+    ],
+}
+
+
+def test_week_second_conversion():
+    assert to_week_second(WeekDaysEnum.SUNDAY, 0) == 0
+    assert to_week_second(WeekDaysEnum.FRIDAY, s_time(23, 30)) == 5 * DAY_SECONDS + s_time(23, 30)
+    assert to_moment(5 * DAY_SECONDS + s_time(23, 30)) == (WeekDaysEnum.FRIDAY, s_time(23, 30))
+    assert to_moment(WEEK_SECONDS + 1) == (WeekDaysEnum.SUNDAY, 1)
+
+
+@pytest.mark.parametrize(
+    'weekday,value,expected',
+    [
+        (WeekDaysEnum.FRIDAY, s_time(17), False),
+        (WeekDaysEnum.FRIDAY, s_time(18), True),
+        (WeekDaysEnum.SATURDAY, s_time(1, 59), True),
+        (WeekDaysEnum.SATURDAY, s_time(2), False),
+        (WeekDaysEnum.SATURDAY, s_time(23), True),
+        (WeekDaysEnum.SUNDAY, 0, True),
+        (WeekDaysEnum.SUNDAY, s_time(1), False),
+        (WeekDaysEnum.MONDAY, s_time(12), False),
+    ]
+)
+def test_week_index_is_open(weekday, value, expected):
+    index = WeekIndex(_schedule(OVERNIGHT))
+    assert index.is_open(to_week_second(weekday, value)) is expected
+
+
+def test_week_index_next_changes():
+    index = WeekIndex(_schedule(OVERNIGHT))
+    moment = to_week_second(WeekDaysEnum.SATURDAY, s_time(12))
+    assert to_moment(index.next_opening(moment)) == (WeekDaysEnum.SATURDAY, s_time(20))
+    assert to_moment(index.next_closing(moment)) == (WeekDaysEnum.SUNDAY, s_time(1))
+    moment = to_week_second(WeekDaysEnum.SUNDAY, s_time(12))
+    assert to_moment(index.next_opening(moment)) == (WeekDaysEnum.FRIDAY, s_time(18))
+    assert to_moment(index.next_closing(moment)) == (WeekDaysEnum.SATURDAY, s_time(2))
+
+
+def test_week_index_empty():
+    index = WeekIndex(_schedule({'monday': []}))
+    assert index.is_open(0) is False
+    assert index.next_opening(0) is None
+    assert index.next_closing(0) is None
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_week_index_matches_brute_force(seed):
+    rng = Random(seed)
+    schedules = {number: _schedule(valid_schedule(rng)) for number in range(50)}
+    indexes = {number: WeekIndex(schedule) for number, schedule in schedules.items()}
+    bulk_index = BulkWeekIndex(schedules)
+    boundaries = [second % WEEK_SECONDS for schedule in schedules.values()
+                  for second in schedule.intervals]
+    moments = [rng.randrange(WEEK_SECONDS) for _ in range(200)] + rng.sample(boundaries, 50)
+    for week_second in moments:
+        expected = [number for number, schedule in schedules.items()
+                    if _is_open(schedule, week_second)]
+        assert [number for number, index in indexes.items()
+                if index.is_open(week_second)] == expected
+        assert bulk_index.open_at(week_second) == expected
+        assert open_at(schedules, week_second) == expected
+
+
+def test_bulk_week_index_boundaries():
+    index = BulkWeekIndex({
+        'overnight': _schedule(OVERNIGHT),
+        'closed': _schedule({'monday': []}),
+        'friday': _schedule({
+            'friday': [
+                {
+                    'type': 'open',
+                    'value': s_time(9),
+                },
+                {
+                    'type': 'close',
+                    'value': s_time(23, 30),
+                },
+            ],
+        }),
+    })
+    assert index.open_at(to_week_second(WeekDaysEnum.FRIDAY, s_time(23))) == [
+        'overnight', 'friday',
+    ]
+    assert index.open_at(to_week_second(WeekDaysEnum.FRIDAY, s_time(23, 30))) == ['overnight']
+    assert index.open_at(0) == ['overnight']
+    assert index.open_at(to_week_second(WeekDaysEnum.MONDAY, 0)) == []
+    assert BulkWeekIndex({}).open_at(0) == []
+
+
+def test_open_at_overnight():
+    schedules = {'overnight': _schedule(OVERNIGHT), 'closed': _schedule({'monday': []})}
+    assert open_at(schedules, 0) == ['overnight']
+    assert open_at(schedules, to_week_second(WeekDaysEnum.SUNDAY, s_time(1))) == []
+    assert open_at(schedules, to_week_second(WeekDaysEnum.SATURDAY, s_time(20))) == ['overnight']
+    assert open_at({}, 0) == []
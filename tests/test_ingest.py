@@ -0,0 +1,76 @@
+"""Differential tests of raw body decoding against pydantic models."""
+
+import json
+from random import Random
+
+import pytest
+
+from parser.batch import convert_item
+from parser.cache import schedule_key
+from parser.convertor import Convertor
+from parser.ingest import actions_key, decode_actions, validate_actions
+from tests.utils import random_schedule, s_time, valid_schedule
+
+
+def _convert(body):
+    actions = decode_actions(body)
+    if actions is None:
+        return None
+    schedule, errors = validate_actions(actions)
+    if schedule is None:
+        return [], errors
+    return list(Convertor(schedule).get_humanized_data()), []
+
+
+def _assert_same(raw):
+    body = json.dumps(raw).encode()
+    result = _convert(body)
+    if result is not None:
+        assert result == convert_item(raw), raw
+        assert actions_key(decode_actions(body)) == schedule_key(raw)
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_decode_actions_matches_pydantic_random(seed):
+    rng = Random(seed)
+    for _ in range(200):
+        _assert_same(random_schedule(rng, broken_rate=0.05))
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_decode_actions_matches_pydantic_valid(seed):
+    rng = Random(seed)
+    for _ in range(100):
+        raw = valid_schedule(rng)
+        assert _convert(json.dumps(raw).encode())[0]
+        _assert_same(raw)
+
+
+@pytest.mark.parametrize(
+    'body',
+    [
+        b'',
+        b'{',
+        b'[]',
+        b'{"monday": {"type": "open", "value": 3600}}',
+        b'{"type": "open", "value": 3600}',
+        b'{"monday": [{"value": 3600, "type": "open"}]}',
+        b'{"monday": [{"type": "open", "value": true}]}',
+        b'{"monday": [{"type": "open", "value": 3600.0}]}',
+        b'{"monday": [{"type": "open", "value": 0}]}',
+        b'{"monday": [{"type": "open", "value": 3600, "extra": 1}]}',
+        b'{"monday": [[{"type": "open", "value": 3600}]]}',
+        b'{"monday": [{"tuesday": []}]}',
+        b'{"mon": []}',
+        b'\xff',
+    ]
+)
+def test_decode_actions_not_canonical(body):
+    assert decode_actions(body) is None
+
+
+def test_decode_actions_invalid():
+    body = json.dumps({'monday': [{'type': 'open', 'value': s_time(10)}]}).encode()
+    schedule, errors = validate_actions(decode_actions(body))
+    assert schedule is None
+    assert errors == convert_item(json.loads(body))[1]
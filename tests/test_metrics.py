@@ -0,0 +1,68 @@
+"""Tests for metrics."""
+
+from metrics import Registry
+from parser.models import get_error_rule
+
+
+def test_counter_render():
+    registry = Registry()
+    counter = registry.counter('failures_total', 'Failures.', 'rule')
+    counter.inc('type_order')
+    counter.inc('type_order')
+    counter.inc('last_action')
+    assert counter.get('type_order') == 2
+    assert registry.render() == (
+        '# HELP failures_total Failures.\n'
+        '# TYPE failures_total counter\n'
+        'failures_total{rule="last_action"} 1\n'
+        'failures_total{rule="type_order"} 2\n'
+    )
+
+
+def test_histogram_render():
+    registry = Registry()
+    histogram = registry.histogram('size_bytes', 'Sizes.', (10, 100))
+    for value in (5, 10, 50, 500):
+        histogram.observe(value)
+    assert histogram.get_count() == 4
+    assert registry.render() == (
+        '# HELP size_bytes Sizes.\n'
+        '# TYPE size_bytes histogram\n'
+        'size_bytes_bucket{le="10"} 2\n'
+        'size_bytes_bucket{le="100"} 3\n'
+        'size_bytes_bucket{le="+Inf"} 4\n'
+        'size_bytes_sum 565.0\n'
+        'size_bytes_count 4\n'
+    )
+
+
+def test_histogram_time():
+    registry = Registry()
+    histogram = registry.histogram('stage_seconds', 'Stages.', (1,), 'stage')
+    with histogram.time('decode'):
+        pass
+    assert histogram.get_count('decode') == 1
+    assert histogram.get_count('format') == 0
+    assert 'stage_seconds_bucket{stage="decode",le="1"} 1' in registry.render()
+
+
+def test_get_error_rule():
+    assert get_error_rule({
+        'msg': 'Wrong actions for "monday", two actions in a row can\'t be of type "open"',
+        'type': 'value_error',
+    }) == 'type_order'
+    assert get_error_rule({
+        'msg': 'Wrong actions for "monday", the value "28800" must be after "25200"',
+        'type': 'value_error',
+    }) == 'value_order'
+    assert get_error_rule({
+        'msg': 'The previous day before "tuesday" must end with an "open" action',
+        'type': 'value_error',
+    }) == 'first_action'
+    assert get_error_rule({
+        'msg': 'The next day after "monday" should start with a "close" action',
+        'type': 'value_error',
+    }) == 'last_action'
+    assert get_error_rule({'msg': 'field required', 'type': 'value_error.missing'}) == (
+        'value_error.missing'
+    )
@@ -0,0 +1,79 @@
+"""Tests for interning of repeated day patterns."""
+
+from random import Random
+
+import pytest
+
+from parser import patterns
+from parser.convertor import Convertor
+from parser.formatting import get_formatter
+from parser.models import ActionTypeEnum, DataModel, WeekDaysEnum
+from parser.patterns import intern_actions, intern_day
+from parser.schedule import Action
+from parser.validation import validate_fast
+from tests.utils import s_time, valid_schedule
+
+
+@pytest.fixture(autouse=True)
+def clear_patterns():
+    patterns.clear()
+    yield
+    patterns.clear()
+
+
+def test_intern_day_shares_pattern():
+    first = intern_day([(s_time(9), s_time(17))])
+    second = intern_day(((s_time(9), s_time(17)),))
+    assert first is second
+    assert first.intervals == ((s_time(9), s_time(17)),)
+    assert intern_day([]) is not first
+    assert patterns.stats() == {'days': 2, 'actions': 0}
+
+
+def test_pattern_line_is_rendered_once():
+    pattern = intern_day([(s_time(9), s_time(17))])
+    formatter = get_formatter('de')
+    line = pattern.line(WeekDaysEnum.MONDAY, formatter)
+    assert line == 'Montag: 09:00 - 17:00'
+    assert pattern.line(WeekDaysEnum.MONDAY, formatter) is line
+    assert pattern.line(WeekDaysEnum.TUESDAY, get_formatter()) == 'Tuesday: 9 AM - 5 PM'
+    assert intern_day([]).line(WeekDaysEnum.SUNDAY, get_formatter()) == 'Sunday: Closed'
+
+
+def test_intern_actions_shares_tuple():
+    actions = [Action(ActionTypeEnum.OPEN, s_time(9)), Action(ActionTypeEnum.CLOSE, s_time(17))]
+    shared = intern_actions(actions)
+    assert shared == tuple(actions)
+    assert intern_actions(list(actions)) is shared
+
+
+def test_patterns_are_limited(monkeypatch):
+    monkeypatch.setattr(patterns, 'MAX_PATTERNS', 2)
+    for hour in range(5):
+        intern_day([(s_time(hour), s_time(hour + 1))])
+    assert patterns.stats()['days'] == 2
+    extra = intern_day([(s_time(10), s_time(11))])
+    assert extra is not intern_day([(s_time(10), s_time(11))])
+    assert extra.line(WeekDaysEnum.MONDAY, get_formatter()) == 'Monday: 10 AM - 11 AM'
+
+
+def test_validated_days_are_shared():
+    day = [{'type': 'open', 'value': s_time(9)}, {'type': 'close', 'value': s_time(17)}]
+    first = validate_fast({'monday': list(day), 'tuesday': list(day)})
+    second = validate_fast({'friday': list(day)})
+    assert first.__root__[WeekDaysEnum.MONDAY] is first.__root__[WeekDaysEnum.TUESDAY]
+    assert first.__root__[WeekDaysEnum.MONDAY] is second.__root__[WeekDaysEnum.FRIDAY]
+
+
+def test_interned_output_matches_formatter():
+    rng = Random(0)
+    for _ in range(50):
+        data = DataModel.parse_obj(valid_schedule(rng))
+        for locale in ('en', 'fi'):
+            formatter = get_formatter(locale)
+            convertor = Convertor(data, formatter)
+            expected = [
+                formatter.format_day(weekday, intervals)
+                for weekday, intervals in convertor.schedule.get_day_intervals().items()
+            ]
+            assert list(convertor.get_humanized_data()) == expected
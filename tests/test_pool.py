@@ -0,0 +1,41 @@
+"""Tests for conversion process pool."""
+
+import asyncio
+import time
+
+import pytest
+
+from parser.batch import convert_json
+from pool import ConversionPool, PoolSaturatedError
+
+
+@pytest.fixture(name='pool')
+def fixture_pool():
+    pool = ConversionPool(workers=1, max_pending=1)
+    yield pool
+    pool.shutdown()
+
+
+def test_pool_run(pool):
+    result = asyncio.run(pool.run(convert_json, b'{"monday": []}'))
+    assert result == (['Monday: Closed'], [])
+    assert pool.pending == 0
+
+
+def test_pool_run_invalid_json(pool):
+    assert asyncio.run(pool.run(convert_json, b'{')) is None
+    assert asyncio.run(pool.run(convert_json, b'null')) is None
+
+
+def test_pool_saturated(pool):
+    async def run_two():
+        return await asyncio.gather(
+            pool.run(time.sleep, 0.2),
+            pool.run(time.sleep, 0.2),
+            return_exceptions=True,
+        )
+
+    first, second = asyncio.run(run_two())
+    assert first is None
+    assert isinstance(second, PoolSaturatedError)
+    assert pool.pending == 0
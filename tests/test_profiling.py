@@ -0,0 +1,80 @@
+"""Tests for profiling of requests."""
+
+from http import HTTPStatus
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from profiling import ProfileStore, ProfilingMiddleware, run_profiled
+from tests.utils import s_time
+
+PAYLOAD = {'monday': [{'type': 'open', 'value': s_time(9)}, {'type': 'close', 'value': s_time(17)}]}
+
+
+@pytest.fixture(name='store')
+def fixture_store(tmp_path, monkeypatch):
+    store = ProfileStore(str(tmp_path), keep=2)
+    monkeypatch.setattr(main, 'profiles', store)
+    main.cache.clear()
+    return store
+
+
+def _client(store, sample_rate=0.0):
+    return TestClient(ProfilingMiddleware(main.app, store, sample_rate))
+
+
+def test_run_profiled_without_request():
+    assert run_profiled(sum, [1, 2]) == 3
+
+
+def test_profile_with_header(store):
+    client = _client(store)
+    response = client.post('/convert', json=PAYLOAD)
+    assert 'x-profile-id' not in response.headers
+    assert store.list() == []
+
+    main.cache.clear()
+    response = client.post('/convert', json=PAYLOAD, headers={'X-Profile': '1'})
+    assert response.json() == {'output': ['Monday: 9 AM - 5 PM']}
+    profile_id = response.headers['x-profile-id']
+    [entry] = client.get('/admin/profiles').json()
+    assert entry['id'] == profile_id
+    assert entry['profiled'] is True
+    assert entry['path'] == '/convert'
+    assert entry['status'] == HTTPStatus.OK
+    assert entry['wall_ms'] > 0
+
+    report = client.get(f'/admin/profiles/{profile_id}').text
+    assert 'get_humanized_data' in report
+    assert '_convert' in report
+    raw = client.get(f'/admin/profiles/{profile_id}?raw=true')
+    assert raw.headers['content-type'] == 'application/octet-stream'
+    response = client.get(f'/admin/profiles/{profile_id}?sort=unknown')
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_profile_sample_and_limit(store):
+    client = _client(store, sample_rate=1.0)
+    ids = [client.post('/convert', json=PAYLOAD).headers['x-profile-id'] for _ in range(3)]
+    assert [entry['id'] for entry in store.list()] == ids[:0:-1]
+    response = client.get(f'/admin/profiles/{ids[0]}')
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_profile_without_profiled_work(store):
+    client = _client(store)
+    response = client.get('/metrics', headers={'X-Profile': '1'})
+    profile_id = response.headers['x-profile-id']
+    assert store.get(profile_id)['profiled'] is False
+    assert client.get(f'/admin/profiles/{profile_id}').text.startswith('No work')
+    response = client.get(f'/admin/profiles/{profile_id}?raw=true')
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_profiles_disabled():
+    client = TestClient(main.app)
+    assert main.profiles is None
+    response = client.post('/convert', json=PAYLOAD, headers={'X-Profile': '1'})
+    assert 'x-profile-id' not in response.headers
+    assert client.get('/admin/profiles').status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,18 @@
+"""Tests for custom API responses."""
+
+from fastapi.responses import JSONResponse
+
+from responses import OutputResponse, encode_output
+
+
+def test_encode_output_same_as_json_response():
+    for lines in ([], ['Monday: 10 AM - 6 PM', 'Tuesday: Closed'], ['"\\\n', 'Понедельник']):
+        assert encode_output(iter(lines)) == JSONResponse({'output': lines}).body
+
+
+def test_output_response():
+    response = OutputResponse(['Monday: Closed'], headers={'ETag': '"key"'})
+    assert response.body == b'{"output":["Monday: Closed"]}'
+    assert response.headers['content-type'] == 'application/json'
+    assert response.headers['etag'] == '"key"'
+    assert OutputResponse(response.body).body == response.body
@@ -0,0 +1,115 @@
+"""Tests for compact schedule representation."""
+
+from array import array
+from copy import deepcopy
+from random import Random
+
+import pytest
+
+from parser.models import ActionTypeEnum, DataModel, WeekDaysEnum
+from parser.schedule import DAY_SECONDS, WEEK_SECONDS, Schedule
+from tests.utils import s_time, valid_schedule
+
+
+def _normalized_data(data):
+    """Reference normalization moving leading close actions to the previous day."""
+    data = deepcopy(data.__root__)
+    for weekday, actions in data.items():
+        if actions and actions[0].type == ActionTypeEnum.CLOSE:
+            data[weekday.prev].append(actions.pop(0))
+    return {
+        weekday: [
+            (opening.value, closing.value)
+            for opening, closing in zip(actions[::2], actions[1::2])
+        ]
+        for weekday, actions in data.items()
+    }
+
+
+def test_schedule_from_model():
+    data = DataModel(__root__={
+        'tuesday': [
+            {
+                'type': 'close',
+                'value': s_time(1),
+            },
+        ],
+        'monday': [
+            {
+                'type': 'open',
+                'value': s_time(10),
+            },
+            {
+                'type': 'close',
+                'value': s_time(14),
+            },
+            {
+                'type': 'open',
+                'value': s_time(20),
+            },
+        ],
+    })
+    schedule = Schedule.from_model(data)
+    assert schedule.weekdays == (WeekDaysEnum.TUESDAY, WeekDaysEnum.MONDAY)
+    assert list(schedule) == [
+        (DAY_SECONDS + s_time(10), DAY_SECONDS + s_time(14)),
+        (DAY_SECONDS + s_time(20), 2 * DAY_SECONDS + s_time(1)),
+    ]
+    assert len(schedule) == 2
+
+
+def test_schedule_wraps_week():
+    data = DataModel(__root__={
+        'saturday': [
+            {
+                'type': 'open',
+                'value': s_time(22),
+            },
+        ],
+        'sunday': [
+            {
+                'type': 'close',
+                'value': s_time(2),
+            },
+            {
+                'type': 'open',
+                'value': s_time(10),
+            },
+            {
+                'type': 'close',
+                'value': s_time(12),
+            },
+        ],
+    })
+    schedule = Schedule.from_model(data)
+    assert list(schedule) == [
+        (s_time(10), s_time(12)),
+        (6 * DAY_SECONDS + s_time(22), WEEK_SECONDS + s_time(2)),
+    ]
+    assert schedule.get_day_intervals() == {
+        WeekDaysEnum.SATURDAY: [(s_time(22), s_time(2))],
+        WeekDaysEnum.SUNDAY: [(s_time(10), s_time(12))],
+    }
+
+
+def test_schedule_equality():
+    first = Schedule([WeekDaysEnum.MONDAY], array('l', [1, 2]))
+    assert first == Schedule([WeekDaysEnum.MONDAY], array('l', [1, 2]))
+    assert first != Schedule([WeekDaysEnum.MONDAY], array('l', [1, 3]))
+    assert first != Schedule([WeekDaysEnum.TUESDAY], array('l', [1, 2]))
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_schedule_day_intervals_match_normalized_data(seed):
+    rng = Random(seed)
+    for _ in range(100):
+        data = DataModel.parse_obj(valid_schedule(rng))
+        assert Schedule.from_model(data).get_day_intervals() == _normalized_data(data)
+
+
+def test_lazy_package_exports():
+    import parser  # pylint: disable=import-outside-toplevel
+    assert parser.Schedule is Schedule
+    assert 'DataModel' in dir(parser)
+    with pytest.raises(AttributeError):
+        getattr(parser, 'missing')
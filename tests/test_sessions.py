@@ -0,0 +1,69 @@
+"""Differential tests of incremental updates against full conversion."""
+
+from random import Random
+
+import pytest
+from pydantic import ValidationError
+
+from parser.batch import convert_item
+from parser.models import DataModel, PatchModel, WeekDaysEnum
+from parser.sessions import ScheduleSession, to_actions
+from tests.utils import WEEKDAYS, s_time, valid_schedule
+
+
+def _apply(session, raw_patch):
+    patch = {
+        weekday: None if actions is None else to_actions(actions)
+        for weekday, actions in PatchModel.parse_obj(raw_patch).__root__.items()
+    }
+    try:
+        return session.apply(patch), []
+    except ValidationError as exc:
+        return None, exc.errors()
+
+
+def _random_patch(rng):
+    patch = {}
+    for weekday in rng.sample(WEEKDAYS, rng.randrange(1, 3)):
+        if rng.random() < 0.2:
+            patch[weekday] = None
+        else:
+            patch[weekday] = [
+                {'type': rng.choice(('open', 'close')), 'value': value}
+                for value in sorted(rng.sample(range(900, 86400, 900), rng.randrange(4)))
+            ]
+    return patch
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_session_apply_matches_full_conversion(seed):
+    rng = Random(seed)
+    raw = valid_schedule(rng)
+    session = ScheduleSession.from_model(DataModel.parse_obj(raw))
+    assert session.output == convert_item(raw)[0]
+    for _ in range(100):
+        patch = _random_patch(rng)
+        patched = {**raw, **patch}
+        patched = {weekday: actions for weekday, actions in patched.items() if actions is not None}
+        new_session, errors = _apply(session, patch)
+        output, expected_errors = convert_item(patched)
+        assert errors == expected_errors, patch
+        if new_session is not None:
+            assert new_session.output == output, patch
+            session, raw = new_session, patched
+
+
+def test_session_apply_overnight():
+    session = ScheduleSession.from_model(DataModel.parse_obj({
+        'saturday': [{'type': 'open', 'value': s_time(9)}, {'type': 'close', 'value': s_time(18)}],
+        'sunday': [],
+    }))
+    session = session.apply({
+        WeekDaysEnum.SATURDAY: to_actions(PatchModel.parse_obj(
+            {'saturday': [{'type': 'open', 'value': s_time(20)}]},
+        ).__root__[WeekDaysEnum.SATURDAY]),
+        WeekDaysEnum.SUNDAY: to_actions(PatchModel.parse_obj(
+            {'sunday': [{'type': 'close', 'value': s_time(1)}]},
+        ).__root__[WeekDaysEnum.SUNDAY]),
+    })
+    assert session.output == ['Saturday: 8 PM - 1 AM', 'Sunday: Closed']
@@ -0,0 +1,84 @@
+"""Tests for NDJSON streaming conversion."""
+
+import json
+
+from parser.stream import LineSplitter, convert_ndjson
+
+
+def test_line_splitter_joins_chunks():
+    splitter = LineSplitter()
+    assert list(splitter.feed(b'{"a"')) == []
+    assert list(splitter.feed(b': 1}\n\n{"b": 2}\n{"c"')) == [
+        (1, b'{"a": 1}'),
+        (3, b'{"b": 2}'),
+    ]
+    assert list(splitter.feed(b': 3}')) == []
+    assert list(splitter.close()) == [(4, b'{"c": 3}')]
+
+
+def test_line_splitter_close_empty_tail():
+    splitter = LineSplitter()
+    assert list(splitter.feed(b'{}\n')) == [(1, b'{}')]
+    assert list(splitter.close()) == []
+
+
+def test_line_splitter_discards_long_lines():
+    splitter = LineSplitter(max_line_length=4)
+    assert list(splitter.feed(b'{}\n{"a"')) == [(1, b'{}')]
+    assert list(splitter.feed(b': 1}')) == []
+    assert list(splitter.feed(b', 2\n{}\n')) == [(2, None), (3, b'{}')]
+    assert list(splitter.feed(b'12345')) == []
+    assert list(splitter.close()) == [(4, None)]
+
+
+def test_convert_ndjson_long_line():
+    result = [json.loads(line) for line in convert_ndjson([b'{"tuesday": []}\n{"a": 1}'], 10)]
+    assert result == [
+        {'line': 1, 'errors': [{
+            'loc': [],
+            'msg': 'ensure line has at most 10 bytes',
+            'type': 'value_error.line.max_length',
+        }]},
+        {'line': 2, 'errors': [{
+            'loc': ['__root__', '__key__'],
+            'msg': "value is not a valid enumeration member; permitted: 'sunday', 'monday', "
+                   "'tuesday', 'wednesday', 'thursday', 'friday', 'saturday'",
+            'type': 'type_error.enum',
+            'ctx': {'enum_values': [
+                'sunday', 'monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday',
+            ]},
+        }]},
+    ]
+
+
+def test_convert_ndjson():
+    chunks = [
+        b'{"monday": [{"type": "open", "value": 36000}, ',
+        b'{"type": "close", "value": 64800}]}\n',
+        b'{"monday": [{"type": "close", "value": 36000}]}\nnot json\n',
+        b'{"tuesday": []}',
+    ]
+    result = [json.loads(line) for line in convert_ndjson(chunks)]
+    assert result == [
+        {'line': 1, 'output': ['Monday: 10 AM - 6 PM']},
+        {'line': 2, 'errors': [{
+            'loc': ['__root__'],
+            'msg': 'The previous day before "monday" must end with an "open" action',
+            'type': 'value_error',
+        }]},
+        {'line': 3, 'errors': [{
+            'loc': [],
+            'msg': 'Expecting value: line 1 column 1 (char 0)',
+            'type': 'value_error.jsondecode',
+        }]},
+        {'line': 4, 'output': ['Tuesday: Closed']},
+    ]
+
+
+def test_convert_ndjson_is_lazy():
+    def chunks():
+        yield b'{"tuesday": []}\n'
+        raise AssertionError('stream must not be read ahead')
+
+    result = convert_ndjson(chunks())
+    assert next(result) == b'{"line":1,"output":["Tuesday: Closed"]}\n'
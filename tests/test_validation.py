@@ -379,3 +379,10 @@ def test_validation_actions_starts_from_close_empty_ends_by_close_fails():
             ],
         })
     assert 'The previous day before "monday" must end with an "open" action' in str(exc.value)
+
+
+def test_weekdays_ring():
+    weekdays = list(WeekDaysEnum)
+    for index, weekday in enumerate(weekdays):
+        assert weekday.next == weekdays[(index + 1) % 7]
+        assert weekday.prev == weekdays[index - 1]
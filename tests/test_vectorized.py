@@ -0,0 +1,66 @@
+"""Tests for vectorized conversion."""
+
+from random import Random
+
+import pytest
+
+from parser import vectorized
+from parser.batch import convert_item
+from tests.utils import random_schedule, s_time, valid_schedule
+
+pytest.importorskip('numpy')
+
+
+def test_convert_many():
+    result = vectorized.convert_many([
+        {
+            'tuesday': [
+                {
+                    'type': 'close',
+                    'value': s_time(1),
+                },
+            ],
+            'monday': [
+                {
+                    'type': 'open',
+                    'value': s_time(10),
+                },
+                {
+                    'type': 'close',
+                    'value': s_time(14, 30),
+                },
+                {
+                    'type': 'open',
+                    'value': s_time(20),
+                },
+            ],
+        },
+        {
+            'monday': [
+                {
+                    'type': 'open',
+                    'value': s_time(10),
+                },
+            ],
+        },
+        {},
+        'broken',
+    ])
+    assert result[0] == (['Tuesday: Closed', 'Monday: 10 AM - 2.30 PM, 8 PM - 1 AM'], [])
+    assert result[1] == convert_item({'monday': [{'type': 'open', 'value': s_time(10)}]})
+    assert result[1][1]
+    assert result[2] == ([], [])
+    assert result[3] == convert_item('broken')
+
+
+def test_convert_many_empty():
+    assert vectorized.convert_many([]) == []
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_convert_many_matches_convert_item(seed):
+    rng = Random(seed)
+    items = [valid_schedule(rng) for _ in range(100)]
+    items += [random_schedule(rng, broken_rate=0.05) for _ in range(400)]
+    rng.shuffle(items)
+    assert vectorized.convert_many(items) == [convert_item(raw) for raw in items]
@@ -1,6 +1,81 @@
 """Utils for tests."""
 
+from random import Random
+from typing import Any, Dict, List
+
 
 def s_time(hours: int, minutes: int = 0) -> int:
     """Convert hours and minutes to seconds."""
     return hours * 60 * 60 + minutes * 60
+
+
+WEEKDAYS = ('sunday', 'monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday')
+BROKEN_VALUES = (0, -1, 86400, '3600', 3600.0, True, None, 'STRING')
+
+
+def random_action(rng: Random, broken: bool = False) -> Any:
+    """Return random raw action, optionally with a structural problem."""
+    action = {
+        'type': rng.choice(('open', 'close')),
+        'value': s_time(rng.randrange(24), rng.choice((0, 0, 15, 30, 45))),
+    }
+    if not broken:
+        return action
+
+    problem = rng.randrange(5)
+    if problem == 0:
+        action['value'] = rng.choice(BROKEN_VALUES)
+    elif problem == 1:
+        action['type'] = rng.choice(('wrong', 1, None))
+    elif problem == 2:
+        del action[rng.choice(('type', 'value'))]
+    elif problem == 3:
+        action['extra'] = None
+    else:
+        return rng.choice(([], 'open', 1))
+    return action
+
+
+def random_schedule(rng: Random, broken_rate: float = 0.05) -> Any:
+    """Return random raw schedule, valid or not."""
+    if rng.random() < broken_rate / 5:
+        return rng.choice(([], 'monday', None))
+
+    weekdays = rng.sample(WEEKDAYS, rng.randrange(8))
+    if rng.random() < broken_rate:
+        weekdays.append('monday_s')
+
+    schedule: Dict[Any, Any] = {}
+    for weekday in weekdays:
+        if rng.random() < broken_rate:
+            schedule[weekday] = rng.choice((1, 'open', None))
+            continue
+
+        actions = [random_action(rng, rng.random() < broken_rate) for _ in range(rng.randrange(5))]
+        if rng.random() < 0.8:
+            actions.sort(key=lambda action: action.get('value') if isinstance(action, dict)
+                         and isinstance(action.get('value'), int) else 0)
+        schedule[weekday] = actions
+    return schedule
+
+
+def valid_schedule(rng: Random) -> Dict[str, List[Dict[str, Any]]]:
+    """Return random valid raw schedule for all weekdays.
+
+    Days may start with closing of overnight opening, have several
+    openings and end with an opening closed the next day.
+    """
+    wrap = rng.random() < 0.3
+    starts_close = wrap
+    schedule: Dict[str, List[Dict[str, Any]]] = {}
+    for index, weekday in enumerate(WEEKDAYS):
+        ends_open = wrap if index == len(WEEKDAYS) - 1 else rng.random() < 0.3
+        types = ['close'] * starts_close + ['open', 'close'] * rng.randrange(3)
+        types += ['open'] * ends_open
+        minutes = sorted(rng.sample(range(1, 24 * 4), len(types)))
+        schedule[weekday] = [
+            {'type': action_type, 'value': s_time(0, minute * 15)}
+            for action_type, minute in zip(types, minutes)
+        ]
+        starts_close = ends_open
+    return schedule